@@ -14,7 +14,9 @@ from syft.version import __version__
 # tensor types inside hook_args.py.
 import syft.frameworks.torch.hook.hook_args
 
+import importlib
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +40,7 @@ else:
 # Pytorch dependencies
 # Import Hook
 from syft.frameworks.torch.hook.hook import TorchHook
-
-# Import grids
-from syft.grid.private_grid import PrivateGridNetwork
-from syft.grid.public_grid import PublicGridNetwork
-
-# Import sandbox
-from syft.sandbox import create_sandbox, make_hook
+from syft.generic.frameworks.hook.hook import native_tensors
 
 # Import federate learning objects
 from syft.frameworks.torch.fl import FederatedDataset, FederatedDataLoader, BaseDataset
@@ -58,8 +54,6 @@ from syft.execution.plan import func2plan
 
 # Import Worker Types
 from syft.workers.virtual import VirtualWorker
-from syft.workers.websocket_client import WebsocketClientWorker
-from syft.workers.websocket_server import WebsocketServerWorker
 
 # Import Syft's Public Tensor Types
 from syft.frameworks.torch.tensors.decorators.logging import LoggingTensor
@@ -78,7 +72,39 @@ from syft import serde
 
 # import functions
 from syft.frameworks.torch.functions import combine_pointers
-from syft.frameworks.torch.he.paillier import keygen
+import syft.frameworks.torch.he
+
+# The transport, grid, HE and sandbox objects depend on heavy optional packages
+# (websockets, requests, phe, ...) so they are only imported on first access
+_lazy_attributes = {
+    "WebsocketClientWorker": "syft.workers.websocket_client",
+    "WebsocketServerWorker": "syft.workers.websocket_server",
+    "PrivateGridNetwork": "syft.grid.private_grid",
+    "PublicGridNetwork": "syft.grid.public_grid",
+    "create_sandbox": "syft.sandbox",
+    "make_hook": "syft.sandbox",
+    "keygen": "syft.frameworks.torch.he.paillier",
+}
+
+
+def _load_lazy_attribute(name):
+    value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in _lazy_attributes:
+            return _load_lazy_attribute(name)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+else:
+    # Module level __getattr__ is only supported from Python 3.7
+    for _name in _lazy_attributes:
+        _load_lazy_attribute(_name)
 
 # import common
 import syft.common.util
@@ -97,6 +123,7 @@ __all__.extend(
         "frameworks",
         "serde",
         "TorchHook",
+        "native_tensors",
         "VirtualWorker",
         "WebsocketClientWorker",
         "WebsocketServerWorker",
@@ -130,4 +157,4 @@ framework = None
 if "ID_PROVIDER" not in globals():
     from syft.generic.id_provider import IdProvider
 
-    ID_PROVIDER = IdProvider()
+    ID_PROVIDER = IdProvider(compact=True)
@@ -1,6 +1,9 @@
 class PLAN_CMDS(object):
     FETCH_PLAN = "fetch_plan"
     FETCH_PROTOCOL = "fetch_protocol"
+    FETCH_CACHED_PLAN = "fetch_cached_plan"
+    LOAD_CACHED_PLAN = "load_cached_plan"
+    CACHE_PLAN = "cache_plan"
 
 
 class TENSOR_SERIALIZATION(object):
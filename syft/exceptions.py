@@ -1,5 +1,4 @@
 """Specific Pysyft exceptions."""
-from tblib import Traceback
 import traceback
 from six import reraise
 from typing import Tuple
@@ -189,6 +188,8 @@ class ResponseSignatureError(Exception):
         traceback_str = sy.serde.msgpack.serde._detail(worker, traceback_str)
         attributes = sy.serde.msgpack.serde._detail(worker, attributes)
         # De-serialize the traceback
+        from tblib import Traceback
+
         tb = Traceback.from_string(traceback_str)
         # Check that the error belongs to a valid set of Exceptions
         if error_name in dir(sy.exceptions):
@@ -232,6 +233,8 @@ class SendNotPermittedError(Exception):
         error_name, traceback_str = error_name.decode("utf-8"), traceback_str.decode("utf-8")
         attributes = sy.serde.msgpack.serde._detail(worker, attributes)
         # De-serialize the traceback
+        from tblib import Traceback
+
         tb = Traceback.from_string(traceback_str)
         # Check that the error belongs to a valid set of Exceptions
         if error_name in dir(sy.exceptions):
@@ -280,6 +283,8 @@ class GetNotPermittedError(Exception):
         traceback_str = sy.serde.msgpack.serde._detail(worker, traceback_str)
         attributes = sy.serde.msgpack.serde._detail(worker, attributes)
         # De-serialize the traceback
+        from tblib import Traceback
+
         tb = Traceback.from_string(traceback_str)
         # Check that the error belongs to a valid set of Exceptions
         if error_name in dir(sy.exceptions):
@@ -337,6 +342,13 @@ class ObjectNotFoundError(Exception):
         super().__init__(message)
 
 
+class TranslationUnavailableError(Exception):
+    """Raised when a TorchScript graph uses a node or an operation which cannot be
+    translated to the actions of a Role."""
+
+    pass
+
+
 class InvalidProtocolFileError(Exception):
     """Raised when PySyft protocol file cannot be loaded."""
 
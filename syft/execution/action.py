@@ -11,6 +11,42 @@ from syft_proto.execution.v1.communication_action_pb2 import (
     CommunicationAction as CommunicationActionPB,
 )
 
+# In-place dunder methods, which modify their target
+IN_PLACE_DUNDERS = {
+    "__iadd__",
+    "__isub__",
+    "__imul__",
+    "__imatmul__",
+    "__itruediv__",
+    "__idiv__",
+    "__ifloordiv__",
+    "__imod__",
+    "__ipow__",
+    "__iand__",
+    "__ior__",
+    "__ixor__",
+    "__ilshift__",
+    "__irshift__",
+    "__setitem__",
+}
+
+# Methods with side effects which don't follow the "_" suffix convention
+SIDE_EFFECT_METHODS = {"backward", "send", "get", "move", "remote_send", "remote_get"}
+
+# Removing or merging random draws would change the values drawn afterwards
+RANDOM_KEYWORDS = (
+    "rand",
+    "normal",
+    "bernoulli",
+    "multinomial",
+    "dropout",
+    "poisson",
+    "uniform",
+    "exponential",
+    "cauchy",
+    "geometric",
+)
+
 
 class Action(ABC, SyftSerializable):
     """Describes the concrete steps workers can take with objects they own
@@ -66,6 +102,22 @@ class Action(ABC, SyftSerializable):
             and self.return_ids == other.return_ids
         )
 
+    def has_side_effects(self) -> bool:
+        """Tells whether the action does more than computing its results, in
+        which case it can't be removed nor reordered.
+        """
+        if not self.return_ids:
+            return True
+
+        name = self.name.split(".")[-1]
+        if name in IN_PLACE_DUNDERS or name in SIDE_EFFECT_METHODS:
+            return True
+        if name.endswith("_") and not name.endswith("__"):
+            return True
+        if self.kwargs.get("inplace", False) or "out" in self.kwargs:
+            return True
+        return any(keyword in name for keyword in RANDOM_KEYWORDS)
+
     def code(self, var_names=None) -> str:
         """Returns pseudo-code representation of computation action"""
 
@@ -49,6 +49,9 @@ class CommunicationAction(Action):
 
         super().__init__(name, target, args_, kwargs_, return_ids, return_value=return_value)
 
+    def has_side_effects(self) -> bool:
+        return True
+
     @staticmethod
     def simplify(worker: AbstractWorker, action: "Action") -> tuple:
         """
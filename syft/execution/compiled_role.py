@@ -0,0 +1,310 @@
+from operator import itemgetter
+from typing import Callable
+from typing import Union
+
+from syft.execution.placeholder import PlaceHolder
+from syft.execution.placeholder_id import PlaceholderId
+from syft.generic.concurrency import fan_out
+from syft.generic.frameworks import framework_packages
+from syft.generic.frameworks.types import FrameworkTensor
+from syft.generic.pointers.object_pointer import ObjectPointer
+
+
+class CompiledRole:
+    """The actions of a Role compiled into a flat list of instructions.
+
+    Each placeholder of the role is given an integer slot. The argument
+    structures of the actions are compiled once into functions reading the
+    slots, and the functions called by the actions are resolved once, so
+    that executing the role is a tight loop over the instructions, without
+    traversing the actions nor looking up placeholders by id.
+
+    Placeholders which are neither inputs nor produced by an action, like the
+    state placeholders, are read from the role at each execution. The other
+    slots are cleared after the level where they are used for the last time,
+    so that the intermediate tensors, like the activations of a model, are
+    freed during the execution instead of at its end.
+
+    The instructions are also scheduled in levels: an instruction only depends
+    on the instructions of the previous levels, and the actions with side
+    effects are alone in their level. The instructions of a level which operate
+    on tensors held by remote workers (see fan_out) are run concurrently, so
+    that independent multiplications of shared tensors, for instance, do their
+    triple requests and openings in the same communication rounds. The number of rounds then
+    follows the depth of the computation instead of its number of actions.
+    """
+
+    def __init__(self, role):
+        self._role_version = role.version
+
+        self._slots = {}
+
+        self.input_slots = [self._slot(id_) for id_ in role.input_placeholder_ids]
+        self.instructions = []
+        written = set(self.input_slots)
+        # level of the instruction producing each slot, 0 for the inputs
+        slot_levels = {}
+        used_slots = set(self.input_slots)
+        barrier = 0
+        self.levels = []
+        # index of the last level reading or writing each slot
+        last_levels = {}
+        for action in role.actions:
+            instruction, return_slots = self._compile_action(action)
+            self.instructions.append(instruction)
+            written.update(return_slots)
+
+            read_slots = instruction[-1]
+            if action.has_side_effects() or used_slots.intersection(return_slots):
+                level = barrier = len(self.levels) + 1
+            else:
+                level = max([barrier] + [slot_levels.get(slot, 0) for slot in read_slots]) + 1
+            used_slots.update(read_slots)
+            used_slots.update(return_slots)
+            for slot in return_slots:
+                slot_levels[slot] = level
+            for slot in read_slots + return_slots:
+                last_levels[slot] = max(last_levels.get(slot, 0), level - 1)
+
+            if level > len(self.levels):
+                self.levels.append([])
+            self.levels[level - 1].append(instruction)
+        self.output_slots = [self._slot(id_) for id_ in role.output_placeholder_ids]
+
+        self.bound_slots = [
+            (slot, role.placeholders[id_])
+            for id_, slot in self._slots.items()
+            if slot not in written and id_ in role.placeholders
+        ]
+        self.input_placeholders = [
+            (slot, role.placeholders[id_])
+            for id_, slot in zip(role.input_placeholder_ids, self.input_slots)
+        ]
+        self.n_slots = len(self._slots)
+
+        # slots cleared after each level
+        kept_slots = set(self.output_slots).union(slot for slot, _ in self.bound_slots)
+        self.releases = [[] for _ in self.levels]
+        for slot, level in last_levels.items():
+            if slot not in kept_slots:
+                self.releases[level].append(slot)
+        self._schedule = list(zip(self.levels, self.releases))
+
+    @property
+    def depth(self) -> int:
+        """The number of levels of instructions run one after the other."""
+        return len(self.levels)
+
+    def is_compiled_from(self, role) -> bool:
+        """Checks that the role was not modified since it was compiled."""
+        return role.version == self._role_version
+
+    def execute(self, args_=None) -> tuple:
+        """Executes the instructions and returns the outputs of the role.
+
+        Args:
+            args_: the inputs of the role. If None, they are read from the
+                input placeholders.
+        """
+        slots = [None] * self.n_slots
+        for slot, placeholder in self.bound_slots:
+            slots[slot] = placeholder.child
+
+        if args_ is None:
+            for slot, placeholder in self.input_placeholders:
+                slots[slot] = placeholder.child
+        else:
+            inputs = []
+            _flatten_tensors(args_, inputs)
+            for slot, value in zip(self.input_slots, inputs):
+                slots[slot] = value
+
+        for level, releases in self._schedule:
+            if len(level) == 1:
+                _run_instruction(level[0], slots)
+            else:
+                distributed = []
+                for instruction in level:
+                    locations = []
+                    for slot in instruction[-1]:
+                        find_locations(slots[slot], locations)
+                    if locations:
+                        distributed.append((instruction, locations))
+                    else:
+                        _run_instruction(instruction, slots)
+                fan_out(
+                    lambda instruction_and_locations: _run_instruction(
+                        instruction_and_locations[0], slots
+                    ),
+                    distributed,
+                    locations=lambda instruction_and_locations: instruction_and_locations[1],
+                )
+
+            for slot in releases:
+                slots[slot] = None
+
+        return tuple(slots[slot] for slot in self.output_slots)
+
+    def _slot(self, placeholder_id: Union[str, int]) -> int:
+        slot = self._slots.get(placeholder_id)
+        if slot is None:
+            slot = self._slots[placeholder_id] = len(self._slots)
+        return slot
+
+    def _compile_action(self, action) -> tuple:
+        if action.target is None:
+            function = _fetch_package_method(action.name)
+            get_target = None
+        else:
+            function = None
+            get_target = self._compile_getter(action.target)
+
+        get_args = self._compile_getter(action.args)
+        get_kwargs = self._compile_getter(action.kwargs)
+
+        if action.return_ids is None:
+            store, return_slots = None, ()
+        else:
+            store, return_slots = self._compile_store(action.return_ids)
+
+        read_slots = []
+        _find_placeholder_ids((action.target, action.args, action.kwargs), read_slots)
+        read_slots = tuple({self._slot(id_) for id_ in read_slots})
+
+        instruction = (action.name, function, get_target, get_args, get_kwargs, store, read_slots)
+        return instruction, return_slots
+
+    def _compile_getter(self, obj) -> Callable:
+        """Returns a function building obj from the slots, where the
+        placeholder ids are replaced with the values of their slots.
+        """
+        if isinstance(obj, PlaceholderId):
+            return itemgetter(self._slot(obj.value))
+
+        if isinstance(obj, (list, tuple)):
+            if (
+                all(isinstance(o, PlaceholderId) for o in obj)
+                and len(obj) > 1
+                and type(obj) is tuple
+            ):
+                return itemgetter(*(self._slot(o.value) for o in obj))
+            getters = [self._compile_getter(o) for o in obj]
+            obj_type = type(obj)
+            return lambda slots: obj_type([getter(slots) for getter in getters])
+
+        if isinstance(obj, dict):
+            getters = [(k, self._compile_getter(v)) for k, v in sorted(obj.items())]
+            return lambda slots: {k: getter(slots) for k, getter in getters}
+
+        return lambda slots: obj
+
+    def _compile_store(self, return_ids) -> tuple:
+        """Returns a function storing a response in the slots of return_ids,
+        and these slots.
+
+        As in PlaceHolder.instantiate_placeholders, a response which is not a
+        tuple or a list is stored as a tuple of one element.
+        """
+        if len(return_ids) == 1 and isinstance(return_ids[0], PlaceholderId):
+            slot = self._slot(return_ids[0].value)
+
+            def store(slots, response):
+                if isinstance(response, (tuple, list)):
+                    response = response[0]
+                slots[slot] = _unwrap(response)
+
+            return store, (slot,)
+
+        return_slots = []
+
+        def compile_assign(obj):
+            if isinstance(obj, PlaceholderId):
+                slot = self._slot(obj.value)
+                return_slots.append(slot)
+
+                def assign(slots, response):
+                    slots[slot] = _unwrap(response)
+
+            else:
+                assigners = [compile_assign(o) for o in obj]
+
+                def assign(slots, response):
+                    for assigner, r in zip(assigners, response):
+                        assigner(slots, r)
+
+            return assign
+
+        assign = compile_assign(return_ids)
+
+        def store(slots, response):
+            if not isinstance(response, (tuple, list)):
+                response = (response,)
+            assign(slots, response)
+
+        return store, tuple(return_slots)
+
+
+def _run_instruction(instruction: tuple, slots: list):
+    method_name, function, get_target, get_args, get_kwargs, store, _ = instruction
+    if function is None:
+        response = getattr(get_target(slots), method_name)(*get_args(slots), **get_kwargs(slots))
+    else:
+        response = function(*get_args(slots), **get_kwargs(slots))
+    if store is not None:
+        store(slots, response)
+
+
+def find_locations(value, out: list):
+    """Appends to out the workers holding a value, if it is a pointer or a shared
+    tensor, possibly wrapped, and the crypto provider it uses."""
+    while True:
+        if isinstance(value, ObjectPointer):
+            out.append(value.location)
+            return
+        crypto_provider = getattr(value, "crypto_provider", None)
+        if crypto_provider is not None:
+            out.append(crypto_provider)
+        child = getattr(value, "child", None)
+        if child is None:
+            return
+        if isinstance(child, dict):
+            for share in child.values():
+                find_locations(share, out)
+            return
+        value = child
+
+
+def _find_placeholder_ids(obj, out: list):
+    if isinstance(obj, PlaceholderId):
+        out.append(obj.value)
+    elif isinstance(obj, (list, tuple)):
+        for o in obj:
+            _find_placeholder_ids(o, out)
+    elif isinstance(obj, dict):
+        for o in obj.values():
+            _find_placeholder_ids(o, out)
+
+
+def _unwrap(value):
+    return value.child if isinstance(value, PlaceHolder) else value
+
+
+def _flatten_tensors(obj, out: list):
+    """Appends the tensors found in obj to out, in the order of Role.nested_object_traversal."""
+    if isinstance(obj, (list, tuple)):
+        for o in obj:
+            _flatten_tensors(o, out)
+    elif isinstance(obj, dict):
+        for _, o in sorted(obj.items()):
+            _flatten_tensors(o, out)
+    elif isinstance(obj, FrameworkTensor):
+        out.append(obj)
+
+
+def _fetch_package_method(cmd: str) -> Callable:
+    cmd_path = cmd.split(".")
+
+    package = framework_packages[cmd_path[0]]
+    for subpackage_name in cmd_path[1:-1]:
+        package = getattr(package, subpackage_name)
+    return getattr(package, cmd_path[-1])
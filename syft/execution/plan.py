@@ -3,9 +3,13 @@ from typing import Tuple
 from typing import Union
 
 import copy
+import hashlib
 import inspect
 import io
+import os
+import tempfile
 import torch
+import types
 import warnings
 
 import syft as sy
@@ -18,6 +22,7 @@ from syft.execution.type_wrapper import NestedTypeWrapper
 from syft.execution.translation.abstract import AbstractPlanTranslator
 from syft.execution.translation.default import PlanTranslatorDefault
 from syft.execution.translation.torchscript import PlanTranslatorTorchscript
+from syft.execution.translation.torchscript_graph import role_from_torchscript
 from syft.generic.frameworks import framework_packages
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.generic.frameworks.types import FrameworkLayerModule
@@ -103,6 +108,8 @@ class Plan(AbstractObject):
 
     _build_translators = []
     _wrapped_frameworks = {}
+    # Directory where the built plans are cached, None if disabled
+    _cache_dir = None
 
     def __init__(
         self,
@@ -135,6 +142,9 @@ class Plan(AbstractObject):
         self.state_attributes = {}
         self.is_built = is_built
         self.torchscript = None
+        # "auto" runs the torchscript translation when the inputs allow it,
+        # "python" always replays the actions of the role
+        self.backend = "auto"
         self.input_types = input_types
         self.tracing = False
 
@@ -179,9 +189,17 @@ class Plan(AbstractObject):
         actions logged by PlaceHolders. Record those actions in
         plan.actions
 
+        If a cache directory was set with Plan.set_cache_dir, the built plan is
+        loaded from it when the same code was built with the same arguments,
+        instead of being traced again.
+
         Args:
             args: Input arguments to run the plan
         """
+        cache_path = self._cache_path(args, trace_autograd)
+        if cache_path is not None and self._load_from_cache(cache_path):
+            return self._output_placeholders()
+
         # Reset previous build
         self.role.reset()
 
@@ -253,7 +271,15 @@ class Plan(AbstractObject):
 
         self.is_built = True
 
-        # Build registered translations
+        self._add_build_translations()
+
+        if cache_path is not None:
+            self._save_to_cache(cache_path)
+
+        return results
+
+    def _add_build_translations(self):
+        """Builds the registered translations."""
         for translator in Plan._build_translators:
             try:
                 self.add_translation(translator)
@@ -261,7 +287,126 @@ class Plan(AbstractObject):
             except:
                 warnings.warn(f"Failed to translate Plan with {translator.__name__}")
 
-        return results
+    @staticmethod
+    def from_torchscript(
+        script: Union[torch.jit.ScriptModule, torch.jit.ScriptFunction],
+        args_shape: List[tuple] = None,
+        name: str = None,
+    ) -> "Plan":
+        """Builds a plan from a traced or scripted function or module.
+
+        The actions of the plan are read from the TorchScript graph instead of
+        being traced through the hook, which is much faster for large models.
+        The parameters of a module become the state of the plan.
+
+        Args:
+            script: the output of torch.jit.trace or torch.jit.script.
+            args_shape: the shapes of the inputs. They can be omitted for traced
+                graphs, which record the shapes of their inputs.
+            name: the name of the plan, the one of script by default.
+        """
+        if args_shape is None:
+            args_shape = _graph_args_shape(script)
+
+        role = role_from_torchscript(script, args_shape)
+        plan = Plan(
+            name=name or getattr(script, "__name__", None) or type(script).__name__,
+            role=role,
+            is_built=True,
+            id=sy.ID_PROVIDER.pop(),
+            owner=sy.local_worker,
+            input_types=NestedTypeWrapper(PlaceHolder.create_placeholders(args_shape)),
+        )
+        plan._add_build_translations()
+        return plan
+
+    @staticmethod
+    def set_cache_dir(cache_dir: Union[str, None]):
+        """Sets the directory where the built plans are cached.
+
+        The plans built with the same code, arguments and state shapes as a
+        cached plan are loaded from the cache instead of being traced. The code
+        of the forward function includes its constants and the values of the
+        globals and closure variables it reads: numbers, strings, tensors, and
+        the code of the functions defined in the same module. The other functions,
+        classes and modules it reads are only identified by their name, so the
+        cache must be cleared by hand when they change. The plans whose function
+        reads other objects, like a model held in a global, are not cached.
+        Setting None disables the cache.
+        """
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        Plan._cache_dir = cache_dir
+
+    def _cache_path(self, args: tuple, trace_autograd: bool) -> Union[str, None]:
+        """Returns the path of the cached plan built from args, or None if the
+        plan can't be cached.
+        """
+        if Plan._cache_dir is None:
+            return None
+
+        try:
+            code = _function_key(self.forward)
+        except TypeError:
+            return None
+
+        key = (
+            sy.__version__,
+            torch.__version__,
+            self.name,
+            self.include_state,
+            trace_autograd,
+            code,
+            _signature(args),
+            _signature(self.state.tensors()),
+            [translator.__name__ for translator in Plan._build_translators],
+        )
+        key_hash = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(Plan._cache_dir, f"{key_hash}.plan")
+
+    def _load_from_cache(self, cache_path: str) -> bool:
+        """Loads the built plan from cache_path, returns False if it can't be loaded."""
+        if not os.path.exists(cache_path):
+            return False
+
+        try:
+            with open(cache_path, "rb") as f:
+                role, torchscript, input_types, translation_names = sy.serde.deserialize(f.read())
+        except Exception:
+            warnings.warn(f"Failed to load the cached Plan {cache_path}")
+            return False
+
+        # The cached plan is bound to the state tensors of this plan
+        state_tensors = self.state.tensors()
+        for state_ph, tensor in zip(role.state.state_placeholders, state_tensors):
+            state_ph.instantiate(tensor)
+            role.placeholders[state_ph.id.value].instantiate(tensor)
+
+        self.role = role
+        self.torchscript = torchscript
+        self.input_types = input_types
+        self.translations = [t for t in Plan._build_translators if t.__name__ in translation_names]
+        self.is_built = True
+        self.toggle_tracing(False)
+        return True
+
+    def _save_to_cache(self, cache_path: str):
+        content = (
+            self.role,
+            self.torchscript,
+            self.input_types,
+            [translation.__name__ for translation in self.translations],
+        )
+        # The file is written at once so that another process never reads a
+        # partial plan
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(sy.serde.serialize(content))
+        os.replace(tmp_path, cache_path)
+
+    def _output_placeholders(self):
+        outputs = tuple(self.role.placeholders[id_] for id_ in self.role.output_placeholder_ids)
+        return outputs[0] if len(outputs) == 1 else outputs
 
     def toggle_tracing(self, value=None):
         self.tracing = value if value is not None else not self.tracing
@@ -269,8 +414,14 @@ class Plan(AbstractObject):
         for ph in self.role.placeholders.values():
             ph.tracing = self.tracing
 
-    def copy(self):
-        """Creates a copy of a plan."""
+    def copy(self, copy_state: bool = False):
+        """Creates a copy of a plan.
+
+        Args:
+            copy_state: if True, the state tensors are copied too, so that
+                the state of the copy can change independently. Otherwise
+                the copy shares the state tensors of the plan.
+        """
         plan_copy = Plan(
             name=self.name,
             role=self.role.copy(),
@@ -284,9 +435,32 @@ class Plan(AbstractObject):
         )
 
         plan_copy.torchscript = self.torchscript
+        plan_copy.backend = self.backend
+
+        if copy_state:
+            for state_ph in plan_copy.state.state_placeholders:
+                tensor = _copy_tensor(state_ph.child)
+                state_ph.instantiate(tensor)
+                plan_copy.role.placeholders[state_ph.id.value].instantiate(tensor)
 
         return plan_copy
 
+    def content_hash(self) -> str:
+        """Returns a hash of the content of the plan: its actions, state and
+        description, but not its id.
+
+        Two plans with the same hash run the same actions on the same state.
+        """
+        content = (
+            self.role,
+            self.include_state,
+            self.name,
+            sorted(self.tags or []),
+            self.description,
+            self.input_types,
+        )
+        return hashlib.sha256(sy.serde.serialize(content)).hexdigest()
+
     def __setattr__(self, name, value):
         """Add new tensors or parameter attributes to the state and register them
         in the owner's registry
@@ -328,7 +502,9 @@ class Plan(AbstractObject):
 
         When possible, run the original function to improve efficiency. When
         it's not, for example if you fetched the plan from a remote worker,
-        then run it from the tape of actions:
+        then run its torchscript translation if the inputs and the state are
+        local tensors with the shapes and types it was traced with. Otherwise,
+        run it from the tape of actions:
         - Instantiate input placeholders
         - for each recorded action, run the action on the placeholders
           and use the result(s) to instantiate to appropriate placeholder.
@@ -340,12 +516,95 @@ class Plan(AbstractObject):
             return self.forward(*args)
         else:
             self.input_types.input_check(self, args)
-            self.role.instantiate_inputs(args)
-            result = self.role.execute()
+            if self.backend == "auto" and self._can_run_torchscript(args):
+                parameters = self.parameters()
+                if parameters:
+                    return self.torchscript(*args, parameters)
+                return self.torchscript(*args)
+
+            result = self.role.execute(args)
             if len(result) == 1:
                 return result[0]
             return result
 
+    def map(self, inputs, batch_dim: int = None) -> list:
+        """Runs the plan on each element of inputs and returns the list of results.
+
+        By default, the plan is run on each input in turn. When the plan handles
+        batches, batch_dim can be given: the inputs are then stacked along this
+        dimension, the plan is run once on the batch and its outputs are split
+        back along the same dimension. The plan must not mix the elements of the
+        batch, like a sum over all the values would. The inputs which aren't
+        local tensors with the same shapes are still run in turn.
+
+        Args:
+            inputs: a list of arguments, where each element is a tuple of the
+                arguments of one call or the single argument of the plan. A
+                tensor is split along its first dimension, or batch_dim if given.
+            batch_dim: the dimension along which the plan handles batches.
+        """
+        if isinstance(inputs, FrameworkTensor):
+            inputs = inputs.unbind(batch_dim or 0)
+        inputs = [args if isinstance(args, tuple) else (args,) for args in inputs]
+
+        if batch_dim is not None and len(inputs) > 1 and _have_same_shapes(inputs):
+            return self._map_batch(inputs, batch_dim)
+
+        return [self(*args) for args in inputs]
+
+    def _map_batch(self, inputs: List[tuple], batch_dim: int) -> list:
+        """Runs the plan once on the inputs stacked along batch_dim."""
+        batch_args = [torch.stack(args, dim=batch_dim) for args in zip(*inputs)]
+        batch = self(*batch_args)
+
+        is_tuple = isinstance(batch, tuple)
+        if not is_tuple:
+            batch = (batch,)
+        for out in batch:
+            if (
+                not isinstance(out, FrameworkTensor)
+                or out.dim() == 0
+                or out.size(batch_dim) != len(inputs)
+            ):
+                raise ValueError(
+                    f"The outputs of the plan {self.name} don't have a batch dimension {batch_dim}"
+                )
+
+        # The elements are copied so that each result owns its memory, and can be
+        # serialized or freed without the rest of the batch
+        results = list(zip(*([e.clone() for e in out.unbind(batch_dim)] for out in batch)))
+        if not is_tuple:
+            results = [result[0] for result in results]
+        return results
+
+    def _can_run_torchscript(self, args: tuple) -> bool:
+        """Tells whether the torchscript translation can be run on args.
+
+        The translation is traced on local float tensors with the input shapes
+        of the plan, so that shape or type dependent operations might not give
+        the same results on other inputs. Remote or shared tensors, which have
+        a child, can't be run through it either.
+        """
+        if self.torchscript is None or len(args) != len(self.role.input_placeholder_ids):
+            return False
+
+        dtype = torch.get_default_dtype()
+        for arg, shape in zip(args, self.get_args_shape()):
+            if (
+                not isinstance(arg, torch.Tensor)
+                or arg.has_child()
+                or arg.dtype != dtype
+                or arg.device.type != "cpu"
+                or shape is None
+                or arg.shape != tuple(1 if dim == -1 else dim for dim in shape)
+            ):
+                return False
+
+        return all(
+            isinstance(tensor, torch.Tensor) and not tensor.has_child()
+            for tensor in self.parameters()
+        )
+
     def run(self, args_: Tuple, result_ids: List[Union[str, int]]):
         """Controls local or remote plan execution.
         If the plan doesn't have the plan built, first build it using the original function.
@@ -378,7 +637,7 @@ class Plan(AbstractObject):
                 return self.pointers[location]
 
             # Send the Plan
-            pointer = self.owner.send(self, workers=location)
+            pointer = self.owner.send_plan(self, location)
 
             self.pointers[location] = pointer
         else:
@@ -389,7 +648,7 @@ class Plan(AbstractObject):
                     pointer = self.pointers[location]
                 else:
                     # Send the Plan
-                    pointer = self.owner.send(self, workers=location)
+                    pointer = self.owner.send_plan(self, location)
 
                     self.pointers[location] = pointer
 
@@ -710,6 +969,126 @@ class Plan(AbstractObject):
         return PlanPB
 
 
+def _have_same_shapes(inputs: List[tuple]) -> bool:
+    """Tells whether the inputs are local tensors, with the same shapes in each call."""
+    shapes = None
+    for args in inputs:
+        if not all(isinstance(arg, FrameworkTensor) and not arg.has_child() for arg in args):
+            return False
+        args_shapes = [arg.shape for arg in args]
+        if shapes is None:
+            shapes = args_shapes
+        elif args_shapes != shapes:
+            return False
+    return True
+
+
+def _graph_args_shape(script) -> List[tuple]:
+    """Returns the shapes of the tensor inputs recorded in a traced graph."""
+    graph = getattr(script, "inlined_graph", None) or script.graph
+    args_shape = []
+    for value in graph.inputs():
+        if value.type().kind() == "ClassType":
+            continue
+        try:
+            shape = value.type().sizes()
+        except RuntimeError:
+            shape = None
+        if shape is None:
+            raise ValueError("The input shapes are not in the graph, args_shape must be provided")
+        args_shape.append(tuple(shape))
+    return args_shape
+
+
+def _signature(obj):
+    """Returns a description of the structure of obj, and of the shapes and
+    types of its tensors.
+    """
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, [_signature(o) for o in obj])
+    if isinstance(obj, dict):
+        return ("dict", [(k, _signature(v)) for k, v in sorted(obj.items())])
+    if isinstance(obj, FrameworkTensor):
+        return ("tensor", tuple(obj.shape), str(obj.dtype), obj.requires_grad)
+    return repr(obj)
+
+
+def _function_key(function, _seen: set = None) -> tuple:
+    """Returns a description of the code of a function, with its constants and the
+    values of the globals and closure variables it reads.
+
+    Raises:
+        TypeError: if the function reads a value which can't be described.
+    """
+    function = getattr(function, "__func__", function)
+    if not isinstance(function, types.FunctionType):
+        raise TypeError(f"{function} is not a python function")
+
+    seen = set() if _seen is None else _seen
+    seen.add(function.__code__)
+    module = function.__module__
+
+    global_values = []
+    for name in sorted(_code_names(function.__code__)):
+        if name in function.__globals__:
+            global_values.append((name, _value_key(function.__globals__[name], module, seen)))
+    closure_values = [
+        _value_key(cell.cell_contents, module, seen) for cell in function.__closure__ or ()
+    ]
+    return _code_key(function.__code__), global_values, closure_values
+
+
+def _code_key(code: types.CodeType) -> tuple:
+    consts = tuple(
+        _code_key(const) if isinstance(const, types.CodeType) else repr(const)
+        for const in code.co_consts
+    )
+    return code.co_code, consts, code.co_names
+
+
+def _code_names(code: types.CodeType) -> set:
+    """Returns the names read by a code object and the code objects it defines."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _value_key(value, module: str, seen: set):
+    """Returns a description of a value read by the function of a plan."""
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, [_value_key(v, module, seen) for v in value]
+    if isinstance(value, dict):
+        return "dict", [(repr(k), _value_key(v, module, seen)) for k, v in sorted(value.items())]
+    if isinstance(value, FrameworkTensor):
+        if hasattr(value, "child"):
+            raise TypeError("Only local tensors can be described")
+        data = value.detach().cpu().numpy().tobytes()
+        return "tensor", _signature(value), hashlib.sha256(data).hexdigest()
+    if isinstance(value, types.FunctionType):
+        if value.__module__ == module and value.__code__ not in seen:
+            return _function_key(value, seen)
+        return value.__module__, value.__qualname__, _code_key(value.__code__)
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    if isinstance(value, (type, types.BuiltinFunctionType)):
+        return getattr(value, "__module__", None), value.__qualname__
+    raise TypeError(f"Values of type {type(value).__name__} can't be described")
+
+
+def _copy_tensor(tensor):
+    """Copies a tensor with a new id, keeping it a leaf if it requires a gradient."""
+    with torch.no_grad():
+        tensor_copy = tensor.clone()
+    tensor_copy.id = sy.ID_PROVIDER.pop()
+    if tensor.requires_grad:
+        tensor_copy.requires_grad_()
+    return tensor_copy
+
+
 # Auto-register Plan build-time translations
 Plan.register_build_translator(PlanTranslatorTorchscript)
 
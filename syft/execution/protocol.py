@@ -10,10 +10,13 @@ import torch
 import warnings
 
 import syft as sy
+from syft.execution.communication import CommunicationAction
 from syft.execution.placeholder import PlaceHolder
+from syft.execution.compiled_role import find_locations
 from syft.execution.role import Role
 from syft.execution.state import State
 
+from syft.generic.concurrency import fan_out
 from syft.generic.frameworks import framework_packages
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.generic.frameworks.types import FrameworkLayerModule
@@ -189,10 +192,22 @@ class Protocol(AbstractObject):
     def __call__(self):
         """
         Run actions on the workers provided for each Role from the Role's tape of actions.
+
+        The roles using different workers are run concurrently, so that the
+        latency is the one of the slowest worker, while the roles using the same
+        workers are run in turn. The roles with communication actions exchange
+        data with the other workers: each of them is run alone, once the roles
+        before it are done, and before the roles after it are started.
         """
         results_per_role = {}
-        for role_id, role in self.roles.items():
-            results_per_role[role_id] = role.execute()
+        for groups in _group_independent_roles(self.roles):
+            results = fan_out(
+                lambda group: [self.roles[role_id].execute() for role_id in group[0]],
+                groups,
+                locations=lambda group: group[1],
+            )
+            for (role_ids, _), group_results in zip(groups, results):
+                results_per_role.update(zip(role_ids, group_results))
 
         return results_per_role
 
@@ -329,3 +344,40 @@ class Protocol(AbstractObject):
     @staticmethod
     def get_protobuf_schema() -> ProtocolPB:
         return ProtocolPB
+
+
+def _group_independent_roles(roles: Dict[str, Role]) -> List[List[Tuple[List[str], list]]]:
+    """Splits the roles in steps run one after the other, in the order of the roles.
+
+    Each step is a list of groups which can be run concurrently, as the roles of
+    different groups don't use the same workers. A group is a tuple of the ids of
+    its roles, run in turn, and of the workers they use.
+    """
+    steps = [[]]
+    for role_id, role in roles.items():
+        locations = _role_locations(role)
+        if any(isinstance(action, CommunicationAction) for action in role.actions):
+            steps.append([([role_id], locations)])
+            steps.append([])
+            continue
+
+        # The groups using the same workers as the role are merged with it
+        location_ids = {location.id for location in locations}
+        role_ids, group_locations = [], []
+        for group in list(steps[-1]):
+            if location_ids.intersection(location.id for location in group[1]):
+                steps[-1].remove(group)
+                role_ids += group[0]
+                group_locations += group[1]
+        steps[-1].append((role_ids + [role_id], group_locations + locations))
+
+    return [step for step in steps if step]
+
+
+def _role_locations(role: Role) -> list:
+    """Returns the workers holding the inputs and the state of a role, or the
+    worker of the role if they are local."""
+    locations = []
+    for ph in role.input_placeholders() + role.state.state_placeholders:
+        find_locations(ph.child, locations)
+    return locations or [role.worker]
@@ -8,6 +8,7 @@ from syft.generic.frameworks import framework_packages
 
 import syft as sy
 from syft.execution.action import Action
+from syft.execution.compiled_role import CompiledRole
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.placeholder_id import PlaceholderId
 from syft.execution.state import State
@@ -24,6 +25,15 @@ class Role(SyftSerializable):
     Roles will mainly be used to build protocols but are still a work in progress.
     """
 
+    # Attributes whose reassignment invalidates the compiled role
+    COMPILED_ATTRIBUTES = {
+        "actions",
+        "placeholders",
+        "input_placeholder_ids",
+        "output_placeholder_ids",
+        "state",
+    }
+
     def __init__(
         self,
         id: Union[str, int] = None,
@@ -34,6 +44,9 @@ class Role(SyftSerializable):
         input_placeholder_ids: Tuple[int, str] = None,
         output_placeholder_ids: Tuple[int, str] = None,
     ):
+        # Incremented at each modification of the role, see compile()
+        self.version = 0
+
         self.id = id or sy.ID_PROVIDER.pop()
         self.worker = worker or sy.local_worker
 
@@ -48,11 +61,25 @@ class Role(SyftSerializable):
 
         self.state = state or State()
         self.tracing = False
+        self._compiled = None
 
         for name, package in framework_packages.items():
             tracing_wrapper = FrameworkWrapper(package=package, role=self, owner=self.worker)
             setattr(self, name, tracing_wrapper)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in Role.COMPILED_ATTRIBUTES:
+            self.modified()
+
+    def modified(self):
+        """Invalidates the compiled role.
+
+        This is done when one of the COMPILED_ATTRIBUTES is reassigned, and must
+        be called after modifying them in place.
+        """
+        self.version += 1
+
     def input_placeholders(self):
         return [self.placeholders[id_] for id_ in self.input_placeholder_ids]
 
@@ -138,6 +165,7 @@ class Role(SyftSerializable):
 
         action = action_type(*command_placeholder_ids, return_ids=return_placeholder_ids)
         self.actions.append(action)
+        self.modified()
 
     def register_state_tensor(self, tensor):
         placeholder = sy.PlaceHolder(id=tensor.id, role=self)
@@ -145,6 +173,7 @@ class Role(SyftSerializable):
         self.state.state_placeholders.append(placeholder)
         # TODO isn't it weird that state placeholders are both in state and plan?
         self.placeholders[tensor.id] = placeholder
+        self.modified()
 
     def reset(self):
         """ Remove the trace actions on this Role to make it possible to build
@@ -159,17 +188,22 @@ class Role(SyftSerializable):
             ph_id: ph for ph_id, ph in self.placeholders.items() if ph_id in state_ph_ids
         }
 
-    def execute(self):
+    def execute(self, args_=None):
         """ Make the role execute all its actions.
-        """
-        for action in self.actions:
-            self._execute_action(action)
 
-        output_placeholders = tuple(
-            self.placeholders[output_id] for output_id in self.output_placeholder_ids
-        )
+        Args:
+            args_: the inputs of the role. If None, the inputs are read from
+                the input placeholders.
+        """
+        return self.compile().execute(args_)
 
-        return tuple(p.child for p in output_placeholders)
+    def compile(self) -> CompiledRole:
+        """ Compile the actions into a list of instructions, which is kept
+        until the role is modified (see modified()).
+        """
+        if self._compiled is None or not self._compiled.is_compiled_from(self):
+            self._compiled = CompiledRole(self)
+        return self._compiled
 
     def load(self, tensor):
         """ Load tensors used in a protocol from worker's local store
@@ -199,45 +233,6 @@ class Role(SyftSerializable):
 
         Role.nested_object_traversal(args_, traversal_function, FrameworkTensor)
 
-    def _execute_action(self, action):
-        """ Build placeholders and store action.
-        """
-        cmd, _self, args_, kwargs_, return_placeholder = (
-            action.name,
-            action.target,  # target is equivalent to the "self" in a method
-            action.args,
-            action.kwargs,
-            action.return_ids,
-        )
-        _self = self._fetch_placeholders_from_ids(_self)
-        args_ = self._fetch_placeholders_from_ids(args_)
-        kwargs_ = self._fetch_placeholders_from_ids(kwargs_)
-        return_placeholder = self._fetch_placeholders_from_ids(return_placeholder)
-
-        if _self is None:
-            method = self._fetch_package_method(cmd)
-            response = method(*args_, **kwargs_)
-        else:
-            response = getattr(_self, cmd)(*args_, **kwargs_)
-
-        if not isinstance(response, (tuple, list)):
-            response = (response,)
-
-        PlaceHolder.instantiate_placeholders(return_placeholder, response)
-
-    def _fetch_package_method(self, cmd):
-        cmd_path = cmd.split(".")
-
-        package_name = cmd_path[0]
-        subpackage_names = cmd_path[1:-1]
-        method_name = cmd_path[-1]
-
-        package = framework_packages[package_name]
-        for subpackage_name in subpackage_names:
-            package = getattr(package, subpackage_name)
-        method = getattr(package, method_name)
-        return method
-
     def _store_placeholders(self, obj):
         """
         Replace in an object all FrameworkTensors with Placeholder ids
@@ -246,18 +241,11 @@ class Role(SyftSerializable):
         def traversal_function(obj):
             if obj.id.value not in self.placeholders:
                 self.placeholders[obj.id.value] = obj
+                self.modified()
             return obj.id
 
         return Role.nested_object_traversal(obj, traversal_function, PlaceHolder)
 
-    def _fetch_placeholders_from_ids(self, obj):
-        """
-        Replace in an object all ids with Placeholders
-        """
-        return Role.nested_object_traversal(
-            obj, lambda x: self.placeholders[x.value], PlaceholderId
-        )
-
     def copy(self):
         # TODO not the cleanest method ever
         placeholders = {}
@@ -0,0 +1,202 @@
+from syft.execution.placeholder_id import PlaceholderId
+from syft.execution.role import Role
+from syft.execution.translation.abstract import AbstractPlanTranslator
+from syft.generic.frameworks.types import FrameworkTensor
+
+# Methods returning their target when their argument is the target itself
+SELF_AS_METHODS = {"view_as", "reshape_as", "expand_as", "type_as"}
+
+
+class PlanTranslatorOptimize(AbstractPlanTranslator):
+    """Optimizes the actions of a Plan in place.
+
+    Identical actions are merged, no-op actions like x.view_as(x) are
+    dropped, and the actions whose results never reach an output are
+    removed. Actions with side effects (see Action.has_side_effects) are
+    always kept as they are.
+    """
+
+    def __init__(self, plan):
+        super().__init__(plan)
+
+    def translate(self):
+        optimize_role(self.plan.role)
+        return self.plan
+
+    def remove(self):
+        # The removed actions can't be restored
+        return self.plan
+
+
+def optimize_role(role: Role) -> int:
+    """Removes the redundant and dead actions of a role.
+
+    Returns:
+        The number of actions removed.
+    """
+    n_actions = len(role.actions)
+    eliminate_common_subexpressions(role)
+    eliminate_dead_code(role)
+    return n_actions - len(role.actions)
+
+
+def placeholder_ids(obj) -> set:
+    """Returns the ids of the placeholders found in a nested structure."""
+    ids = set()
+    Role.nested_object_traversal(obj, lambda ph_id: ids.add(ph_id.value), PlaceholderId)
+    return ids
+
+
+def action_input_ids(action) -> set:
+    """Returns the ids of the placeholders read by an action."""
+    return placeholder_ids((action.target, action.args, action.kwargs))
+
+
+def eliminate_common_subexpressions(role: Role) -> int:
+    """Merges the actions computing the same results as a previous one.
+
+    The users of the results of a merged action read the results of the
+    first one instead. As an in-place operation could change the inputs of
+    an action, the previous actions are forgotten after each action with
+    side effects. Results read by an action with side effects are never
+    merged, as the in-place operation would then change both of them.
+
+    Returns:
+        The number of actions removed.
+    """
+    output_ids = set(role.output_placeholder_ids)
+    mutable_ids = set()
+    for action in role.actions:
+        if action.has_side_effects():
+            mutable_ids.update(action_input_ids(action))
+    renamed_ids = {}
+    seen = {}
+    actions = []
+
+    def rename(obj):
+        return Role.nested_object_traversal(
+            obj,
+            lambda ph_id: PlaceholderId(renamed_ids.get(ph_id.value, ph_id.value)),
+            PlaceholderId,
+        )
+
+    for action in role.actions:
+        if renamed_ids:
+            action = type(action)(
+                action.name,
+                rename(action.target),
+                rename(action.args),
+                rename(action.kwargs),
+                action.return_ids,
+            )
+
+        if action.has_side_effects():
+            seen.clear()
+            actions.append(action)
+            continue
+
+        return_ids = [ph_id.value for ph_id in placeholder_ids_in_order(action.return_ids)]
+        if output_ids.intersection(return_ids):
+            actions.append(action)
+            continue
+
+        if (
+            action.name in SELF_AS_METHODS
+            and len(action.args) == 1
+            and action.target == action.args[0]
+            and len(return_ids) == 1
+            and not mutable_ids.intersection((return_ids[0], action.target.value))
+        ):
+            renamed_ids[return_ids[0]] = action.target.value
+            continue
+
+        key = _action_key(action)
+        previous_return_ids = seen.get(key) if key is not None else None
+        if (
+            previous_return_ids is not None
+            and len(previous_return_ids) == len(return_ids)
+            and not mutable_ids.intersection(return_ids)
+            and not mutable_ids.intersection(previous_return_ids)
+        ):
+            renamed_ids.update(zip(return_ids, previous_return_ids))
+            continue
+
+        if key is not None:
+            seen[key] = return_ids
+        actions.append(action)
+
+    return _set_actions(role, actions)
+
+
+def eliminate_dead_code(role: Role) -> int:
+    """Removes the actions whose results are not used to compute the outputs.
+
+    Returns:
+        The number of actions removed.
+    """
+    live_ids = set(role.output_placeholder_ids)
+    actions = []
+
+    for action in reversed(role.actions):
+        return_ids = {ph_id.value for ph_id in placeholder_ids_in_order(action.return_ids)}
+        if action.has_side_effects() or live_ids.intersection(return_ids):
+            live_ids.update(action_input_ids(action))
+            actions.append(action)
+
+    actions.reverse()
+    return _set_actions(role, actions)
+
+
+def placeholder_ids_in_order(obj) -> list:
+    """Returns the placeholder ids found in a nested structure, in order."""
+    ids = []
+    Role.nested_object_traversal(obj, ids.append, PlaceholderId)
+    return ids
+
+
+def _set_actions(role: Role, actions: list) -> int:
+    """Replaces the actions of a role and drops the placeholders not used anymore."""
+    n_removed = len(role.actions) - len(actions)
+    if not n_removed and all(a is b for a, b in zip(actions, role.actions)):
+        return 0
+
+    used_ids = set(role.input_placeholder_ids) | set(role.output_placeholder_ids)
+    used_ids.update(ph.id.value for ph in role.state.state_placeholders)
+    for action in actions:
+        used_ids.update(action_input_ids(action))
+        used_ids.update(placeholder_ids(action.return_ids))
+
+    role.actions = actions
+    role.placeholders = {ph_id: ph for ph_id, ph in role.placeholders.items() if ph_id in used_ids}
+    return n_removed
+
+
+def _freeze(obj):
+    """Returns a hashable version of obj, raising TypeError if it can't be built."""
+    if isinstance(obj, PlaceholderId):
+        return (PlaceholderId, obj.value)
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_freeze(o) for o in obj))
+    if isinstance(obj, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in sorted(obj.items())))
+    if isinstance(obj, FrameworkTensor):
+        raise TypeError("Tensors are not compared")
+    hash(obj)
+    # The type is part of the key as 1, 1.0 and True are equal but not interchangeable
+    return (type(obj), obj)
+
+
+def _action_key(action):
+    """Returns a key identifying the computation of an action, or None if
+    the action holds values which can't be compared, like tensors.
+    """
+    try:
+        return (
+            type(action),
+            action.name,
+            _freeze(action.target),
+            _freeze(action.args),
+            _freeze(action.kwargs),
+        )
+    except TypeError:
+        return None
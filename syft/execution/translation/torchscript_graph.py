@@ -0,0 +1,229 @@
+import functools
+from typing import List
+from typing import Union
+
+import torch
+
+from syft.exceptions import TranslationUnavailableError
+from syft.execution.computation import ComputationAction
+from syft.execution.placeholder import PlaceHolder
+from syft.execution.role import Role
+
+# TorchScript passes the arguments of these types as integers
+_ENUM_TYPES = {
+    "ScalarType": torch.dtype,
+    "Layout": torch.layout,
+    "MemoryFormat": torch.memory_format,
+}
+
+_MISSING = object()
+
+# Operations converting a tensor to a Python number, run as tensor methods
+_NUMBER_CONVERSIONS = {
+    "aten::Int": "__int__",
+    "aten::Float": "__float__",
+    "aten::ScalarImplicit": "item",
+}
+
+
+def role_from_torchscript(
+    script: Union[torch.jit.ScriptModule, torch.jit.ScriptFunction], args_shape: List[tuple]
+) -> Role:
+    """Builds a Role running the operations of a traced or scripted function
+    or module.
+
+    Each operation of the TorchScript graph becomes an action of the role. The
+    parameters and buffers of a module, and the tensor constants of the graph,
+    become the state of the role. Graphs with control flow are not supported.
+
+    Args:
+        script: a torch.jit.ScriptFunction or torch.jit.ScriptModule.
+        args_shape: the shapes of the tensor inputs of the graph.
+    """
+    graph = getattr(script, "inlined_graph", None) or script.graph
+    role = Role()
+    # Value of each node output: a placeholder, a Python value or a module
+    values = {}
+
+    graph_inputs = list(graph.inputs())
+    if graph_inputs and graph_inputs[0].type().kind() == "ClassType":
+        # Method of a module, the first input is the module itself
+        values[graph_inputs[0].unique()] = script
+        graph_inputs = graph_inputs[1:]
+
+    if len(graph_inputs) != len(args_shape):
+        raise ValueError(
+            f"The graph has {len(graph_inputs)} inputs but {len(args_shape)} shapes were provided"
+        )
+
+    input_placeholders = tuple(PlaceHolder(role=role, shape=shape) for shape in args_shape)
+    for value, placeholder in zip(graph_inputs, input_placeholders):
+        values[value.unique()] = placeholder
+    role.register_inputs(input_placeholders)
+
+    for node in graph.nodes():
+        _convert_node(node, role, values)
+
+    outputs = tuple(values[value.unique()] for value in graph.outputs())
+    if len(outputs) == 1 and isinstance(outputs[0], (list, tuple)):
+        outputs = tuple(outputs[0])
+    if not all(isinstance(output, PlaceHolder) for output in outputs):
+        raise ValueError("The outputs of the graph must be tensors computed by the graph")
+    role.register_outputs(outputs)
+
+    return role
+
+
+def _convert_node(node, role: Role, values: dict):
+    """Registers the action running a node in role, or records the value of its
+    outputs when they are known when building the role.
+    """
+    kind = node.kind()
+    inputs = [values[value.unique()] for value in node.inputs()]
+    outputs = list(node.outputs())
+
+    if kind == "prim::Constant":
+        values[outputs[0].unique()] = _as_value(_constant(node), role)
+    elif kind == "prim::GetAttr":
+        values[outputs[0].unique()] = _as_value(getattr(inputs[0], node.s("name")), role)
+    elif kind == "prim::ListConstruct":
+        values[outputs[0].unique()] = list(inputs)
+    elif kind == "prim::TupleConstruct":
+        values[outputs[0].unique()] = tuple(inputs)
+    elif kind in ("prim::ListUnpack", "prim::TupleUnpack"):
+        if not isinstance(inputs[0], (list, tuple)):
+            raise TranslationUnavailableError(
+                "Unpacking the result of an operation is not supported"
+            )
+        for value, element in zip(outputs, inputs[0]):
+            values[value.unique()] = element
+    elif kind == "prim::NumToTensor":
+        _register_action(role, values, outputs, "torch.tensor", None, inputs, {})
+    elif kind in _NUMBER_CONVERSIONS:
+        _register_action(role, values, outputs, _NUMBER_CONVERSIONS[kind], inputs[0], [], {})
+    elif kind.startswith("aten::"):
+        op_name = kind[len("aten::") :]
+        args_, kwargs_ = _split_arguments(node, inputs)
+        if hasattr(torch, op_name):
+            _register_action(role, values, outputs, f"torch.{op_name}", None, args_, kwargs_)
+        elif hasattr(torch.nn.functional, op_name):
+            name = f"torch.nn.functional.{op_name}"
+            _register_action(role, values, outputs, name, None, args_, kwargs_)
+        elif hasattr(torch.Tensor, op_name):
+            _register_action(role, values, outputs, op_name, args_[0], args_[1:], kwargs_)
+        else:
+            raise TranslationUnavailableError(f"TorchScript operation {kind} is not supported")
+    else:
+        raise TranslationUnavailableError(f"TorchScript node {kind} is not supported")
+
+
+def _register_action(role, values, outputs, name, target, args_, kwargs_):
+    results = tuple(PlaceHolder(role=role) for _ in outputs)
+    for value, result in zip(outputs, results):
+        values[value.unique()] = result
+
+    response = results[0] if len(results) == 1 else results
+    role.register_action(((name, target, tuple(args_), kwargs_), response), ComputationAction)
+
+
+def _constant(node):
+    if "value" not in node.attributeNames():
+        return None
+
+    # The attribute getter is named after the kind of the attribute: i, f, s, t...
+    value = getattr(node, node.kindOf("value"))("value")
+    value_type = str(node.output().type())
+    if value_type == "bool":
+        return bool(value)
+    if value_type == "Device":
+        return torch.device(value)
+    return value
+
+
+def _as_value(obj, role: Role):
+    """Returns the placeholder of the state tensor obj, or obj itself if it is not a tensor."""
+    if not isinstance(obj, torch.Tensor):
+        return obj
+
+    if obj.id not in role.placeholders:
+        role.register_state_tensor(obj)
+    return role.placeholders[obj.id]
+
+
+def _split_arguments(node, inputs: list) -> tuple:
+    """Splits the inputs of a node into positional and keyword arguments,
+    following the schema of its operation.
+    """
+    try:
+        schema = node.schema()
+    except (AttributeError, RuntimeError):
+        return inputs, {}
+    if "(" not in schema:
+        return inputs, {}
+
+    args_, kwargs_ = [], {}
+    keyword_only = False
+    values = iter(inputs)
+    for argument in _split_top_level(schema[schema.index("(") + 1 : schema.rindex(") ->")]):
+        # The arguments after * are keyword only
+        if argument == "*":
+            keyword_only = True
+            continue
+
+        value = next(values, _MISSING)
+        if value is _MISSING:
+            break
+
+        # An argument is described as "Type name" or "Type name=default"
+        arg_type, arg_name = argument.split("=")[0].rsplit(" ", 1)
+        enum_values = _enum_values(arg_type.rstrip("?"))
+        if enum_values and isinstance(value, int):
+            value = enum_values.get(value, value)
+
+        if keyword_only:
+            kwargs_[arg_name] = value
+        else:
+            args_.append(value)
+
+    return args_, kwargs_
+
+
+@functools.lru_cache()
+def _enum_values(arg_type: str) -> dict:
+    """Returns the torch values of an enum type of TorchScript, by the integer
+    TorchScript passes for them.
+
+    The integers are read from the graphs TorchScript compiles for each of the
+    values torch defines, so the values TorchScript does not support are left out.
+    """
+    enum_type = _ENUM_TYPES.get(arg_type)
+    if enum_type is None:
+        return {}
+
+    values = {}
+    for name, value in vars(torch).items():
+        if not isinstance(value, enum_type):
+            continue
+        try:
+            unit = torch.jit.CompilationUnit(f"def enum_value():\n    return torch.{name}\n")
+        except RuntimeError:
+            continue
+        node = unit.enum_value.graph.findNode("prim::Constant")
+        if node is not None and "value" in node.attributeNames():
+            values[node.i("value")] = value
+    return values
+
+
+def _split_top_level(arguments: str) -> List[str]:
+    """Splits a list of arguments on the commas which are not inside brackets."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(arguments):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(arguments[start:i].strip())
+            start = i + 1
+    parts.append(arguments[start:].strip())
+    return [part for part in parts if part]
@@ -0,0 +1,8 @@
+import importlib
+
+
+def __getattr__(name):
+    # The HE modules depend on optional packages, they are imported on first access
+    if name == "paillier":
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
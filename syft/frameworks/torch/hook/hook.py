@@ -321,10 +321,11 @@ class TorchHook(FrameworkHook):
 
         tensor_type = self.torch.Tensor
         # Use a pre-defined list to select the methods to overload
-        for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(AdditiveSharingTensor):
-                new_method = self._get_hooked_additive_shared_method(attr)
-                setattr(AdditiveSharingTensor, attr, new_method)
+        ast_attrs = set(dir(AdditiveSharingTensor))
+        attrs = [attr for attr in self.to_auto_overload[tensor_type] if attr not in ast_attrs]
+        self._hook_methods_lazily(
+            AdditiveSharingTensor, attrs, self._get_hooked_additive_shared_method
+        )
 
     def _hook_parameters(self):
         """
@@ -7,6 +7,7 @@ from syft.frameworks.torch.mpc import crypto_protocol
 from syft.frameworks.torch.mpc import spdz
 from syft.frameworks.torch.mpc import securenn
 from syft.frameworks.torch.mpc import fss
+from syft.generic.concurrency import fan_out
 from syft.generic.utils import memorize
 
 from syft.generic.tensor import AbstractTensor
@@ -233,13 +234,17 @@ class AdditiveSharingTensor(AbstractTensor):
     def get(self):
         """Fetches all shares and returns the plaintext tensor they represent"""
 
-        shares = list()
+        # The shares are fetched concurrently from their workers
+        shares = fan_out(
+            lambda share: share.get() if isinstance(share, sy.PointerTensor) else share,
+            self.child.values(),
+            locations=lambda share: [
+                share.location if isinstance(share, sy.PointerTensor) else self.owner
+            ],
+        )
 
         for share in self.child.values():
-            if isinstance(share, sy.PointerTensor):
-                shares.append(share.get())
-            else:
-                shares.append(share)
+            if not isinstance(share, sy.PointerTensor):
                 self.owner.de_register_obj(share)
 
         # For dtype values long and int modulo is automatically handled by native torch tensors
@@ -270,9 +275,15 @@ class AdditiveSharingTensor(AbstractTensor):
             self.child, n_workers=len(owners), random_type=self.torch_dtype
         )
 
+        # The shares are sent concurrently to their owners
+        share_ptrs = fan_out(
+            lambda share_and_owner: share_and_owner[0].send(share_and_owner[1], **no_wrap),
+            zip(shares, owners),
+            locations=lambda share_and_owner: [share_and_owner[1]],
+        )
+
         shares_dict = {}
-        for share, owner in zip(shares, owners):
-            share_ptr = share.send(owner, **no_wrap)
+        for share_ptr in share_ptrs:
             shares_dict[share_ptr.location.id] = share_ptr
 
         self.child = shares_dict
@@ -320,9 +331,12 @@ class AdditiveSharingTensor(AbstractTensor):
         ptr_to_sh = self.copy().wrap().send(workers[0], **no_wrap)
         pointer = ptr_to_sh.remote_get()
 
-        pointers = [pointer]
-        for worker in workers[1:]:
-            pointers.append(pointer.copy().move(worker))
+        # The value is copied to the other workers concurrently
+        pointers = [pointer] + fan_out(
+            lambda worker: pointer.copy().move(worker),
+            workers[1:],
+            locations=lambda worker: [pointer.location, worker],
+        )
 
         return sy.MultiPointerTensor(children=pointers)
 
@@ -0,0 +1,103 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from typing import Callable
+from typing import Iterable
+from typing import List
+
+# Max number of calls run at the same time by fan_out
+MAX_WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class _FanOutState(threading.local):
+    in_fan_out = False
+
+
+_state = _FanOutState()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="syft-fan-out"
+                )
+    return _executor
+
+
+def _reset_executor():
+    """The threads of the pool are not copied in a forked process."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _run_in_fan_out(fn: Callable, item):
+    _state.in_fan_out = True
+    try:
+        return fn(item)
+    finally:
+        _state.in_fan_out = False
+
+
+@contextmanager
+def sequential():
+    """Runs the fan outs of the calling thread sequentially.
+
+    This is used while a worker handles a message holding a lock, as the
+    threads of a fan out could need the lock to be served.
+    """
+    in_fan_out = _state.in_fan_out
+    _state.in_fan_out = True
+    try:
+        yield
+    finally:
+        _state.in_fan_out = in_fan_out
+
+
+def _is_remote(worker) -> bool:
+    return getattr(worker, "is_remote", False)
+
+
+def fan_out(fn: Callable, items: Iterable, locations: Callable = None) -> List:
+    """Calls fn on each item concurrently and returns the results in the order
+    of the items.
+
+    This is used to send a command to several workers at once, so that the
+    latency is the one of the slowest worker instead of the sum of all of them.
+    When a call fails, the other ones are still waited for and the exception
+    of the first failing item is raised.
+
+    When the calls send messages, locations(item) must return the workers
+    messaged by the call of item. The calls are then only run concurrently if
+    all these workers process their messages in another process (see
+    BaseWorker.is_remote): the workers living in this process share state
+    which is not thread-safe, and wouldn't answer faster anyway.
+
+    Nested fan outs, fan outs of a single item and fan outs in a sequential()
+    context are run sequentially in the calling thread.
+    """
+    items = list(items)
+    if len(items) <= 1 or _state.in_fan_out:
+        return [fn(item) for item in items]
+
+    if locations is not None and not all(
+        _is_remote(worker) for item in items for worker in locations(item)
+    ):
+        return [fn(item) for item in items]
+
+    executor = _get_executor()
+    futures = [executor.submit(_run_in_fan_out, fn, item) for item in items]
+    wait(futures)
+    return [future.result() for future in futures]
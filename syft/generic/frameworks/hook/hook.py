@@ -1,12 +1,16 @@
 from abc import ABC
 from abc import abstractmethod
+from contextlib import contextmanager
 from functools import wraps
 import inspect
+import itertools
 import re
+import threading
 import types
 from typing import List, Tuple
 
 import syft
+from syft.generic.concurrency import fan_out
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.pointers.object_pointer import ObjectPointer
 from syft.generic.pointers.pointer_tensor import PointerTensor
@@ -20,6 +24,71 @@ from syft.exceptions import route_method_exception
 from syft.exceptions import TensorsNotCollocatedException
 
 
+class _HookState(threading.local):
+    # When True, hooked native methods and functions directly run their
+    # native version. It is local to each thread.
+    bypass = False
+
+
+_hook_state = _HookState()
+
+
+# Methods hooked lazily, per class: {cls: {method name: hooked method factory}}
+_lazy_hooked_methods = {}
+# Serializes the first accesses to the same method from several threads
+_lazy_hook_lock = threading.Lock()
+
+
+def _get_lazy_hooked_method(self, name):
+    """Class-level __getattr__ fallback building the hooked methods on first access.
+
+    The hooked method is then set on the class, so the fallback is only
+    called once per method, except by the threads accessing it at the same
+    time, which reuse the method built by the first one.
+    """
+    for cls in type(self).__mro__:
+        lazy_methods = _lazy_hooked_methods.get(cls)
+        if lazy_methods is not None and name in lazy_methods:
+            with _lazy_hook_lock:
+                if name not in cls.__dict__:
+                    setattr(cls, name, lazy_methods[name](name))
+            return getattr(self, name)
+    raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+
+@contextmanager
+def native_tensors():
+    """Runs the framework methods and functions without the hooking layer.
+
+    Inside this scope, the hooked methods and functions called in the current
+    thread on plain tensors directly call their native version. Only the top
+    level of the arguments is checked for wrappers (pointers, shared or fixed
+    precision tensors...), in which case the call goes through the hooking
+    layer as usual. It is meant for local computations on plain tensors, e.g.
+    data preprocessing.
+
+    Example:
+        >>> with sy.native_tensors():
+        ...     x = torch.ones(10) * 2 + 1
+    """
+    previous = _hook_state.bypass
+    _hook_state.bypass = True
+    try:
+        yield
+    finally:
+        _hook_state.bypass = previous
+
+
+def _has_wrapper(args: tuple, kwargs: dict) -> bool:
+    """Tells whether wrappers are found in the arguments or in their lists."""
+    for arg in itertools.chain(args, kwargs.values()):
+        if hasattr(arg, "child"):
+            return True
+        if isinstance(arg, (list, tuple)) and any(hasattr(a, "child") for a in arg):
+            return True
+    return False
+
+
 class FrameworkHook(ABC):
     @abstractmethod
     def __init__(self, framework_module, local_worker: BaseWorker = None, is_client: bool = True):
@@ -84,6 +153,29 @@ class FrameworkHook(ABC):
                 # Add to the native tensor this method
                 setattr(framework_cls, attr, getattr(from_cls, attr))
 
+    @staticmethod
+    def _hook_methods_lazily(cls: type, attrs: List[str], get_hooked_method):
+        """Adds the hooked version of the methods attrs to cls.
+
+        Special methods are added right away, as Python looks them up on
+        the class directly. The others are built by get_hooked_method(attr)
+        on first access, which keeps the hook construction fast.
+
+        Args:
+            cls: The class to which we are adding methods.
+            attrs: The names of the methods to hook.
+            get_hooked_method: Function building the hooked method from its name.
+        """
+        lazy_methods = _lazy_hooked_methods.setdefault(cls, {})
+        for attr in attrs:
+            if attr.startswith("__") and attr.endswith("__"):
+                setattr(cls, attr, get_hooked_method(attr))
+            else:
+                lazy_methods.setdefault(attr, get_hooked_method)
+
+        if "__getattr__" not in cls.__dict__:
+            cls.__getattr__ = _get_lazy_hooked_method
+
     ### Generics methods ###
     def _hook_native_methods(self, tensor_type: type):
         """
@@ -224,10 +316,9 @@ class FrameworkHook(ABC):
         """
 
         # Use a pre-defined list to select the methods to overload
-        for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type):
-                new_method = self._get_hooked_syft_method(attr)
-                setattr(syft_type, attr, new_method)
+        syft_attrs = set(dir(syft_type))
+        attrs = [attr for attr in self.to_auto_overload[tensor_type] if attr not in syft_attrs]
+        self._hook_methods_lazily(syft_type, attrs, self._get_hooked_syft_method)
 
     def _hook_syft_placeholder_methods(self, tensor_type: type, syft_type: type):
         """
@@ -245,9 +336,11 @@ class FrameworkHook(ABC):
 
             return tracing_method
 
-        # Use a pre-defined list to select the methods to overload
+        # Use a pre-defined list to select the methods to overload. They are
+        # not hooked lazily, as PlaceHolder forwards unknown attributes to its child.
+        syft_attrs = set(dir(syft_type))
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type) or attr in self.boolean_comparators:
+            if attr not in syft_attrs or attr in self.boolean_comparators:
                 new_method = create_tracing_method(self._get_hooked_syft_method(attr), attr)
                 setattr(syft_type, attr, new_method)
 
@@ -258,10 +351,9 @@ class FrameworkHook(ABC):
         command/actions history.
         """
         # Use a pre-defined list to select the methods to overload
-        for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type):
-                new_method = self._get_hooked_private_method(attr)
-                setattr(syft_type, attr, new_method)
+        syft_attrs = set(dir(syft_type))
+        attrs = [attr for attr in self.to_auto_overload[tensor_type] if attr not in syft_attrs]
+        self._hook_methods_lazily(syft_type, attrs, self._get_hooked_private_method)
 
     def _hook_pointer_tensor_methods(self, tensor_type):
         """
@@ -272,10 +364,13 @@ class FrameworkHook(ABC):
         """
 
         # Use a pre-defined list to select the methods to overload
-        for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(PointerTensor) or attr in self.boolean_comparators:
-                new_method = self._get_hooked_pointer_method(attr)
-                setattr(PointerTensor, attr, new_method)
+        pointer_attrs = set(dir(PointerTensor))
+        attrs = [
+            attr
+            for attr in self.to_auto_overload[tensor_type]
+            if attr not in pointer_attrs or attr in self.boolean_comparators
+        ]
+        self._hook_methods_lazily(PointerTensor, attrs, self._get_hooked_pointer_method)
 
     def _hook_object_pointer_methods(self, framework_cls):
         """
@@ -299,10 +394,11 @@ class FrameworkHook(ABC):
         """
 
         # Use a pre-defined list to select the methods to overload
-        for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(MultiPointerTensor):
-                new_method = self._get_hooked_multi_pointer_method(attr)
-                setattr(MultiPointerTensor, attr, new_method)
+        multi_pointer_attrs = set(dir(MultiPointerTensor))
+        attrs = [
+            attr for attr in self.to_auto_overload[tensor_type] if attr not in multi_pointer_attrs
+        ]
+        self._hook_methods_lazily(MultiPointerTensor, attrs, self._get_hooked_multi_pointer_method)
 
     def _hook_string_methods(self, owner):
 
@@ -364,21 +460,18 @@ class FrameworkHook(ABC):
             """
             Operate the hooking
             """
-            # Replace all syft tensor with their child attribute
-            new_self, new_args, new_kwargs = hook_args.unwrap_args_from_method(
-                attr, self, args, kwargs
-            )
-
-            # Send it to the appropriate class and get the response
-            response = getattr(new_self, attr)(*new_args, **new_kwargs)
-
-            # Put back SyftTensor on the tensors found in the response
-            response = hook_args.hook_response(
-                attr, response, wrap_type=type(self), wrap_args=self.get_class_attributes()
+            # Replace all syft tensor with their child attribute, send it to the
+            # appropriate class and put back SyftTensor on the tensors found in the response
+            return hook_args.dispatch_method(
+                attr,
+                self,
+                args,
+                kwargs,
+                lambda new_self, new_args, new_kwargs: getattr(new_self, attr)(
+                    *new_args, **new_kwargs
+                ),
             )
 
-            return response
-
         return overloaded_syft_method
 
     @classmethod
@@ -396,11 +489,15 @@ class FrameworkHook(ABC):
             the hooked method
         """
 
-        @wraps(getattr(tensor_type, method_name))
+        native_method = getattr(tensor_type, method_name)
+
+        @wraps(native_method)
         def overloaded_native_method(self, *args, **kwargs):
             """
             Operate the hooking
             """
+            if _hook_state.bypass and not hasattr(self, "child") and not _has_wrapper(args, kwargs):
+                return native_method(self, *args, **kwargs)
 
             if not hasattr(self, "child"):  # means that it's not a wrapper
 
@@ -574,6 +671,8 @@ class FrameworkHook(ABC):
             """
             Operate the hooking
             """
+            if _hook_state.bypass and not _has_wrapper(args, kwargs):
+                return func(*args, **kwargs)
 
             try:
                 tensor_type = (
@@ -657,9 +756,14 @@ class FrameworkHook(ABC):
                 attr, self, args, kwargs
             )
 
-            results = {}
-            for k, v in new_self.items():
-                results[k] = v.__getattribute__(attr)(*dispatch(new_args, k), **new_kwargs)
+            def run_on_worker(k):
+                return new_self[k].__getattribute__(attr)(*dispatch(new_args, k), **new_kwargs)
+
+            # The workers are called concurrently
+            workers = list(new_self.keys())
+            results = dict(
+                zip(workers, fan_out(run_on_worker, workers, lambda k: [new_self[k].location]))
+            )
 
             # Put back MultiPointerTensor on the tensors found in the response
             response = hook_args.hook_response(
@@ -1,3 +1,4 @@
+import threading
 from typing import Callable
 from typing import Dict
 from typing import List
@@ -45,11 +46,15 @@ backward_func = {
     "my_syft_tensor_type": lambda i, **kwargs: "my_syft_tensor_type(**kwargs).on(i, wrap=False)"
 }
 
-# Methods or functions whose signature changes a lot and that we don't want to "cache", because
-# they have an arbitrary number of tensors in args which can trigger unexpected behaviour
+# Methods or functions whose signature changes a lot, because they have an arbitrary number
+# of tensors in args. They used to bypass the cache, but as it is now keyed on the signature
+# of the arguments, their rules are safely cached like the others.
 ambiguous_methods = set()
 ambiguous_functions = {"run"}
 
+# Maximum number of argument signatures for which rules are cached, per method or function
+MAX_SIGNATURES_PER_ATTR = 16
+
 
 ### Registration logic ###
 def register_type_rule(new_type_rules: Dict):
@@ -87,6 +92,49 @@ def default_register_tensor(*tensorcls):
     register_backward_func({t: default_backward_func(t) for t in tensorcls})
 
 
+### Signature cache ###
+
+
+def build_signature(args_):
+    """
+    Build a cheap structural signature of the args object: a tuple with the
+    type of each element, where lists and tuples are described recursively.
+    Two args objects with the same signature always have the same rule.
+
+    Example:
+        in: ([tensor(1, 2), Pointer@bob], 42)
+        out: ((list, (torch.Tensor, PointerTensor)), int)
+    """
+    return tuple(
+        (type(a), build_signature(a)) if isinstance(a, (list, tuple)) else type(a) for a in args_
+    )
+
+
+# The caches are filled by the threads sending messages concurrently (see fan_out)
+_cache_lock = threading.Lock()
+
+
+def get_cached_function(registry, attr_id, signature):
+    """Returns the function cached for attr_id and signature, or raises a KeyError."""
+    return registry[attr_id][signature]
+
+
+def cache_function(registry, attr_id, signature, function):
+    """Caches the function built for attr_id and signature. A few signatures are kept
+    per attr_id, and the oldest one is forgotten beyond MAX_SIGNATURES_PER_ATTR."""
+    with _cache_lock:
+        signatures = registry.setdefault(attr_id, {})
+    _bounded_insert(signatures, signature, function, MAX_SIGNATURES_PER_ATTR)
+
+
+def _bounded_insert(cache: dict, key, value, max_size: int):
+    """Inserts value in cache, forgetting the oldest entry if it holds max_size entries."""
+    with _cache_lock:
+        if key not in cache and len(cache) >= max_size:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = value
+
+
 ### Main hook args implementation ###
 
 
@@ -100,8 +148,8 @@ def unwrap_args_from_method(attr, method_self, args_, kwargs_):
     hook_method_args_functions. However, sometimes a method (an attr) has multiple
     different argument signatures, such that sometimes arguments have .child objects
     and other times they don't (such as x.div(), which can accept either a tensor or a
-    float as an argument). This invalidates the cache, so we need to have a try/except
-    which refreshes the cache if the signature triggers an error.
+    float as an argument). This is why the cache is keyed on the structural signature
+    of the arguments, so that several rules are kept for each method.
 
     Args:
         attr (str): the name of the method being called
@@ -113,18 +161,17 @@ def unwrap_args_from_method(attr, method_self, args_, kwargs_):
     # Specify an id to distinguish methods from different classes
     # As they won't be used with the same arg types
     attr_id = type(method_self).__name__ + "." + attr
+    signature = build_signature(args_)
     try:
-        assert attr not in ambiguous_methods
-
         # Load the utility function to transform the args
-        hook_args = hook_method_args_functions[attr_id]
+        hook_args = get_cached_function(hook_method_args_functions, attr_id, signature)
         # Try running it
         new_self, new_args = hook_args((method_self, args_))
 
     except (IndexError, KeyError, AssertionError):  # Update the function in case of an error
         args_hook_function, _ = build_unwrap_args_from_function((method_self, args_))
         # Store this utility function in the registry
-        hook_method_args_functions[attr_id] = args_hook_function
+        cache_function(hook_method_args_functions, attr_id, signature, args_hook_function)
         # Run it
         new_self, new_args = args_hook_function((method_self, args_))
 
@@ -147,12 +194,12 @@ def unwrap_args_from_function(attr, args_, kwargs_, return_args_type=False):
         - the type of this new child
         (- the type of the tensors in the arguments)
     """
+    signature = build_signature(args_)
     try:
-        assert attr not in ambiguous_functions
         # Load the utility function to transform the args
         # TODO rename registry or use another one than for methods
-        hook_args = hook_method_args_functions[attr]
-        get_tensor_type_function = get_tensor_type_functions[attr]
+        hook_args = get_cached_function(hook_method_args_functions, attr, signature)
+        get_tensor_type_function = get_cached_function(get_tensor_type_functions, attr, signature)
 
         # Try running it
         new_args = hook_args(args_)
@@ -162,8 +209,8 @@ def unwrap_args_from_function(attr, args_, kwargs_, return_args_type=False):
             args_, return_tuple=True
         )
         # Store the utility functions in registries
-        hook_method_args_functions[attr] = args_hook_function
-        get_tensor_type_functions[attr] = get_tensor_type_function
+        cache_function(hook_method_args_functions, attr, signature, args_hook_function)
+        cache_function(get_tensor_type_functions, attr, signature, get_tensor_type_function)
         # Run it
         new_args = args_hook_function(args_)
 
@@ -204,8 +251,8 @@ def hook_response(attr, response, wrap_type, wrap_args={}, new_self=None):
     To make this efficient, we cache which elements of the response (which can be more
     complicated with nested tuples for example) need to be wrapped in a dictionary called
     hook_method_response_functions. However, sometimes a method (an attr) has multiple
-    different response signatures. This invalidates the cache, so we need to have a
-    try/except which refreshes the cache if the signature triggers an error.
+    different response signatures, so the cache is keyed on the structural signature
+    of the response.
 
     Args:
         attr (str): the name of the method being called
@@ -229,19 +276,20 @@ def hook_response(attr, response, wrap_type, wrap_args={}, new_self=None):
 
     hash_wrap_args = hash(frozenset(wrap_args.items()))
     attr_id = f"{attr}@{wrap_type.__name__}.{response_is_tuple}.{hash_wrap_args}"
+    signature = build_signature(response)
 
     try:
-        assert attr not in ambiguous_functions
-
         # Load the utility function to transform the args
-        response_hook_function = hook_method_response_functions[attr_id]
+        response_hook_function = get_cached_function(
+            hook_method_response_functions, attr_id, signature
+        )
         # Try running it
         new_response = response_hook_function(response)
 
     except (IndexError, KeyError, AssertionError):  # Update the function in case of an error
         response_hook_function = build_wrap_response_from_function(response, wrap_type, wrap_args)
         # Store this utility function in the registry
-        hook_method_response_functions[attr_id] = response_hook_function
+        cache_function(hook_method_response_functions, attr_id, signature, response_hook_function)
         # Run it
         new_response = response_hook_function(response)
 
@@ -252,6 +300,79 @@ def hook_response(attr, response, wrap_type, wrap_args={}, new_self=None):
     return new_response
 
 
+### Compiled dispatch ###
+
+# Call paths compiled per (method, type of self, signature of the arguments). Each path
+# holds the function unwrapping the arguments and, for each wrapper attributes and signature
+# of the response, the function wrapping the response back.
+compiled_method_paths = {}
+
+# Maximum number of compiled call paths
+MAX_COMPILED_METHOD_PATHS = 4096
+
+
+def dispatch_method(attr, method_self, args_, kwargs_, call, new_self=None, inplace=False):
+    """
+    Runs a method of a tensor of the chain on the child of its arguments and wraps its
+    response with the type and class attributes of method_self, like unwrap_args_from_method
+    followed by hook_response. The call path is compiled once per (attr, type of self,
+    signature of the arguments) so that the next calls with the same chain signature skip
+    the rebuilding of the rules and the multiple registry lookups of the two separate steps.
+
+    Args:
+        attr (str): the name of the method being called
+        method_self: the tensor on which the method is being called
+        args_ (tuple): the arguments being passed to the method
+        kwargs_ (dict): the keyword arguments being passed to the method
+        call: function called with (child_self, child_args, kwargs_) to run the method on
+            the children
+        new_self: returned for the inline methods, as in hook_response
+        inplace (bool): if True, the method works inplace and method_self is returned
+
+    Returns:
+        the wrapped response
+    """
+    key = (attr, type(method_self), build_signature(args_))
+    try:
+        unwrap_function, wrap_functions = compiled_method_paths[key]
+        child_self, child_args = unwrap_function((method_self, args_))
+
+    except (IndexError, KeyError, AssertionError):  # Compile the path in case of an error
+        unwrap_function, _ = build_unwrap_args_from_function((method_self, args_))
+        wrap_functions = {}
+        _bounded_insert(
+            compiled_method_paths, key, (unwrap_function, wrap_functions), MAX_COMPILED_METHOD_PATHS
+        )
+        child_self, child_args = unwrap_function((method_self, args_))
+
+    response = call(child_self, child_args, kwargs_)
+
+    # inplace methods should just return self
+    if inplace:
+        return method_self
+    if "__i" == attr[0:3]:
+        return new_self
+
+    response_is_tuple = isinstance(response, tuple)
+    if not response_is_tuple:
+        response = (response, 1)
+
+    # The class attributes are read after the call, as the method can update them
+    wrap_args = method_self.get_class_attributes()
+    wrap_key = (tuple(wrap_args.items()), build_signature(response))
+    try:
+        new_response = wrap_functions[wrap_key](response)
+    except (IndexError, KeyError, AssertionError):
+        wrap_function = build_wrap_response_from_function(response, type(method_self), wrap_args)
+        _bounded_insert(wrap_functions, wrap_key, wrap_function, MAX_SIGNATURES_PER_ATTR)
+        new_response = wrap_function(response)
+
+    if not response_is_tuple:
+        new_response, _ = new_response
+
+    return new_response
+
+
 def build_wrap_response_from_function(response, wrap_type, wrap_args):
     """
     Build the function that hook the response.
@@ -645,9 +766,8 @@ def register_response(
     To make this efficient, we cache which elements of the response (which can be more
     complicated with nested tuples for example) in the dict register_response_functions
 
-    However, sometimes a function  (an attr) has multiple different response signatures.
-    This invalidates the cache, so we need to have a try/except which refreshes the
-    cache if the signature triggers an error.
+    However, sometimes a function  (an attr) has multiple different response signatures,
+    so the cache is keyed on the structural signature of the response.
 
     Args:
         attr (str): the name of the function being called
@@ -663,20 +783,20 @@ def register_response(
         response = (response, 1)
 
     attr_id = f"{attr}"
+    signature = build_signature(response)
 
     try:
-        assert attr not in ambiguous_functions
-        assert attr not in ambiguous_methods
-
         # Load the utility function to register the response and transform tensors with pointers
-        register_response_function = register_response_functions[attr_id]
+        register_response_function = get_cached_function(
+            register_response_functions, attr_id, signature
+        )
         # Try running it
         new_response = register_response_function(response, response_ids=response_ids, owner=owner)
 
     except (IndexError, KeyError, AssertionError):  # Update the function in cas of an error
         register_response_function = build_register_response_function(response)
         # Store this utility function in the registry
-        register_response_functions[attr_id] = register_response_function
+        cache_function(register_response_functions, attr_id, signature, register_response_function)
         # Run it
         new_response = register_response_function(response, response_ids=response_ids, owner=owner)
 
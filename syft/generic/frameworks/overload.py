@@ -19,21 +19,18 @@ class Overloaded:
         """
 
         def _hook_method_args(self, *args, **kwargs):
-            # Replace all syft tensor with their child attribute
-            new_self, new_args, new_kwargs = hook_args.unwrap_args_from_method(
-                attr.__name__, self, args, kwargs
+            # Replace all syft tensor with their child attribute, send it to the
+            # appropriate class and put back SyftTensor on the tensors found in the response
+            return hook_args.dispatch_method(
+                attr.__name__,
+                self,
+                args,
+                kwargs,
+                lambda new_self, new_args, new_kwargs: attr(
+                    self, new_self, *new_args, **new_kwargs
+                ),
             )
 
-            # Send it to the appropriate class and get the response
-            response = attr(self, new_self, *new_args, **new_kwargs)
-
-            # Put back SyftTensor on the tensors found in the response
-            response = hook_args.hook_response(
-                attr.__name__, response, wrap_type=type(self), wrap_args=self.get_class_attributes()
-            )
-
-            return response
-
         return _hook_method_args
 
     @staticmethod
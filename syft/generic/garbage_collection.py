@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Union
+
+from syft.messaging.message import ForceObjectDeleteMessage
+from syft.workers.abstract import AbstractWorker
+
+
+class RemoteGarbageCollector:
+    """Collects the ids of remote objects whose pointers were deleted.
+
+    By default, every deleted pointer immediately sends a ForceObjectDeleteMessage
+    to the location of the object it points to. When batching is enabled, ids are
+    instead accumulated per location and sent as a single ForceObjectDeleteMessage
+    holding all of them. A location's queue is flushed when:
+        - it holds `batch_size` ids,
+        - its oldest id has been waiting for more than `flush_interval` seconds.
+          This is checked whenever an id is queued or a message is sent and, for
+          the remote locations, by a timer so that the ids are sent even if no
+          other message is. The queues of the virtual workers are not flushed by
+          the timer, as their messages are handled in the thread sending them.
+        - a message is about to be sent to that location, so that the deletions
+          are always applied before any subsequent command,
+        - `flush()` is called explicitly.
+
+    Args:
+        owner: the worker owning the pointers, which sends the delete messages.
+        batch_size: max number of ids queued for a location before flushing.
+        flush_interval: max number of seconds an id can wait before being flushed.
+    """
+
+    def __init__(
+        self, owner: AbstractWorker, batch_size: int = 100, flush_interval: float = 1.0,
+    ):
+        self.owner = owner
+        self.batching = False
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # location id -> (location, list of ids to delete on that location)
+        self._queues = {}
+        # location id -> time at which the oldest id of the queue was added
+        self._oldest = {}
+        # The queues are updated by the threads sending messages concurrently (see
+        # fan_out). It is reentrant as a pointer can be deleted while it is held.
+        # Messages are sent without holding it.
+        self._lock = threading.RLock()
+        # Timer flushing the expired queues of the remote locations
+        self._timer = None
+        # location id -> (id of the thread sending a batch to that location, event
+        # set once it is sent), so that the other messages are sent after the batch
+        self._in_flight = {}
+
+    def configure(
+        self, batching: bool = None, batch_size: int = None, flush_interval: float = None
+    ):
+        """Updates the garbage collection settings.
+
+        Disabling batching flushes all the pending ids.
+        """
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        if batching is not None:
+            self.batching = batching
+            if not batching:
+                self.flush()
+
+    def collect(self, obj_id: Union[str, int], location: AbstractWorker):
+        """Requests the deletion of the object `obj_id` stored on `location`."""
+        if not self.batching:
+            self.owner.send_msg(ForceObjectDeleteMessage(obj_id), location)
+            return
+
+        with self._lock:
+            is_new = location.id not in self._queues
+            if is_new:
+                self._queues[location.id] = (location, [])
+                self._oldest[location.id] = time.monotonic()
+
+            _, ids = self._queues[location.id]
+            ids.append(obj_id)
+            is_full = len(ids) >= self.batch_size
+
+        if is_new and getattr(location, "is_remote", False):
+            self._schedule_flush()
+
+        if is_full:
+            self.flush(location)
+        else:
+            self.flush_expired()
+
+    def pending(self, location: AbstractWorker = None) -> int:
+        """Returns the number of ids waiting to be deleted (on `location` if provided)."""
+        with self._lock:
+            if location is not None:
+                return len(self._queues[location.id][1]) if location.id in self._queues else 0
+            return sum(len(ids) for _, ids in self._queues.values())
+
+    def flush(self, location: AbstractWorker = None):
+        """Sends the pending deletions to `location`, or to all locations if None."""
+        batches = []
+        with self._lock:
+            if location is None:
+                location_ids = list(self._queues.keys())
+            else:
+                location_ids = [location.id]
+
+            for location_id in location_ids:
+                # Pop the queue before sending, as sending the message could trigger
+                # the deletion of other pointers and thus a re-entrant call
+                location, ids = self._queues.pop(location_id, (None, None))
+                self._oldest.pop(location_id, None)
+                if ids:
+                    sent = threading.Event()
+                    self._in_flight[location_id] = (threading.get_ident(), sent)
+                    batches.append((location, ids, sent))
+
+        for location, ids, sent in batches:
+            try:
+                self.owner.send_msg(ForceObjectDeleteMessage(ids), location)
+            finally:
+                with self._lock:
+                    if self._in_flight.get(location.id, (None, None))[1] is sent:
+                        del self._in_flight[location.id]
+                sent.set()
+
+    def flush_expired(self, remote_only: bool = False):
+        """Flushes the queues whose oldest id has waited more than `flush_interval`.
+
+        Args:
+            remote_only: if True, only the queues of the remote locations are flushed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                self._queues[location_id][0]
+                for location_id, oldest in list(self._oldest.items())
+                if now - oldest >= self.flush_interval and location_id in self._queues
+            ]
+        for location in expired:
+            if not remote_only or getattr(location, "is_remote", False):
+                self.flush(location)
+
+    def _schedule_flush(self):
+        """Starts the timer flushing the queue of the remote location which expires
+        first, unless it is already started."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            oldest = [
+                self._oldest[location_id]
+                for location_id, (location, _) in self._queues.items()
+                if getattr(location, "is_remote", False)
+            ]
+            if not oldest:
+                return
+            delay = max(0.0, min(oldest) + self.flush_interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._flush_on_timer)
+            self._timer.name = "syft-gc-flush"
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush_expired(remote_only=True)
+        self._schedule_flush()
+
+    def before_send(self, location: AbstractWorker):
+        """Hook called before any message is sent to `location`.
+
+        Pending deletions for `location` are sent first so that the remote
+        worker applies them before processing the message.
+        """
+        if self._in_flight:
+            with self._lock:
+                thread_id, sent = self._in_flight.get(location.id, (None, None))
+            # The batch being sent by another thread, like the timer, must be
+            # received first
+            if sent is not None and thread_id != threading.get_ident():
+                sent.wait()
+        if self._queues:
+            with self._lock:
+                is_pending = location.id in self._queues
+            if is_pending:
+                self.flush(location)
+            self.flush_expired()
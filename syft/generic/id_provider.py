@@ -1,12 +1,42 @@
+import os
 import random
+import secrets
+import threading
+import weakref
 from typing import List
 from syft import exceptions
 
+# Compact ids are made of a random prefix drawn once per process followed
+# by a monotonic counter. They fit in a signed 64 bits integer. The prefix
+# doesn't depend on the seed of random, so that processes seeded alike
+# don't generate the same ids.
+PREFIX_BITS = 23
+COUNTER_BITS = 40
+MAX_COUNTER = 2 ** COUNTER_BITS
+
+# Compact providers whose prefix must be renewed in forked processes
+_compact_providers = weakref.WeakSet()
+
 
 def create_random_id():
     return int(10e10 * random.random())
 
 
+def create_random_prefix():
+    # The prefix is never 0 so that compact ids can't collide with the small
+    # ids provided by hand or by the legacy random scheme (< 10e10)
+    return secrets.randbelow(2 ** PREFIX_BITS - 1) + 1
+
+
+class _ThreadIds(threading.local):
+    """The ids set and recorded by each thread."""
+
+    def __init__(self):
+        self.given_ids = []
+        self.record_ids = False
+        self.recorded_ids = []
+
+
 class IdProvider:
     """Provides Id to all syft objects.
 
@@ -14,14 +44,93 @@ class IdProvider:
     Can take a pre set list in input and will complete
     when it's empty.
 
+    If compact is True, ids are made of a random prefix, specific to the
+    process, and of a monotonic counter: they are unique without the need
+    to store all the ids generated so far. The ranges of counters used with
+    each prefix are kept to check the ids given to set_next_ids, which can
+    only detect the ids generated by this provider.
+
+    The ids set with set_next_ids, and the recording of the ids, are specific
+    to the current thread, so that the threads sending messages concurrently
+    (see fan_out) don't take the ids set by each other.
+
     An instance of IdProvider is accessible via sy.ID_PROVIDER.
     """
 
-    def __init__(self, given_ids=None):
-        self.given_ids = given_ids if given_ids is not None else list()
+    def __init__(self, given_ids=None, compact: bool = False):
+        self._thread_ids = _ThreadIds()
+        if given_ids is not None:
+            self.given_ids = given_ids
         self.generated = set()
-        self.record_ids = False
-        self.recorded_ids = []
+        self.compact = compact
+        # ids can be popped concurrently by the threads of a fan out
+        self._lock = threading.RLock()
+        if compact:
+            self.prefix = create_random_prefix()
+            self.counter = 0
+            # first counter used with the current prefix
+            self._prefix_start = 0
+            # (prefix, first counter, end counter) of the previous prefixes
+            self._previous_prefixes = []
+            _compact_providers.add(self)
+
+    @property
+    def given_ids(self) -> List:
+        return self._thread_ids.given_ids
+
+    @given_ids.setter
+    def given_ids(self, given_ids: List):
+        self._thread_ids.given_ids = given_ids
+
+    @property
+    def record_ids(self) -> bool:
+        return self._thread_ids.record_ids
+
+    @record_ids.setter
+    def record_ids(self, record_ids: bool):
+        self._thread_ids.record_ids = record_ids
+
+    @property
+    def recorded_ids(self) -> List:
+        return self._thread_ids.recorded_ids
+
+    @recorded_ids.setter
+    def recorded_ids(self, recorded_ids: List):
+        self._thread_ids.recorded_ids = recorded_ids
+
+    def reset_prefix(self):
+        """Draws a new prefix for the compact ids.
+
+        The counter is not restarted, so the ids stay unique even if the
+        same prefix is drawn again.
+        """
+        with self._lock:
+            if self.counter > self._prefix_start:
+                self._previous_prefixes.append((self.prefix, self._prefix_start, self.counter))
+            self.prefix = create_random_prefix()
+            self._prefix_start = self.counter
+
+    def _next_compact_id(self) -> int:
+        with self._lock:
+            if self.counter >= MAX_COUNTER:
+                # Very unlikely, the counter can only restart with another prefix
+                used_prefixes = {prefix for prefix, _, _ in self._previous_prefixes}
+                used_prefixes.add(self.prefix)
+                while self.prefix in used_prefixes:
+                    self.reset_prefix()
+                self.counter = self._prefix_start = 0
+            compact_id = (self.prefix << COUNTER_BITS) | self.counter
+            self.counter += 1
+        return compact_id
+
+    def _is_generated(self, id) -> bool:
+        if id in self.generated:
+            return True
+        if self.compact and isinstance(id, int):
+            prefix, counter = id >> COUNTER_BITS, id & (MAX_COUNTER - 1)
+            ranges = self._previous_prefixes + [(self.prefix, self._prefix_start, self.counter)]
+            return any(prefix == p and start <= counter < end for p, start, end in ranges)
+        return False
 
     def pop(self, *args) -> int:
         """Provides random ids and store them.
@@ -32,15 +141,22 @@ class IdProvider:
         Returns:
             Random Id.
         """
-        if len(self.given_ids):
-            random_id = self.given_ids.pop(-1)
+        thread_ids = self._thread_ids
+        if len(thread_ids.given_ids):
+            random_id = thread_ids.given_ids.pop(-1)
+            with self._lock:
+                self.generated.add(random_id)
+        elif self.compact:
+            # Only the given ids are stored, the counter ensures uniqueness
+            random_id = self._next_compact_id()
         else:
-            random_id = create_random_id()
-            while random_id in self.generated:
+            with self._lock:
                 random_id = create_random_id()
-        self.generated.add(random_id)
-        if self.record_ids:
-            self.recorded_ids.append(random_id)
+                while random_id in self.generated:
+                    random_id = create_random_id()
+                self.generated.add(random_id)
+        if thread_ids.record_ids:
+            thread_ids.recorded_ids.append(random_id)
 
         return random_id
 
@@ -55,7 +171,7 @@ class IdProvider:
 
         """
         if check_ids:
-            intersect = self.generated.intersection(set(given_ids))
+            intersect = {id for id in given_ids if self._is_generated(id)}
             if len(intersect) > 0:
                 message = f"Provided IDs {intersect} are contained in already generated IDs"
                 raise exceptions.IdNotUniqueError(message)
@@ -86,3 +202,15 @@ class IdProvider:
     @staticmethod
     def seed(seed=0):
         random.seed(seed)
+
+
+def _reset_compact_prefixes():
+    # A forked process (e.g. a websocket server started with multiprocessing)
+    # must not generate the same ids as its parent
+    for provider in list(_compact_providers):
+        provider._lock = threading.RLock()
+        provider.reset_prefix()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_compact_prefixes)
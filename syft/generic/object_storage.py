@@ -1,7 +1,17 @@
 from collections import defaultdict
+from collections import OrderedDict
+from contextlib import contextmanager
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
 from typing import List
 from typing import Union
 
+import numpy as np
+
 from syft.exceptions import ObjectNotFoundError
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.generic.frameworks.types import FrameworkTensorType
@@ -14,19 +24,106 @@ class ObjectStore:
 
     A wrapper object to a collection of objects where all objects
     are stored using their IDs as keys.
+
+    The store can optionally be given a memory budget (see `set_memory_limit`).
+    Tensors are then accounted by their size in bytes and, when the budget is
+    exceeded, the least recently used ones are spilled to disk. A spilled tensor
+    keeps its identity (id, tags, ...) but its data is replaced by an empty
+    tensor until it is accessed again through `get_obj`, which transparently
+    loads it back from its memory-mapped file. Pinned objects are never spilled,
+    nor are the objects accessed while a message is processed (see `hold`), nor
+    the tensors of the registered plans (their state) and datasets (their data
+    and targets), which are read without `get_obj`.
+
+    Objects registered while a session is active (see `session`) are owned by
+    that session. They can be freed all at once when the session ends with
+    `release_session`, or when they have not been accessed for some time with
+    `sweep`. Tagged and pinned objects are never freed this way.
+
+    The session and the hold context are specific to the thread using them, so
+    that messages processed by several threads, like a server processing a
+    message while another one waits for a peer, don't use each other's.
     """
 
-    def __init__(self, owner: AbstractWorker = None):
+    def __init__(
+        self, owner: AbstractWorker = None, memory_limit: int = None, spill_dir: str = None
+    ):
         self.owner = owner
 
         # This is the collection of objects being stored.
         self._objects = {}
         # This is an index to retrieve objects from their tags in an efficient way
         self._tag_to_object_ids = defaultdict(set)
+        # This is an index of the framework tensors with their size in bytes, so
+        # that statistics on tensors don't need to scan all the objects
+        self._tensor_nbytes = {}
+        self._tensors_total_nbytes = 0
+
+        # Memory accounting, only active when a memory limit is set
+        self.memory_limit = None
+        self.spill_dir = None
+        self._owns_spill_dir = False
+        # Number of bytes of the accounted tensors currently in memory
+        self._memory_usage = 0
+        # id -> nbytes of the in-memory tensors which can be spilled, least recently used first
+        self._lru = OrderedDict()
+        # id -> nbytes of the in-memory tensors which can't be spilled (pinned or unsupported dtype)
+        self._pinned_usage = {}
+        # id -> path of the file where the tensor data was spilled
+        self._spilled = {}
+        self._pinned = set()
+        # id of a registered plan or dataset -> ids of the tensors it reads directly
+        self._holder_tensors = {}
+        # id -> number of registered plans or datasets reading the tensor directly
+        self._referenced = defaultdict(int)
+        self._spill_counter = itertools.count()
+        # Per thread: the current session and the ids of the objects accessed in
+        # the current hold context
+        self._local = threading.local()
+        # thread id -> ids of the objects accessed in its hold context, for all
+        # the threads in a hold context
+        self._active_holds = {}
+
+        # Session bookkeeping
+        # id -> session owning the object
+        self._object_sessions = {}
+        # session -> ids of the objects it owns
+        self._session_objects = defaultdict(set)
+        # id -> last time a session owned object was accessed
+        self._last_access = {}
+
+        if memory_limit is not None:
+            self.set_memory_limit(memory_limit, spill_dir=spill_dir)
+
+    @property
+    def current_session(self):
+        """The session on whose behalf objects are registered by the current thread."""
+        return getattr(self._local, "session", None)
+
+    @current_session.setter
+    def current_session(self, session_id):
+        self._local.session = session_id
+
+    @property
+    def _held(self):
+        """The ids of the objects accessed in the hold context of the current thread,
+        None outside of it."""
+        return getattr(self._local, "held", None)
 
     @property
     def _tensors(self):
-        return {id_: obj for id_, obj in self._objects.items() if isinstance(obj, FrameworkTensor)}
+        return {id_: self._objects[id_] for id_ in self._tensor_nbytes}
+
+    def tensors_count(self) -> int:
+        """Returns the number of framework tensors stored."""
+        return len(self._tensor_nbytes)
+
+    def tensors_nbytes(self) -> int:
+        """Returns the size in bytes of the framework tensors stored, as registered.
+
+        Tensors wrapping a chain (like pointers) don't hold data and count as 0.
+        """
+        return self._tensors_total_nbytes
 
     def register_obj(self, obj: object, obj_id: Union[str, int] = None):
         """Registers the specified object with the current worker node.
@@ -44,6 +141,307 @@ class ObjectStore:
             obj.id = obj_id
         self.set_obj(obj)
 
+    def set_memory_limit(self, memory_limit: int, spill_dir: str = None):
+        """Sets the memory budget of the store.
+
+        Args:
+            memory_limit: the max number of bytes that tensors can use in memory
+                before being spilled to disk. None disables the accounting.
+            spill_dir: the directory where tensors are spilled. If not provided,
+                a temporary directory is created.
+        """
+        if memory_limit is None:
+            # Load back everything before disabling the accounting
+            for obj_id in list(self._spilled):
+                self._load(obj_id)
+            self.memory_limit = None
+            self._memory_usage = 0
+            self._lru.clear()
+            self._pinned_usage.clear()
+            self._remove_spill_dir()
+            return
+
+        if spill_dir is not None and spill_dir != self.spill_dir:
+            if self._spilled:
+                raise ValueError("Can't change the spill directory while objects are spilled")
+            self._remove_spill_dir()
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = spill_dir
+
+        if self.memory_limit is None:
+            self.memory_limit = memory_limit
+            for obj in self._objects.values():
+                self._account(obj)
+        else:
+            self.memory_limit = memory_limit
+
+        self._evict()
+
+    @property
+    def memory_usage(self) -> int:
+        """Number of bytes used in memory by the accounted tensors."""
+        return self._memory_usage
+
+    def pin(self, obj: Union[object, str, int]):
+        """Prevents an object from being spilled to disk.
+
+        Pinning a dataset or a plan pins the registered tensors it holds
+        (its data and targets, or its state).
+
+        Args:
+            obj: the object or the id of the object to pin.
+        """
+        for obj_id in self._ids_to_pin(obj):
+            self._pinned.add(obj_id)
+            if obj_id in self._spilled:
+                self._load(obj_id)
+            if obj_id in self._lru:
+                self._pinned_usage[obj_id] = self._lru.pop(obj_id)
+
+    def unpin(self, obj: Union[object, str, int]):
+        """Allows a pinned object to be spilled to disk again.
+
+        Args:
+            obj: the object or the id of the object to unpin.
+        """
+        for obj_id in self._ids_to_pin(obj):
+            self._pinned.discard(obj_id)
+            if obj_id in self._pinned_usage and obj_id not in self._referenced:
+                self._lru[obj_id] = self._pinned_usage.pop(obj_id)
+        self._evict()
+
+    def is_spilled(self, obj_id: Union[str, int]) -> bool:
+        """Returns True if the data of the object is currently stored on disk."""
+        return obj_id in self._spilled
+
+    def _ids_to_pin(self, obj) -> List[Union[str, int]]:
+        if isinstance(obj, (str, int)):
+            return [obj]
+        return [obj.id] + self._tensors_read_directly(obj)
+
+    @staticmethod
+    def _tensors_read_directly(obj) -> List[Union[str, int]]:
+        """Returns the ids of the tensors a plan (its state) or a dataset (its data
+        and targets) holds references to."""
+        if isinstance(obj, FrameworkTensor):
+            return []
+        if hasattr(obj, "state") and hasattr(obj.state, "tensors"):
+            tensors = obj.state.tensors()
+        elif hasattr(obj, "data") and hasattr(obj, "targets"):
+            tensors = [obj.data, obj.targets]
+        else:
+            return []
+        return [
+            tensor.id
+            for tensor in tensors
+            if isinstance(tensor, FrameworkTensor) and hasattr(tensor, "id")
+        ]
+
+    def _keep_tensors(self, holder_id: Union[str, int], tensor_ids: List[Union[str, int]]):
+        """Keeps in memory the tensors read directly by the plan or dataset `holder_id`."""
+        self._holder_tensors[holder_id] = tensor_ids
+        for obj_id in tensor_ids:
+            self._referenced[obj_id] += 1
+            if obj_id in self._spilled:
+                self._load(obj_id)
+            if obj_id in self._lru:
+                self._pinned_usage[obj_id] = self._lru.pop(obj_id)
+
+    def _release_tensors(self, holder_id: Union[str, int]):
+        """Allows the tensors of a plan or dataset which is removed to be spilled again."""
+        for obj_id in self._holder_tensors.pop(holder_id, ()):
+            self._referenced[obj_id] -= 1
+            if self._referenced[obj_id] > 0:
+                continue
+            del self._referenced[obj_id]
+            if obj_id in self._pinned_usage and obj_id not in self._pinned:
+                self._lru[obj_id] = self._pinned_usage.pop(obj_id)
+
+    @staticmethod
+    def _spillable(obj) -> bool:
+        """Only plain tensors holding their own data can be spilled to disk.
+
+        Tensors requiring grad are excluded as autograd may hold references
+        to their data.
+        """
+        return (
+            isinstance(obj, FrameworkTensor)
+            and not hasattr(obj, "child")
+            and not obj.requires_grad
+            and getattr(obj, "_base", None) is None
+        )
+
+    def _account(self, obj):
+        """Adds a tensor to the memory accounting."""
+        if not self._spillable(obj):
+            return
+        nbytes = obj.numel() * obj.element_size()
+        self._memory_usage += nbytes
+        if obj.id in self._pinned or obj.id in self._referenced:
+            self._pinned_usage[obj.id] = nbytes
+        else:
+            self._lru[obj.id] = nbytes
+
+    def _unaccount(self, obj_id: Union[str, int]):
+        """Removes an object from the memory accounting and deletes its spill file."""
+        nbytes = self._lru.pop(obj_id, None)
+        if nbytes is None:
+            nbytes = self._pinned_usage.pop(obj_id, 0)
+        self._memory_usage -= nbytes
+
+        path = self._spilled.pop(obj_id, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def _evict(self, keep: Union[str, int] = None):
+        """Spills the least recently used tensors until the memory budget is respected.
+
+        The objects held by the hold contexts of all the threads are never spilled,
+        so the budget can be exceeded until the contexts end.
+
+        Args:
+            keep: an id which must not be spilled, typically the object being accessed.
+        """
+        if self.memory_limit is None:
+            return
+
+        held = list(self._active_holds.values())
+        for obj_id in list(self._lru):
+            if self._memory_usage <= self.memory_limit:
+                break
+            if obj_id != keep and not any(obj_id in ids for ids in held):
+                self._spill(obj_id)
+
+    def _spill(self, obj_id: Union[str, int]):
+        obj = self._objects[obj_id]
+        try:
+            array = obj.numpy()
+        except TypeError:
+            # dtypes without a numpy equivalent can't be spilled
+            self._pinned_usage[obj_id] = self._lru.pop(obj_id)
+            return
+
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="syft_spill_")
+            self._owns_spill_dir = True
+        path = os.path.join(self.spill_dir, f"{next(self._spill_counter)}.npy")
+        np.save(path, array)
+
+        _set_tensor_data(obj, obj.new_empty((0,)))
+        self._spilled[obj_id] = path
+        self._memory_usage -= self._lru.pop(obj_id)
+
+    def _load(self, obj_id: Union[str, int]):
+        obj = self._objects[obj_id]
+        path = self._spilled.pop(obj_id)
+        array = np.load(path, mmap_mode="r")
+        _set_tensor_data(obj, obj.new_tensor(np.array(array)))
+        del array
+        os.remove(path)
+        self._account(obj)
+
+    def _touch(self, obj_id: Union[str, int]):
+        """Marks an object as recently used, loading it back from disk if needed."""
+        held = self._held
+        if held is not None:
+            held.add(obj_id)
+        if obj_id in self._spilled:
+            self._load(obj_id)
+            self._evict(keep=obj_id)
+        elif obj_id in self._lru:
+            self._lru.move_to_end(obj_id)
+
+    @contextmanager
+    def hold(self):
+        """Keeps in memory the objects accessed or set in this context.
+
+        A message can access several tensors, like the operands of a command,
+        which must all stay in memory until it is processed. They are only
+        spilled, if needed, when the outermost hold context ends.
+        """
+        if self._held is not None:
+            yield self
+            return
+
+        thread_id = threading.get_ident()
+        self._local.held = self._active_holds[thread_id] = set()
+        try:
+            yield self
+        finally:
+            self._local.held = None
+            del self._active_holds[thread_id]
+            self._evict()
+
+    @contextmanager
+    def session(self, session_id):
+        """Registers the objects set in this context as owned by `session_id`."""
+        previous_session = self.current_session
+        self.current_session = session_id
+        try:
+            yield self
+        finally:
+            self.current_session = previous_session
+
+    def session_objects(self, session_id) -> List[Union[str, int]]:
+        """Returns the ids of the objects owned by a session."""
+        return list(self._session_objects.get(session_id, ()))
+
+    def _is_collectable(self, obj_id: Union[str, int]) -> bool:
+        """Tagged and pinned objects are kept when their session is released or idle."""
+        obj = self._objects.get(obj_id)
+        return obj is not None and not obj.tags and obj_id not in self._pinned
+
+    def release_session(self, session_id) -> int:
+        """Removes the objects owned by a session, except the tagged or pinned ones.
+
+        Returns:
+            The number of objects removed.
+        """
+        obj_ids = self._session_objects.pop(session_id, set())
+        removed = 0
+        for obj_id in obj_ids:
+            if self._is_collectable(obj_id):
+                self.rm_obj(obj_id)
+                removed += 1
+            else:
+                # The object outlives its session
+                self._object_sessions.pop(obj_id, None)
+                self._last_access.pop(obj_id, None)
+        return removed
+
+    def sweep(self, ttl: float) -> int:
+        """Removes the session owned objects which were not accessed for `ttl` seconds.
+
+        Tagged and pinned objects are skipped.
+
+        Returns:
+            The number of objects removed.
+        """
+        deadline = time.monotonic() - ttl
+        expired = [obj_id for obj_id, last in self._last_access.items() if last < deadline]
+        removed = 0
+        for obj_id in expired:
+            if self._is_collectable(obj_id):
+                self.rm_obj(obj_id)
+                removed += 1
+        return removed
+
+    def _forget_session(self, obj_id: Union[str, int]):
+        session_id = self._object_sessions.pop(obj_id, None)
+        if session_id is not None:
+            self._last_access.pop(obj_id, None)
+            session_objects = self._session_objects.get(session_id)
+            if session_objects is not None:
+                session_objects.discard(obj_id)
+                if not session_objects:
+                    del self._session_objects[session_id]
+
+    def _remove_spill_dir(self):
+        if self._owns_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self._owns_spill_dir = False
+
     def de_register_obj(self, obj: object, _recurse_torch_objs: bool = True):
         """Deregisters the specified object.
 
@@ -80,6 +478,11 @@ class ObjectStore:
             else:
                 raise e
 
+        if self.memory_limit is not None:
+            self._touch(obj_id)
+        if obj_id in self._last_access:
+            self._last_access[obj_id] = time.monotonic()
+
         return obj
 
     def set_obj(self, obj: Union[FrameworkTensorType, AbstractTensor]) -> None:
@@ -89,14 +492,34 @@ class ObjectStore:
             obj: A torch or syft tensor with an id.
         """
         obj.owner = self.owner
+        if self.memory_limit is not None and obj.id in self._objects:
+            if self._objects[obj.id] is obj and obj.id in self._spilled:
+                self._load(obj.id)
+            self._unaccount(obj.id)
+        if obj.id in self._objects:
+            self._unindex(self._objects[obj.id])
         self._objects[obj.id] = obj
-        # Add entry in the tag index
-        if obj.tags:
-            for tag in obj.tags:
-                if tag not in self._tag_to_object_ids:
-                    self._tag_to_object_ids[tag] = {obj.id}
-                else:
-                    self._tag_to_object_ids[tag].add(obj.id)
+        self._index(obj)
+
+        if obj.id in self._holder_tensors:
+            self._release_tensors(obj.id)
+        tensor_ids = self._tensors_read_directly(obj)
+        if tensor_ids:
+            self._keep_tensors(obj.id, tensor_ids)
+
+        if self._object_sessions:
+            self._forget_session(obj.id)
+        if self.current_session is not None:
+            self._object_sessions[obj.id] = self.current_session
+            self._session_objects[self.current_session].add(obj.id)
+            self._last_access[obj.id] = time.monotonic()
+
+        if self.memory_limit is not None:
+            held = self._held
+            if held is not None:
+                held.add(obj.id)
+            self._account(obj)
+            self._evict()
 
     def rm_obj(self, obj_id: Union[str, int], force=False):
         """Removes an object.
@@ -110,23 +533,66 @@ class ObjectStore:
         """
         if obj_id in self._objects:
             obj = self._objects[obj_id]
-            # update tag index
-            if obj.tags:
-                for tag in obj.tags:
-                    if tag not in self._tag_to_object_ids:
-                        self._tag_to_object_ids[tag].remove(obj.id)
+            self._unindex(obj)
 
             if force and hasattr(obj, "child") and hasattr(obj.child, "garbage_collect_data"):
                 obj.child.garbage_collect_data = True
 
+            if self.memory_limit is not None:
+                self._unaccount(obj_id)
+            self._pinned.discard(obj_id)
+            if obj_id in self._holder_tensors:
+                self._release_tensors(obj_id)
+            if self._object_sessions:
+                self._forget_session(obj_id)
+
             del self._objects[obj_id]
 
+    def _index(self, obj):
+        """Adds an object to the tag and tensor indexes."""
+        if obj.tags:
+            for tag in obj.tags:
+                self._tag_to_object_ids[tag].add(obj.id)
+
+        if isinstance(obj, FrameworkTensor):
+            nbytes = 0 if hasattr(obj, "child") else obj.numel() * obj.element_size()
+            self._tensor_nbytes[obj.id] = nbytes
+            self._tensors_total_nbytes += nbytes
+
+    def _unindex(self, obj):
+        """Removes an object from the tag and tensor indexes."""
+        if obj.tags:
+            for tag in obj.tags:
+                object_ids = self._tag_to_object_ids.get(tag)
+                if object_ids is not None:
+                    object_ids.discard(obj.id)
+                    if not object_ids:
+                        del self._tag_to_object_ids[tag]
+
+        nbytes = self._tensor_nbytes.pop(obj.id, None)
+        if nbytes is not None:
+            self._tensors_total_nbytes -= nbytes
+
     def force_rm_obj(self, obj_id: Union[str, int]):
         self.rm_obj(obj_id, force=True)
 
     def clear_objects(self):
         """Removes all objects from the object storage."""
+        for obj_id in list(self._spilled):
+            self._unaccount(obj_id)
         self._objects.clear()
+        self._tag_to_object_ids.clear()
+        self._tensor_nbytes.clear()
+        self._tensors_total_nbytes = 0
+        self._memory_usage = 0
+        self._lru.clear()
+        self._pinned_usage.clear()
+        self._pinned.clear()
+        self._holder_tensors.clear()
+        self._referenced.clear()
+        self._object_sessions.clear()
+        self._session_objects.clear()
+        self._last_access.clear()
 
     def current_objects(self):
         """Returns a copy of the objects in the object storage."""
@@ -134,7 +600,10 @@ class ObjectStore:
 
     def find_by_id(self, id):
         """Local search by id"""
-        return self._objects.get(id)
+        obj = self._objects.get(id)
+        if obj is not None and self.memory_limit is not None:
+            self._touch(id)
+        return obj
 
     def find_by_tag(self, tag):
         """Local search by tag
@@ -154,6 +623,33 @@ class ObjectStore:
             return results
         return []
 
+    def find_ids_by_tags(self, tags: List[str]) -> set:
+        """Local AND search on several tags
+
+        The posting lists of the tags are intersected starting from the smallest
+        one, so the cost depends on the rarest tag rather than on the number of
+        objects.
+
+        Args:
+            tags: the tags which must all be found on the objects
+
+        Return:
+            A set of object ids, possibly empty
+        """
+        posting_lists = []
+        for tag in tags:
+            object_ids = self._tag_to_object_ids.get(tag)
+            if not object_ids:
+                return set()
+            posting_lists.append(object_ids)
+
+        if not posting_lists:
+            return set()
+
+        posting_lists.sort(key=len)
+        smallest, others = posting_lists[0], posting_lists[1:]
+        return {obj_id for obj_id in smallest if all(obj_id in ids for ids in others)}
+
     def register_tags(self, obj):
         # NOTE: this is a fix to correct faulty registration that can sometimes happen
         if obj.id not in self._objects:
@@ -161,3 +657,11 @@ class ObjectStore:
 
         for tag in obj.tags:
             self._tag_to_object_ids[tag].add(obj.id)
+
+
+def _set_tensor_data(tensor, data):
+    """Replaces the data of a tensor while keeping the same python object."""
+    if hasattr(tensor, "native_data"):
+        tensor.native_data = data
+    else:
+        tensor.data = data
@@ -2,6 +2,7 @@ from typing import List
 from typing import Union
 
 import syft as sy
+from syft.generic.concurrency import fan_out
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.frameworks.overload import overloaded
 from syft.generic.frameworks.types import FrameworkShapeType
@@ -126,9 +127,9 @@ class MultiPointerTensor(AbstractTensor):
 
     def get(self, sum_results: bool = False) -> FrameworkTensor:
 
-        results = list()
-        for v in self.child.values():
-            results.append(v.get())
+        results = fan_out(
+            lambda pointer: pointer.get(), self.child.values(), lambda pointer: [pointer.location]
+        )
 
         if sum_results:
             return sum(results)
@@ -202,16 +203,21 @@ class MultiPointerTensor(AbstractTensor):
         # Replace all LoggingTensor with their child attribute
         new_args, new_kwargs, new_type = hook_args.unwrap_args_from_function(cmd, args_, kwargs_)
 
-        results = {}
-        for worker, share in new_args[0].items():
-            new_type = type(share)
+        def run_on_worker(worker):
+            new_type = type(new_args[0][worker])
             new_args_worker = tuple(MultiPointerTensor.dispatch(new_args, worker))
 
             # build the new command
             new_command = (cmd, None, new_args_worker, new_kwargs)
 
             # Send it to the appropriate class and get the response
-            results[worker] = new_type.handle_func_command(new_command)
+            return new_type.handle_func_command(new_command)
+
+        # The workers are called concurrently
+        workers = list(new_args[0].keys())
+        results = dict(
+            zip(workers, fan_out(run_on_worker, workers, lambda k: [new_args[0][k].location]))
+        )
 
         # Put back MultiPointerTensor on the tensors found in the response
         response = hook_args.hook_response(
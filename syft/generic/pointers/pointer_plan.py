@@ -2,10 +2,10 @@ from typing import List
 from typing import Union
 
 import syft as sy
+from syft.generic.concurrency import fan_out
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.pointers.object_pointer import ObjectPointer
 from syft.generic.frameworks.types import FrameworkTensor
-from syft.messaging.message import ForceObjectDeleteMessage
 from syft.workers.abstract import AbstractWorker
 
 
@@ -84,15 +84,18 @@ class PointerPlan(ObjectPointer):
         remote plan
         """
         if len(self._locations) > 1 and isinstance(args[0], sy.MultiPointerTensor):
-            responses = {}
-            for location in self._locations:
+
+            def call_at_location(location):
                 child_args = [
                     x.child[location.id] if isinstance(x, sy.MultiPointerTensor) else x
                     for x in args
                 ]
-                responses[location.id] = self.__call__(*child_args, **kwargs)
+                return self.__call__(*child_args, **kwargs)
+
+            # The plan is run concurrently on all the locations
+            responses = fan_out(call_at_location, self._locations, lambda location: [location])
 
-            return responses
+            return {location.id: r for location, r in zip(self._locations, responses)}
 
         if len(self._locations) == 1:
             location = self.location
@@ -104,6 +107,45 @@ class PointerPlan(ObjectPointer):
 
         return response
 
+    def map(self, inputs: List, batch_dim: int = None) -> List:
+        """Runs the remote plan on each element of inputs, in a single request.
+
+        The remote worker runs Plan.map on the inputs, see its documentation.
+
+        Args:
+            inputs: a list of arguments, where each element is a tuple of the
+                arguments of one call or the single argument of the plan.
+            batch_dim: the dimension along which the plan handles batches.
+
+        Returns:
+            The list of the results of each call.
+        """
+        assert (
+            len(self._locations) == 1
+        ), ".map() for PointerPlan with > 1 locations is currently not implemented."
+
+        inputs = [args if isinstance(args, tuple) else (args,) for args in inputs]
+        if not inputs:
+            return []
+
+        response = self.owner.send_command(
+            cmd_name="map",
+            target=self.id_at_location,
+            args_=(inputs, batch_dim),
+            recipient=self.location,
+        )
+        response = hook_args.hook_response(f"plan{self.id}", response, wrap_type=FrameworkTensor[0])
+        if not isinstance(response, (list, tuple)):
+            response = [response]
+        for r in response:
+            r.garbage_collect_data = False
+
+        # The tensors of the results are received flattened
+        n_outputs = len(response) // len(inputs)
+        if n_outputs == 1:
+            return list(response)
+        return [tuple(response[i : i + n_outputs]) for i in range(0, len(response), n_outputs)]
+
     def parameters(self) -> List:
         """Return a list of pointers to the plan parameters"""
 
@@ -269,4 +311,4 @@ class PointerPlan(ObjectPointer):
         """
         if self.garbage_collect_data:
             for id_at_location, location in zip(self._ids_at_location, self._locations):
-                self.owner.send_msg(ForceObjectDeleteMessage(id_at_location), location)
+                self.owner.garbage_collect(id_at_location, location)
@@ -465,16 +465,30 @@ class ForceObjectDeleteMessage(Message):
     This is the dominant message for garbage collection of remote objects. When
     a pointer is deleted, this message is triggered by default to tell the object
     being pointed to to also delete itself.
+
+    When remote garbage collection is batched, a single message carries a list of
+    ids so that many objects can be deleted in one round trip.
     """
 
     # TODO: add more efficient detailer and simplifier custom for this type
     # https://github.com/OpenMined/PySyft/issues/2512
 
     def __init__(self, obj_id):
-        """Initialize the message."""
+        """Initialize the message.
+
+        Args:
+            obj_id: the id of the object to delete, or a list of ids.
+        """
 
         self.object_id = obj_id
 
+    @property
+    def object_ids(self):
+        """Returns the list of ids of the objects to delete."""
+        if isinstance(self.object_id, (list, tuple)):
+            return list(self.object_id)
+        return [self.object_id]
+
     def __str__(self):
         """Return a human readable version of this message"""
         return f"({type(self).__name__} {self.object_id})"
@@ -1,6 +1,8 @@
+from collections import Counter
 from contextlib import contextmanager
 
 import logging
+import weakref
 from typing import Callable
 from typing import List
 from typing import Tuple
@@ -18,6 +20,7 @@ from syft.generic.frameworks.remote import Remote
 from syft.generic.frameworks.types import FrameworkTensorType
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.generic.frameworks.types import FrameworkShape
+from syft.generic.garbage_collection import RemoteGarbageCollector
 from syft.generic.object_storage import ObjectStore
 from syft.generic.object import AbstractObject
 from syft.generic.pointers.object_pointer import ObjectPointer
@@ -48,6 +51,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Number of plans kept ready to run by a worker, by content hash
+PLAN_CACHE_SIZE = 32
+
 
 class BaseWorker(AbstractWorker):
     """Contains functionality to all workers.
@@ -93,6 +99,12 @@ class BaseWorker(AbstractWorker):
             precision.
     """
 
+    # Whether the messages sent to this worker are processed in another process.
+    # Only the messages to such workers are sent concurrently (see fan_out).
+    is_remote = False
+    # Whether this worker understands the plan cache commands (see send_plan).
+    supports_plan_cache = True
+
     def __init__(
         self,
         hook: "FrameworkHook",
@@ -125,6 +137,12 @@ class BaseWorker(AbstractWorker):
         self._message_pending_time = message_pending_time
         self.msg_history = list()
 
+        # References to the plans received or fetched, by content hash, and the
+        # hashes of the plans known to be cached by each worker
+        self.plan_cache_size = PLAN_CACHE_SIZE
+        self._plan_cache = {}
+        self._remote_plan_hashes = {}
+
         # For performance, we cache all possible message types
         self._message_router = {
             TensorCommandMessage: self.execute_tensor_command,
@@ -142,12 +160,33 @@ class BaseWorker(AbstractWorker):
         self._plan_command_router = {
             codes.PLAN_CMDS.FETCH_PLAN: self._fetch_plan_remote,
             codes.PLAN_CMDS.FETCH_PROTOCOL: self._fetch_protocol_remote,
+            codes.PLAN_CMDS.FETCH_CACHED_PLAN: self._fetch_cached_plan_remote,
+            codes.PLAN_CMDS.LOAD_CACHED_PLAN: self._load_cached_plan_remote,
+            codes.PLAN_CMDS.CACHE_PLAN: self._cache_plan_remote,
         }
 
         self.load_data(data)
 
-        # Declare workers as appropriate
+        if hook is None:
+            self.framework = None
+        else:
+            # TODO[jvmancuso]: avoid branching here if possible, maybe by changing code in
+            #     execute_tensor_command or command_guard to not expect an attribute named "torch"
+            #     (#2530)
+            self.framework = hook.framework
+            if hasattr(hook, "torch"):
+                self.torch = self.framework
+                self.remote = Remote(self, "torch")
+            elif hasattr(hook, "tensorflow"):
+                self.tensorflow = self.framework
+                self.remote = Remote(self, "tensorflow")
+
+        # Declare workers as appropriate. Workers only register to the local
+        # worker of the hook, which acts as the central table: the other peers
+        # are resolved lazily from there when they are first needed.
         self._known_workers = {}
+        # Number of known workers per framework, used to pick the serializer
+        self._known_frameworks = Counter()
         if auto_add:
             if hook is not None and hook.local_worker is not None:
                 known_workers = self.hook.local_worker._known_workers
@@ -163,33 +202,18 @@ class BaseWorker(AbstractWorker):
                         )
                 else:
                     hook.local_worker.add_worker(self)
-                    for worker_id, worker in hook.local_worker._known_workers.items():
-                        if worker_id not in self._known_workers:
-                            self.add_worker(worker)
-                        if self.id not in worker._known_workers:
-                            worker.add_worker(self)
+                    self.add_worker(self)
             else:
                 # Make the local worker aware of itself
                 # self is the to-be-created local worker
                 self.add_worker(self)
 
-        if hook is None:
-            self.framework = None
-        else:
-            # TODO[jvmancuso]: avoid branching here if possible, maybe by changing code in
-            #     execute_tensor_command or command_guard to not expect an attribute named "torch"
-            #     (#2530)
-            self.framework = hook.framework
-            if hasattr(hook, "torch"):
-                self.torch = self.framework
-                self.remote = Remote(self, "torch")
-            elif hasattr(hook, "tensorflow"):
-                self.tensorflow = self.framework
-                self.remote = Remote(self, "tensorflow")
-
         # storage object for crypto primitives
         self.crypto_store = PrimitiveStorage(owner=self)
 
+        # deletion requests for remote objects whose pointers were deleted
+        self.garbage_collector = RemoteGarbageCollector(owner=self)
+
     def register_obj(self, obj):
         self.object_store.register_obj(self, obj)
 
@@ -224,7 +248,9 @@ class BaseWorker(AbstractWorker):
         Args:
             worker_id: id to be removed
         """
-        del self._known_workers[worker_id]
+        worker = self._known_workers.pop(worker_id)
+        if worker is not self:
+            self._known_frameworks[self._framework_name(worker)] -= 1
 
     def remove_worker_from_local_worker_registry(self):
         """Removes itself from the registry of hook.local_worker.
@@ -268,6 +294,9 @@ class BaseWorker(AbstractWorker):
         if self.verbose:
             print(f"worker {self} sending {message} to {location}")
 
+        # Step 0: send pending deletions first so they are applied before this message
+        self.garbage_collector.before_send(location)
+
         # Step 1: serialize the message to a binary
         bin_message = sy.serde.serialize(message, worker=self)
 
@@ -293,9 +322,23 @@ class BaseWorker(AbstractWorker):
         Returns:
             A binary message response.
         """
-        # Step 0: deserialize message
-        msg = sy.serde.deserialize(bin_message, worker=self)
+        # The objects accessed by the message stay in memory until it is processed
+        with self.object_store.hold():
+            # Step 0: deserialize message
+            msg = sy.serde.deserialize(bin_message, worker=self)
+
+            return self.handle_msg(msg)
 
+    def handle_msg(self, msg: Message) -> bin:
+        """Routes a deserialized message to the appropriate function and
+        returns the serialized response.
+
+        Args:
+            msg: A message received by the worker.
+
+        Returns:
+            A binary message response.
+        """
         # Step 1: save message and/or log it out
         if self.log_msgs:
             self.msg_history.append(msg)
@@ -443,10 +486,12 @@ class BaseWorker(AbstractWorker):
 
     def handle_delete_object_msg(self, msg: ForceObjectDeleteMessage):
         # NOTE cannot currently be used because there is no ObjectDeleteMessage
-        self.object_store.rm_obj(msg.object_id)
+        for object_id in msg.object_ids:
+            self.object_store.rm_obj(object_id)
 
     def handle_force_delete_object_msg(self, msg: ForceObjectDeleteMessage):
-        self.object_store.force_rm_obj(msg.object_id)
+        for object_id in msg.object_ids:
+            self.object_store.force_rm_obj(object_id)
 
     def execute_tensor_command(self, cmd: TensorCommandMessage) -> PointerTensor:
         if isinstance(cmd.action, ComputationAction):
@@ -751,8 +796,10 @@ class BaseWorker(AbstractWorker):
         through other processes.
 
         If you pass in an ID, it will try to find the worker object reference
-        within self._known_workers. If you instead pass in a reference, it will
-        save that as a known_worker if it does not exist as one.
+        within self._known_workers, and then within the known workers of the
+        local worker of the hook, which knows all the workers created with
+        auto_add. If you instead pass in a reference, it will save that as a
+        known_worker if it does not exist as one.
 
         This method is useful because often tensors have to store only the ID
         to a foreign worker which may or may not be known by the worker that is
@@ -802,14 +849,36 @@ class BaseWorker(AbstractWorker):
         if worker_id == self.id:
             return self
 
-        worker = self._known_workers.get(worker_id, worker_id)
+        worker = self._known_workers.get(worker_id)
+        if worker is None:
+            worker = self._lookup_worker(worker_id)
 
-        if worker == worker_id:
+        if worker is None:
+            worker = worker_id
             if fail_hard:
                 raise WorkerNotFoundException
             logger.warning("Worker %s couldn't recognize worker %s", self.id, worker_id)
         return worker
 
+    def _lookup_worker(self, worker_id: Union[str, int]) -> Union["BaseWorker", None]:
+        """Resolves a worker id through the registry of the local worker of the
+        hook and remembers the worker found, or returns None.
+        """
+        if not self.auto_add or self.hook is None:
+            return None
+        local_worker = getattr(self.hook, "local_worker", None)
+        if local_worker is None or local_worker is self:
+            return None
+        worker = local_worker._known_workers.get(worker_id)
+        if worker is not None:
+            self.add_worker(worker)
+        return worker
+
+    @staticmethod
+    def _framework_name(worker: AbstractWorker) -> str:
+        framework = getattr(worker, "framework", None)
+        return framework.__name__ if framework is not None else "None"
+
     def add_worker(self, worker: "BaseWorker"):
         """Adds a single worker.
 
@@ -855,7 +924,12 @@ class BaseWorker(AbstractWorker):
                 + " already exists. Replacing old worker which could cause \
                     unexpected behavior"
             )
+            replaced = self._known_workers[worker.id]
+            if replaced is not self:
+                self._known_frameworks[self._framework_name(replaced)] -= 1
         self._known_workers[worker.id] = worker
+        if worker is not self:
+            self._known_frameworks[self._framework_name(worker)] += 1
 
         return self
 
@@ -954,12 +1028,51 @@ class BaseWorker(AbstractWorker):
         shape = self.send_msg(GetShapeMessage(pointer.id_at_location), location=pointer.location)
         return sy.hook.create_shape(shape)
 
+    def garbage_collect(self, obj_id: Union[str, int], location: "BaseWorker"):
+        """Requests the deletion of a remote object whose pointer was deleted.
+
+        Depending on the garbage collection settings (see `configure_gc`), the
+        deletion is sent right away or queued to be sent in a batch.
+
+        Args:
+            obj_id: the id of the object on the location.
+            location: the worker where the object is stored.
+        """
+        self.garbage_collector.collect(obj_id, location)
+
+    def configure_gc(
+        self, batching: bool = None, batch_size: int = None, flush_interval: float = None
+    ):
+        """Configures the garbage collection of remote objects.
+
+        Args:
+            batching: if True, deletions are queued per location and sent
+                as a single message. Setting it to False flushes the queues.
+            batch_size: number of queued ids for a location triggering a flush.
+            flush_interval: max number of seconds a deletion can stay queued.
+                This is checked whenever a deletion is queued or a message is sent,
+                and by a timer for the remote workers.
+        """
+        self.garbage_collector.configure(
+            batching=batching, batch_size=batch_size, flush_interval=flush_interval
+        )
+
+    def flush_gc(self, location: "BaseWorker" = None):
+        """Sends all the queued deletions of remote objects.
+
+        Args:
+            location: if provided, only the deletions for this worker are sent.
+        """
+        self.garbage_collector.flush(location)
+
     def fetch_plan(
         self, plan_id: Union[str, int], location: "BaseWorker", copy: bool = False
     ) -> "Plan":  # noqa: F821
         """Fetchs a copy of a the plan with the given `plan_id` from the worker registry.
 
-        This method is executed for local execution.
+        This method is executed for local execution. The plan is only sent back
+        if it is not in the plan cache of this worker yet, when the location
+        supports the plan cache.
 
         Args:
             plan_id: A string indicating the plan id.
@@ -967,11 +1080,131 @@ class BaseWorker(AbstractWorker):
         Returns:
             A plan if a plan with the given `plan_id` exists. Returns None otherwise.
         """
-        message = PlanCommandMessage("fetch_plan", (plan_id, copy))
-        plan = self.send_msg(message, location=location)
+        location = self.get_worker(location)
+        if not location.supports_plan_cache:
+            message = PlanCommandMessage("fetch_plan", (plan_id, copy))
+            return self.send_msg(message, location=location)
+
+        known_hashes = [
+            plan_hash for plan_hash, (plan_ref, _) in self._plan_cache.items() if plan_ref()
+        ]
+        message = PlanCommandMessage("fetch_cached_plan", (plan_id, copy, known_hashes))
+        plan_hash, plan = self.send_msg(message, location=location)
+
+        if plan is not None:
+            self._cache_plan(plan_hash, plan)
+        elif plan_hash is not None:
+            plan = self._load_cached_plan(plan_hash, sy.ID_PROVIDER.pop() if copy else plan_id)
 
         return plan
 
+    def _fetch_cached_plan_remote(
+        self, plan_id: Union[str, int], copy: bool, known_hashes: List[str]
+    ) -> Tuple[str, "Plan"]:  # noqa: F821
+        """Returns the content hash of the plan with the given `plan_id` and the
+        plan itself, unless its hash is in known_hashes.
+
+        This method is executed for remote execution.
+        """
+        plan = self._fetch_plan_remote(plan_id, copy=False)
+        if plan is None:
+            return None, None
+
+        plan_hash = plan.content_hash()
+        if plan_hash in known_hashes:
+            return plan_hash, None
+        return plan_hash, plan.copy() if copy else plan
+
+    def send_plan(self, plan: "Plan", location: "BaseWorker") -> ObjectPointer:  # noqa: F821
+        """Sends a plan to a worker and returns a pointer to it.
+
+        Plans are cached by workers, keyed by their content hash. When the plan
+        is known to be cached by the location, only its hash is sent, and the
+        location registers a copy of its cached plan. The plan is sent as any
+        other object to the workers which don't support the plan cache, like
+        the ones running a previous version of syft.
+
+        Args:
+            plan: the plan to send.
+            location: the worker receiving the plan.
+        """
+        location = self.get_worker(location)
+        if not location.supports_plan_cache:
+            return self.send(plan, workers=location)
+
+        plan_hash = plan.content_hash()
+        known_hashes = self._remote_plan_hashes.setdefault(location.id, set())
+
+        if plan_hash in known_hashes:
+            message = PlanCommandMessage("load_cached_plan", (plan_hash, plan.id))
+            is_loaded = self.send_msg(message, location=location)
+        else:
+            is_loaded = False
+
+        if not is_loaded:
+            message = PlanCommandMessage("cache_plan", (plan_hash, plan))
+            self.send_msg(message, location=location)
+            known_hashes.add(plan_hash)
+
+        return plan.create_pointer(
+            owner=self,
+            location=location,
+            id_at_location=plan.id,
+            register=True,
+            ptr_id=sy.ID_PROVIDER.pop(),
+            garbage_collect_data=None,
+        )
+
+    def _load_cached_plan_remote(self, plan_hash: str, plan_id: Union[str, int]) -> bool:
+        """Registers a copy of the cached plan with the given hash under plan_id.
+
+        This method is executed for remote execution.
+
+        Returns:
+            True if the plan was found in the cache, False otherwise.
+        """
+        plan = self._load_cached_plan(plan_hash, plan_id)
+        if plan is None:
+            return False
+
+        self.set_obj(plan)
+        return True
+
+    def _cache_plan_remote(self, plan_hash: str, plan: "Plan") -> None:  # noqa: F821
+        """Registers a plan received from another worker and caches it.
+
+        This method is executed for remote execution.
+        """
+        self.set_obj(plan)
+        self._cache_plan(plan_hash, plan)
+
+    def _cache_plan(self, plan_hash: str, plan: "Plan") -> None:  # noqa: F821
+        # Only a reference to the plan is kept, with its hash as computed by
+        # this worker, as it can still be modified, for instance when trained
+        self._plan_cache.pop(plan_hash, None)
+        self._plan_cache[plan_hash] = (weakref.ref(plan), plan.content_hash())
+        if len(self._plan_cache) > self.plan_cache_size:
+            del self._plan_cache[next(iter(self._plan_cache))]
+
+    def _load_cached_plan(
+        self, plan_hash: str, plan_id: Union[str, int]
+    ) -> Union["Plan", None]:  # noqa: F821
+        """Returns a copy of the cached plan with the given hash, with the id plan_id.
+
+        The cached plan is forgotten if it was deleted or modified since it was cached.
+        """
+        plan_ref, local_hash = self._plan_cache.pop(plan_hash, (None, None))
+        cached_plan = plan_ref() if plan_ref is not None else None
+        if cached_plan is None or cached_plan.content_hash() != local_hash:
+            return None
+
+        # The most recently used plans are at the end of the cache
+        self._plan_cache[plan_hash] = (plan_ref, local_hash)
+        # The copy gets its own state, as the plan it is copied from
+        plan = cached_plan.copy(copy_state=True)
+        plan.id = plan_id
+        return plan
+
     def _fetch_plan_remote(self, plan_id: Union[str, int], copy: bool) -> "Plan":  # noqa: F821
         """Fetches a copy of a the plan with the given `plan_id` from the worker registry.
 
@@ -1048,28 +1281,21 @@ class BaseWorker(AbstractWorker):
                 result_ids = result_ids.union(object_ids)
             return [self.get_obj(result_id) for result_id in result_ids]
 
-        results = None
+        # Search by id is supported but it's not the preferred option
+        # It will return a single element and discard tags if the query
+        # Mixed an id with tags
         for query_item in query:
-            # Search by id is supported but it's not the preferred option
-            # It will return a single element and discard tags if the query
-            # Mixed an id with tags
             result_by_id = self.object_store.find_by_id(query_item)
-            if result_by_id:
-                results = {result_by_id}
-                break
-
-            # results_by_tag can be the empty list
-            results_by_tag = set(self.object_store.find_by_tag(query_item))
+            if result_by_id is not None:
+                return [result_by_id]
 
-            if results:
-                results = results.intersection(results_by_tag)
-            else:
-                results = results_by_tag
-
-        if results is not None:
-            return list(results)
-        else:
-            return list()
+        result_ids = self.object_store.find_ids_by_tags(query)
+        results = []
+        for result_id in result_ids:
+            result = self.object_store.find_by_id(result_id)
+            if result is not None:
+                results.append(result)
+        return results
 
     def respond_to_search(self, msg: SearchMessage) -> List[PointerTensor]:
         """
@@ -1178,7 +1404,10 @@ class BaseWorker(AbstractWorker):
         return str(self.object_store._tensors)
 
     def tensors_count(self):
-        return len(self.object_store._tensors)
+        return self.object_store.tensors_count()
+
+    def tensors_nbytes(self):
+        return self.object_store.tensors_nbytes()
 
     def list_objects(self):
         return str(self.object_store._objects)
@@ -1205,21 +1434,14 @@ class BaseWorker(AbstractWorker):
                 (more to come: 'tensorflow', 'numpy', etc)
         """
         if workers is None:
-            workers = [w for w in self._known_workers.values() if isinstance(w, AbstractWorker)]
-
-        if not isinstance(workers, list):
-            workers = [workers]
-
-        workers.append(self)
-
-        frameworks = set()
-        for worker in workers:
-            if worker.framework is not None:
-                framework = worker.framework.__name__
-            else:
-                framework = "None"
+            # The frameworks of the known workers are counted when they are added
+            frameworks = {name for name, count in self._known_frameworks.items() if count > 0}
+        else:
+            if not isinstance(workers, list):
+                workers = [workers]
+            frameworks = {self._framework_name(worker) for worker in workers}
 
-            frameworks.add(framework)
+        frameworks.add(self._framework_name(self))
 
         if len(frameworks) == 1 and frameworks == {"torch"}:
             return codes.TENSOR_SERIALIZATION.TORCH
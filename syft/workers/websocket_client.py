@@ -7,6 +7,7 @@ import websocket
 import websockets
 import logging
 import ssl
+import threading
 import time
 import asyncio
 
@@ -26,8 +27,22 @@ logger = logging.getLogger(__name__)
 
 TIMEOUT_INTERVAL = 60
 
+# Headers of the connection request carrying the id of the worker which opens it,
+# when the connection is opened by a server on its own behalf, and the secret it
+# shares with the server it connects to
+WORKER_ID_HEADER = "Syft-Worker-Id"
+WORKER_TOKEN_HEADER = "Syft-Worker-Token"
+# Header of the response to the connection request, sent by the servers which
+# understand the plan cache commands
+PLAN_CACHE_HEADER = "Syft-Plan-Cache"
+
 
 class WebsocketClientWorker(BaseWorker):
+
+    is_remote = True
+    # Set when the connection is opened
+    supports_plan_cache = False
+
     def __init__(
         self,
         hook,
@@ -39,13 +54,23 @@ class WebsocketClientWorker(BaseWorker):
         log_msgs: bool = False,
         verbose: bool = False,
         data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        authenticate_as: Union[int, str] = None,
+        auth_token: str = None,
     ):
         """A client which will forward all messages to a remote worker running a
         WebsocketServerWorker and receive all responses back from the server.
+
+        authenticate_as is the id of the worker on whose behalf the connection is
+        opened, when a server connects to one of its peers, and auth_token is the
+        secret shared by these two servers. The server receiving the connection
+        only accepts it if the token is the one of that peer. The token is sent in
+        clear text unless the connection is secure.
         """
 
         self.port = port
         self.host = host
+        self.authenticate_as = authenticate_as
+        self.auth_token = auth_token
 
         super().__init__(
             hook=hook,
@@ -61,21 +86,38 @@ class WebsocketClientWorker(BaseWorker):
         # Secure flag adds a secure layer applying cryptography and authentication
         self.secure = secure
         self.ws = None
+        # a request and its response must not be interleaved with the ones of
+        # another thread, like when shares are sent or fetched concurrently
+        self._lock = threading.Lock()
         self.connect()
 
     @property
     def url(self):
         return f"wss://{self.host}:{self.port}" if self.secure else f"ws://{self.host}:{self.port}"
 
-    def connect(self):
+    def _connection_args(self) -> dict:
         args_ = {"max_size": None, "timeout": TIMEOUT_INTERVAL, "url": self.url}
 
         if self.secure:
             args_["sslopt"] = {"cert_reqs": ssl.CERT_NONE}
 
-        self.ws = websocket.create_connection(**args_)
+        if self.authenticate_as is not None:
+            args_["header"] = [
+                f"{WORKER_ID_HEADER}: {self.authenticate_as}",
+                f"{WORKER_TOKEN_HEADER}: {self.auth_token}",
+            ]
+
+        return args_
+
+    def connect(self):
+        self._create_connection()
         self._log_msgs_remote(self.log_msgs)
 
+    def _create_connection(self):
+        self.ws = websocket.create_connection(**self._connection_args())
+        headers = self.ws.getheaders() or {}
+        self.supports_plan_cache = PLAN_CACHE_HEADER.lower() in map(str.lower, headers)
+
     def close(self):
         self.ws.shutdown()
 
@@ -100,13 +142,17 @@ class WebsocketClientWorker(BaseWorker):
 
     def _recv_msg(self, message: bin) -> bin:
         """Forwards a message to the WebsocketServerWorker"""
+        with self._lock:
+            return self._forward_with_reconnect(message)
+
+    def _forward_with_reconnect(self, message: bin) -> bin:
         response = self._forward_to_websocket_server_worker(message)
         if not self.ws.connected:
             logger.warning("Websocket connection closed (worker: %s)", self.id)
             self.ws.shutdown()
             time.sleep(0.1)
             # Avoid timing out on the server-side
-            self.ws = websocket.create_connection(self.url, max_size=None, timeout=TIMEOUT_INTERVAL)
+            self._create_connection()
             logger.warning("Created new websocket connection")
             time.sleep(0.1)
             response = self._forward_to_websocket_server_worker(message)
@@ -130,6 +176,9 @@ class WebsocketClientWorker(BaseWorker):
     def tensors_count_remote(self):
         return self._send_msg_and_deserialize("tensors_count")
 
+    def tensors_nbytes_remote(self):
+        return self._send_msg_and_deserialize("tensors_nbytes")
+
     def list_objects_remote(self):
         return self._send_msg_and_deserialize("list_objects")
 
@@ -1,9 +1,17 @@
 import asyncio
 import binascii
+from collections import Counter
+from contextlib import contextmanager
+import hmac
+import itertools
 import logging
 import socket
 import ssl
 import sys
+import threading
+from http import HTTPStatus
+from typing import Dict
+from typing import Tuple
 from typing import Union
 from typing import List
 
@@ -13,14 +21,38 @@ import websockets
 
 import syft as sy
 from syft.federated.federated_client import FederatedClient
+from syft.generic.concurrency import sequential
 from syft.generic.tensor import AbstractTensor
 from syft.workers.virtual import VirtualWorker
+from syft.workers.websocket_client import WebsocketClientWorker
+from syft.workers.websocket_client import PLAN_CACHE_HEADER
+from syft.workers.websocket_client import WORKER_ID_HEADER
+from syft.workers.websocket_client import WORKER_TOKEN_HEADER
 
 from syft.exceptions import GetNotPermittedError
 from syft.exceptions import ResponseSignatureError
+from syft.messaging.message import ForceObjectDeleteMessage
+from syft.messaging.message import GetShapeMessage
+from syft.messaging.message import IsNoneMessage
+from syft.messaging.message import SearchMessage
+from syft.messaging.message import WorkerCommandMessage
+from syft.serde.msgpack import proto_type_info
+from syft.serde.msgpack.serde import _deserialize_msgpack_binary
+from syft.serde.msgpack.serde import _deserialize_msgpack_simple
 
 tblib.pickling_support.install()
 
+# Priority lanes of the messages received by the server, lowest served first
+CONTROL_PRIORITY = 0
+DEFAULT_PRIORITY = 1
+BULK_PRIORITY = 2
+
+# Cheap messages served ahead of the others
+CONTROL_MESSAGES = (ForceObjectDeleteMessage, GetShapeMessage, IsNoneMessage, SearchMessage)
+
+# Messages which can trigger heavy work, like fit or evaluate
+BULK_MESSAGES = (WorkerCommandMessage,)
+
 
 class WebsocketServerWorker(VirtualWorker, FederatedClient):
     def __init__(
@@ -35,6 +67,14 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         loop=None,
         cert_path: str = None,
         key_path: str = None,
+        memory_limit: int = None,
+        spill_dir: str = None,
+        free_on_disconnect: bool = False,
+        object_ttl: float = None,
+        sweep_interval: float = 60,
+        bulk_message_size: int = 2 ** 20,
+        peers: Dict[Union[int, str], Tuple] = None,
+        peer_tokens: Dict[Union[int, str], str] = None,
     ):
         """This is a simple extension to normal workers wherein
         all messages are passed over websockets. Note that because
@@ -56,19 +96,79 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 yourself
             cert_path: path to used secure certificate, only needed for secure connections
             key_path: path to secure key, only needed for secure connections
+            memory_limit: optional number of bytes the stored tensors can use in
+                memory. Least recently used tensors are spilled to disk beyond it.
+            spill_dir: directory where tensors are spilled, a temporary one is
+                created if not provided.
+            free_on_disconnect: if True, the objects created on behalf of a client
+                are removed when its connection is closed, once its messages being
+                processed are done.
+            object_ttl: optional number of seconds after which the objects created
+                on behalf of a client are removed if they were not accessed.
+            sweep_interval: number of seconds between two removals of the expired
+                objects, when object_ttl is set.
+            bulk_message_size: number of bytes above which a message is served after
+                the other ones.
+            peers: optional mapping from the ids of other servers to their
+                (host, port) or (host, port, secure) address. Tensors moved to a
+                peer with .move() or .remote_send() are sent to it directly, over a
+                connection opened on first use and then kept open.
+            peer_tokens: the secret shared with each peer, required for all the
+                peers. A server connecting to a peer sends its id with this secret,
+                and a connection made on behalf of a peer is refused if it doesn't
+                carry the secret of that peer. Secure connections should be used so
+                that the secrets are not sent in clear text.
+
+            Tagged and pinned objects are never removed by free_on_disconnect
+            or object_ttl.
+
+            Pending messages are served by priority: control messages (deletions,
+            shapes, searches) first, then the regular ones and finally the bulk ones
+            (worker commands like fit, and messages larger than bulk_message_size).
+
+            Messages are processed one at a time, outside of the event loop. While
+            a message waits for the response of a peer, the next ones are processed,
+            so that two servers sending objects to each other don't block forever.
         """
 
         self.port = port
         self.host = host
         self.cert_path = cert_path
         self.key_path = key_path
+        self.free_on_disconnect = free_on_disconnect
+        self.object_ttl = object_ttl
+        self.sweep_interval = sweep_interval
+        self._session_ids = itertools.count()
+        self.bulk_message_size = bulk_message_size
+        # used to serve the messages of the same priority in order
+        self._message_counter = itertools.count()
+        self._control_codes = {proto_type_info(t).code for t in CONTROL_MESSAGES}
+        self._bulk_codes = {proto_type_info(t).code for t in BULK_MESSAGES}
+        self.peers = dict(peers or {})
+        self.peer_tokens = dict(peer_tokens or {})
+        missing_tokens = set(self.peers) - set(self.peer_tokens)
+        if missing_tokens:
+            raise ValueError(f"No token given for the peers {missing_tokens}")
+        # ids are received as strings in the headers of the connection requests
+        self._peer_tokens = {
+            str(peer_id): token.encode() for peer_id, token in self.peer_tokens.items()
+        }
+        self._peer_connections = {}
+        # held by the thread processing a message, except while it waits for a peer
+        self._processing_lock = threading.Lock()
+        self._processing_thread = None
+        # number of messages being processed for each session, and the sessions
+        # whose connection is closed, released when their last message is processed
+        self._session_messages = Counter()
+        self._closed_sessions = set()
 
         if loop is None:
             loop = asyncio.new_event_loop()
 
         # this queue is populated when messages are received
-        # from a client
-        self.broadcast_queue = asyncio.Queue()
+        # from a client, with their priority, the session and
+        # the connection to which the response must be sent
+        self.broadcast_queue = asyncio.PriorityQueue()
 
         # this is the asyncio event loop
         self.loop = loop
@@ -76,21 +176,37 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         # call BaseWorker constructor
         super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
 
-    async def _consumer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+        if memory_limit is not None:
+            self.object_store.set_memory_limit(memory_limit, spill_dir=spill_dir)
+
+    async def _consumer_handler(self, websocket: websockets.WebSocketCommonProtocol, session=None):
         """This handler listens for messages from WebsocketClientWorker
         objects.
 
         Args:
             websocket: the connection object to receive messages from and
                 add them into the queue.
+            session: the id of the session of this connection.
 
         """
         try:
             while True:
                 msg = await websocket.recv()
-                await self.broadcast_queue.put(msg)
+
+                # convert that string message to the binary it represent
+                message = binascii.unhexlify(msg[2:-1])
+
+                # the message is unpacked to find its priority, but only
+                # detailed when it is processed
+                simple_message = _deserialize_msgpack_binary(message, self)
+                priority = self._message_priority(simple_message, len(message))
+
+                await self.broadcast_queue.put(
+                    (priority, next(self._message_counter), session, websocket, simple_message)
+                )
         except websockets.exceptions.ConnectionClosed:
-            self._consumer_handler(websocket)
+            # the connection is over, the handler will clean up the session
+            pass
 
     async def _producer_handler(self, websocket: websockets.WebSocketCommonProtocol):
         """This handler listens to the queue and processes messages as they
@@ -103,21 +219,148 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         """
         while True:
 
-            # get a message from the queue
-            message = await self.broadcast_queue.get()
-
-            # convert that string message to the binary it represent
-            message = binascii.unhexlify(message[2:-1])
+            # get the message with the highest priority from the queue
+            _, _, session, client, simple_message = await self.broadcast_queue.get()
 
-            # process the message
-            response = self._recv_msg(message)
+            # process the message in a thread, so that the loop keeps receiving
+            # the messages sent meanwhile, like the ones of the peers
+            response = await asyncio.get_event_loop().run_in_executor(
+                None, self._process_message, session, simple_message
+            )
 
             # convert the binary to a string representation
             # (this is needed for the websocket library)
             response = str(binascii.hexlify(response))
 
-            # send the response
-            await websocket.send(response)
+            # send the response to the client who sent the message
+            try:
+                await client.send(response)
+            except websockets.exceptions.ConnectionClosed:
+                logging.warning("Connection closed before the response could be sent")
+
+    def _process_message(self, session, simple_message: tuple) -> bin:
+        """Processes a message unpacked by msgpack, one message at a time."""
+        with self._processing_lock:
+            self._processing_thread = threading.get_ident()
+            self._session_messages[session] += 1
+            try:
+                # objects created are owned by the client session and the objects
+                # accessed stay in memory until the message is processed. The peers
+                # are messaged from this thread, which lets the other messages be
+                # processed while it waits for them (see _waiting_for_peer).
+                with self.object_store.session(session), self.object_store.hold(), sequential():
+                    return self._recv_simple_msg(simple_message)
+            finally:
+                self._session_messages[session] -= 1
+                if not self._session_messages[session]:
+                    del self._session_messages[session]
+                    if session in self._closed_sessions:
+                        self._closed_sessions.discard(session)
+                        self.object_store.release_session(session)
+                self._processing_thread = None
+
+    def _release_session(self, session):
+        """Removes the objects of a session whose connection is closed, once the
+        messages of this session being processed are done."""
+        with self._processing_lock:
+            if self._session_messages[session]:
+                self._closed_sessions.add(session)
+            else:
+                self.object_store.release_session(session)
+
+    def _sweep(self) -> int:
+        with self._processing_lock:
+            return self.object_store.sweep(self.object_ttl)
+
+    @contextmanager
+    def _waiting_for_peer(self):
+        """Lets the other messages be processed while the current one waits for
+        the response of a peer.
+        """
+        if self._processing_thread != threading.get_ident():
+            yield
+            return
+
+        self._processing_thread = None
+        self._processing_lock.release()
+        try:
+            yield
+        finally:
+            self._processing_lock.acquire()
+            self._processing_thread = threading.get_ident()
+
+    async def _sweeper(self):
+        """Periodically removes the client objects not accessed for object_ttl seconds.
+
+        The objects are removed outside of the event loop, one at a time with the
+        messages.
+        """
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await asyncio.get_event_loop().run_in_executor(None, self._sweep)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Failed to remove the expired objects")
+                continue
+            if removed and self.verbose:
+                print(f"worker {self} removed {removed} expired objects")
+
+    def _message_priority(self, simple_message: tuple, size: int) -> int:
+        """Returns the priority lane of a message unpacked by msgpack."""
+        type_code = simple_message[0]
+        if type_code in self._control_codes:
+            return CONTROL_PRIORITY
+        if type_code in self._bulk_codes or size > self.bulk_message_size:
+            return BULK_PRIORITY
+        return DEFAULT_PRIORITY
+
+    def _lookup_worker(self, worker_id: Union[str, int]) -> Union[WebsocketClientWorker, None]:
+        if worker_id in self.peers:
+            return self._connect_to_peer(worker_id)
+        return super()._lookup_worker(worker_id)
+
+    def _connect_to_peer(self, peer_id: Union[str, int]) -> WebsocketClientWorker:
+        """Returns the connection to a peer, which is opened on first use."""
+        connection = self._peer_connections.get(peer_id)
+        if connection is None:
+            host, port, *secure = self.peers[peer_id]
+            connection = _PeerConnection(
+                self,
+                hook=self.hook,
+                host=host,
+                port=port,
+                secure=bool(secure and secure[0]),
+                id=peer_id,
+                authenticate_as=self.id,
+                auth_token=self.peer_tokens[peer_id],
+            )
+            self._peer_connections[peer_id] = connection
+            self.add_worker(connection)
+        return connection
+
+    def close_peer_connections(self):
+        """Closes the connections opened to the peers."""
+        for peer_id, connection in self._peer_connections.items():
+            connection.close()
+            self.remove_worker_from_registry(peer_id)
+        self._peer_connections.clear()
+
+    def _check_request(self, path: str, request_headers) -> Union[tuple, None]:
+        """Rejects the connections opened on behalf of a worker which is not a peer,
+        or without the token shared with that peer.
+        """
+        worker_id = request_headers.get(WORKER_ID_HEADER)
+        if worker_id is None:
+            return None
+
+        expected_token = self._peer_tokens.get(worker_id)
+        token = request_headers.get(WORKER_TOKEN_HEADER, "").encode()
+        if expected_token is None or not hmac.compare_digest(token, expected_token):
+            logging.warning("Connection refused to worker %s", worker_id)
+            return HTTPStatus.FORBIDDEN, [], b"Unknown worker or wrong token\n"
+        return None
 
     def _recv_msg(self, message: bin) -> bin:
         try:
@@ -125,6 +368,13 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         except (ResponseSignatureError, GetNotPermittedError) as e:
             return sy.serde.serialize(e)
 
+    def _recv_simple_msg(self, simple_message: tuple) -> bin:
+        try:
+            msg = _deserialize_msgpack_simple(simple_message, self)
+            return self.handle_msg(msg)
+        except (ResponseSignatureError, GetNotPermittedError) as e:
+            return sy.serde.serialize(e)
+
     async def _handler(self, websocket: websockets.WebSocketCommonProtocol, *unused_args):
         """Setup the consumer and producer response handlers with asyncio.
 
@@ -134,7 +384,13 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         """
 
         asyncio.set_event_loop(self.loop)
-        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket))
+        if WORKER_ID_HEADER in websocket.request_headers:
+            # objects sent by a peer are owned by the client which asked for
+            # the transfer, not by the connection between the servers
+            session = None
+        else:
+            session = next(self._session_ids)
+        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket, session))
         producer_task = asyncio.ensure_future(self._producer_handler(websocket))
 
         done, pending = await asyncio.wait(
@@ -144,6 +400,9 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         for task in pending:
             task.cancel()
 
+        if self.free_on_disconnect and session is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._release_session, session)
+
     def start(self):
         """Start the server"""
         # Secure behavior: adds a secure layer applying cryptography and authentication
@@ -155,6 +414,8 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 self.host,
                 self.port,
                 ssl=ssl_context,
+                process_request=self._check_request,
+                extra_headers=[(PLAN_CACHE_HEADER, "1")],
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
@@ -165,14 +426,35 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 self._handler,
                 self.host,
                 self.port,
+                process_request=self._check_request,
+                extra_headers=[(PLAN_CACHE_HEADER, "1")],
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
             )
 
         asyncio.get_event_loop().run_until_complete(start_server)
+        if self.object_ttl is not None:
+            asyncio.ensure_future(self._sweeper())
         print("Serving. Press CTRL-C to stop.")
         try:
             asyncio.get_event_loop().run_forever()
         except KeyboardInterrupt:
             logging.info("Websocket server stopped.")
+        finally:
+            self.close_peer_connections()
+
+
+class _PeerConnection(WebsocketClientWorker):
+    """A connection opened by a server to one of its peers.
+
+    The server processes its other messages while it waits for a response.
+    """
+
+    def __init__(self, server: WebsocketServerWorker, **kwargs):
+        self.server = server
+        super().__init__(**kwargs)
+
+    def _recv_msg(self, message: bin) -> bin:
+        with self.server._waiting_for_peer():
+            return super()._recv_msg(message)
@@ -6,12 +6,14 @@ import os
 import shutil
 from pathlib import Path
 import tempfile
+import threading
 
 import pytest
 import torch
 
 import syft
 from syft import TorchHook
+from syft.generic.concurrency import sequential
 from syft.generic.frameworks.hook import hook_args
 from syft.workers.websocket_client import WebsocketClientWorker
 from syft.workers.websocket_server import WebsocketServerWorker
@@ -105,6 +107,62 @@ def start_remote_server_worker_only():  # pragma: no cover
     return _start_remote_worker
 
 
+class RemoteVirtualWorker(syft.VirtualWorker):
+    """A virtual worker standing in for a remote worker.
+
+    Like a worker serving its socket in its own process, it answers each message
+    after `delay` seconds and handles the messages one at a time. It records the
+    number of messages it received, the max number of messages it received at the
+    same time and the names of the threads sending them.
+    """
+
+    is_remote = True
+    # The virtual workers share the hook, so the messages of all of them are
+    # handled one at a time
+    _handling = threading.RLock()
+
+    def __init__(self, *args, delay: float = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.n_received = 0
+        self.n_receiving = 0
+        self.max_receiving = 0
+        self.threads = set()
+        self._count_lock = threading.Lock()
+
+    def _recv_msg(self, message: bin) -> bin:
+        with self._count_lock:
+            self.n_received += 1
+            self.n_receiving += 1
+            self.max_receiving = max(self.max_receiving, self.n_receiving)
+            self.threads.add(threading.current_thread().name)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            with RemoteVirtualWorker._handling, sequential():
+                return super()._recv_msg(message)
+        finally:
+            with self._count_lock:
+                self.n_receiving -= 1
+
+
+@pytest.fixture()
+def remote_virtual_worker(hook):
+    """Helper function creating RemoteVirtualWorkers, which are removed from the
+    registry of the local worker after the test."""
+    created = []
+
+    def _remote_virtual_worker(id, delay: float = 0, **kwargs):
+        worker = RemoteVirtualWorker(hook, id=id, delay=delay, **kwargs)
+        created.append(worker)
+        return worker
+
+    yield _remote_virtual_worker
+
+    for worker in created:
+        worker.remove_worker_from_local_worker_registry()
+
+
 # This fixture is only used by the notebook tests, which run separately from the
 # test coverage checker in CI and are thus excluded from the coverage checks.
 @pytest.yield_fixture(scope="function")
@@ -145,6 +203,7 @@ def workers(hook):
     hook_args.hook_method_response_functions = {}
     hook_args.register_response_functions = {}
     hook_args.get_tensor_type_functions = {}
+    hook_args.compiled_method_paths = {}
 
     # Define 4 virtual workers
     alice = syft.VirtualWorker(id="alice", hook=hook, is_client_worker=False)
@@ -0,0 +1,21 @@
+import torch
+
+from syft.generic.frameworks.hook import hook_args
+from test.efficiency.assertions import assert_time
+
+
+@assert_time(max_time=5)
+def test_fix_prec_shared_op_overhead(workers):
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+
+    x = torch.tensor([1.0, 2.0]).fix_prec().share(bob, alice, crypto_provider=james)
+    y = torch.tensor([3.0, 4.0]).fix_prec().share(bob, alice, crypto_provider=james)
+
+    # First call compiles the call paths of the chain
+    z = x + y
+    assert (z.get().float_prec() == torch.tensor([4.0, 6.0])).all()
+    assert len(hook_args.compiled_method_paths) > 0
+
+    # wrapper > FixedPrecisionTensor > AdditiveSharingTensor > PointerTensor
+    for _ in range(100):
+        x + y
@@ -0,0 +1,102 @@
+import pytest
+import torch
+
+import syft as sy
+from test.efficiency.assertions import assert_time
+
+DELAY = 0.05
+N_WORKERS = 4
+# A multiplication of shared tensors sends about MUL_MESSAGES messages
+MPC_DELAY = DELAY / 5
+MUL_MESSAGES = 50
+
+
+@pytest.fixture
+def delayed_pointers(remote_virtual_worker):
+    workers = [remote_virtual_worker(id=f"delayed_{i}", delay=DELAY) for i in range(N_WORKERS)]
+    return torch.tensor([1, 2, 3]).send(*workers)
+
+
+# Sequential calls would take 2 * N_WORKERS * DELAY
+@assert_time(max_time=N_WORKERS * DELAY)
+def test_multi_pointer_latency_is_the_max_of_the_workers(delayed_pointers):
+    y = delayed_pointers + delayed_pointers
+    results = y.get()
+
+    assert all((r == torch.tensor([2, 4, 6])).all() for r in results)
+
+
+@pytest.fixture
+def delayed_parties(remote_virtual_worker):
+    return [remote_virtual_worker(id=f"party_{i}", delay=DELAY) for i in range(2 * N_WORKERS)]
+
+
+# Sequential messages would take 2 * 2 * N_WORKERS * DELAY
+@assert_time(max_time=4 * DELAY)
+def test_shared_tensor_open_latency_does_not_grow_with_parties(delayed_parties):
+    x = torch.tensor([1, 2, 3])
+
+    result = x.share(*delayed_parties).get()
+
+    assert (result == x).all()
+
+
+@pytest.fixture
+def delayed_shares(remote_virtual_worker):
+    bob, alice, james = [
+        remote_virtual_worker(id=f"mpc_{name}", delay=MPC_DELAY)
+        for name in ("bob", "alice", "james")
+    ]
+    x = torch.tensor([1, 2]).share(bob, alice, crypto_provider=james)
+    y = torch.tensor([3, 4]).share(bob, alice, crypto_provider=james)
+    return x, y
+
+
+@pytest.fixture
+def independent_muls():
+    @sy.func2plan(args_shape=[(2,), (2,)])
+    def independent(x, y):
+        return x * y, x * x, y * y
+
+    independent.forward = None
+    assert independent.role.compile().depth == 1
+    return independent
+
+
+# Run one after the other, the 3 multiplications would take 3 * MUL_MESSAGES * MPC_DELAY
+@assert_time(max_time=2 * MUL_MESSAGES * MPC_DELAY)
+def test_independent_shared_multiplications_share_rounds(delayed_shares, independent_muls):
+    results = independent_muls(*delayed_shares)
+
+    assert len(results) == 3
+
+
+@pytest.fixture
+def protocol_on_delayed_workers(remote_virtual_worker):
+    workers = [
+        remote_virtual_worker(id=f"protocol_worker_{i}", delay=DELAY) for i in range(N_WORKERS)
+    ]
+    role_ids = [f"role_{i}" for i in range(N_WORKERS)]
+    states = {
+        role_id: (torch.tensor([i]).send(worker),)
+        for i, (role_id, worker) in enumerate(zip(role_ids, workers))
+    }
+
+    @sy.func2protocol(roles=role_ids, states=states)
+    def protocol(*roles):
+        results = []
+        for role in roles:
+            (tensor,) = role.load_state()
+            results.append(tensor + 1)
+        return tuple(results)
+
+    protocol.forward = None
+    return protocol
+
+
+# Run one after the other, the roles would take N_WORKERS * DELAY
+@assert_time(max_time=N_WORKERS * DELAY / 2)
+def test_protocol_latency_does_not_grow_with_roles(protocol_on_delayed_workers):
+    results = protocol_on_delayed_workers()
+
+    assert len(results) == N_WORKERS
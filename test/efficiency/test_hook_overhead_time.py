@@ -0,0 +1,31 @@
+import time
+
+import torch
+
+import syft as sy
+
+N_CALLS = 10_000
+
+
+def _add_many_times(x, y) -> float:
+    """Returns the time taken by N_CALLS additions of x and y."""
+    t0 = time.time()
+    for _ in range(N_CALLS):
+        x.add(y)
+    return time.time() - t0
+
+
+def test_native_tensors_bypasses_hook_overhead(hook):
+    x = torch.ones(4)
+    y = torch.ones(4)
+
+    # Builds the hooked method before it is timed
+    x.add(y)
+    hooked_time = _add_many_times(x, y)
+    with sy.native_tensors():
+        native_time = _add_many_times(x, y)
+
+    # The hook makes a call on plain tensors several times slower
+    assert (
+        native_time < hooked_time / 2
+    ), f"Native calls in {native_time:.3f} s, hooked calls in {hooked_time:.3f} s"
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+from test.efficiency.assertions import assert_time
+
+SCRIPT = """
+import time
+import torch
+import syft
+t0 = time.time()
+syft.TorchHook(torch)
+dt = time.time() - t0
+assert dt < 5, f"TorchHook built in {round(dt, 2)} > 5 s"
+"""
+
+
+@assert_time(max_time=30)
+def test_hook_startup_time():
+    # Torch is already hooked in the test process, so the hook is built in a new one
+    subprocess.run([sys.executable, "-c", SCRIPT], check=True)
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+SCRIPT = """
+import sys
+import syft as sy
+
+lazy_modules = ["websockets", "websocket", "requests", "phe", "tblib", "syft.sandbox"]
+print([name for name in lazy_modules if name in sys.modules])
+
+assert sy.PublicGridNetwork.__name__ == "PublicGridNetwork"
+assert "syft.grid.public_grid" in sys.modules
+"""
+
+
+def test_import_defers_heavy_dependencies():
+    # syft is already imported in the test process, so it is imported in a new one
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], check=True, stdout=subprocess.PIPE
+    ).stdout
+    loaded = output.decode().strip().splitlines()[-1]
+
+    assert loaded == "[]", f"Modules loaded by import syft: {loaded}"
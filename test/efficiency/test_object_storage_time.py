@@ -0,0 +1,34 @@
+import pytest
+
+from syft.generic.object_storage import ObjectStore
+from test.efficiency.assertions import assert_time
+
+N_OBJECTS = 1_000_000
+N_SEARCHES = 100
+
+
+class TaggedObject:
+    def __init__(self, id, tags):
+        self.id = id
+        self.tags = tags
+
+
+@pytest.fixture(scope="module")
+def tagged_storage():
+    obj_storage = ObjectStore()
+    for i in range(N_OBJECTS):
+        tags = {"#common", f"#group{i % 1000}"}
+        if i % 100_000 == 0:
+            tags.add("#rare")
+        obj_storage.set_obj(TaggedObject(i, tags))
+    return obj_storage
+
+
+# Each search must take less than 1 ms
+@assert_time(max_time=N_SEARCHES * 0.001)
+def test_search_many_tagged_objects(tagged_storage):
+    for group in range(N_SEARCHES):
+        result = tagged_storage.find_ids_by_tags(["#common", f"#group{group}", "#rare"])
+
+        expected = set(range(0, N_OBJECTS, 100_000)) if group == 0 else set()
+        assert result == expected
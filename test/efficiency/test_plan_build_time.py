@@ -0,0 +1,49 @@
+import pytest
+import torch
+import torch.nn as nn
+
+import syft as sy
+from test.efficiency.assertions import assert_time
+
+N_OPS = 200
+
+
+def many_ops(x):
+    for _ in range(N_OPS):
+        x = x + 1
+    return x
+
+
+@pytest.fixture
+def plan_cache_dir(tmpdir):
+    sy.Plan.set_cache_dir(str(tmpdir))
+    sy.func2plan(args_shape=[(1,)])(many_ops)
+    yield tmpdir
+    sy.Plan.set_cache_dir(None)
+
+
+# Loading the plan must be faster than tracing it again
+@assert_time(max_time=0.1)
+def test_plan_build_from_disk_cache_time(plan_cache_dir):
+    plan = sy.func2plan(args_shape=[(1,)])(many_ops)
+
+    plan.forward = None
+    assert plan(torch.tensor([0.0])) == torch.tensor([N_OPS])
+
+
+@pytest.fixture
+def traced_model():
+    model = nn.Sequential(*[nn.Linear(32, 32) for _ in range(N_OPS // 10)])
+    inp = torch.randn(4, 32)
+    return model, torch.jit.trace(model, inp), inp
+
+
+# Converting the graph must be faster than tracing the model as a plan
+@assert_time(max_time=0.1)
+def test_plan_build_from_torchscript_time(traced_model):
+    model, script, inp = traced_model
+
+    plan = sy.Plan.from_torchscript(script)
+    plan.backend = "python"
+
+    assert torch.allclose(plan(inp), model(inp))
@@ -0,0 +1,59 @@
+import pytest
+import torch
+
+import syft as sy
+from test.efficiency.assertions import assert_time
+
+N_OPS = 200
+
+
+@pytest.fixture
+def many_ops():
+    @sy.func2plan(args_shape=[(1,)])
+    def many_ops(x):
+        for _ in range(N_OPS):
+            x = x + 1
+        return x
+
+    many_ops.forward = None
+    return many_ops
+
+
+@assert_time(max_time=2)
+def test_plan_call_overhead(many_ops):
+    many_ops.backend = "python"
+    x = torch.tensor([0.0])
+
+    for _ in range(100):
+        assert many_ops(x) == torch.tensor([N_OPS])
+
+
+@pytest.fixture
+def affine():
+    @sy.func2plan(args_shape=[(4,)])
+    def affine(x):
+        return x * 2 + 1
+
+    affine.forward = None
+    return affine
+
+
+# Calling the plan on each input takes about 0.1 s
+@assert_time(max_time=0.05)
+def test_plan_map_time(affine):
+    inputs = [torch.rand(4) for _ in range(1000)]
+
+    results = affine.map(inputs, batch_dim=0)
+
+    assert len(results) == len(inputs)
+
+
+# Replayed from its actions, the plan takes up to 2 s
+@assert_time(max_time=0.5)
+def test_plan_torchscript_call_time(many_ops):
+    many_ops.backend = "auto"
+    x = torch.tensor([0.0])
+    assert many_ops._can_run_torchscript((x,))
+
+    for _ in range(100):
+        assert many_ops(x) == torch.tensor([N_OPS])
@@ -0,0 +1,30 @@
+import torch
+
+import syft as sy
+from syft.execution.translation.optimization import PlanTranslatorOptimize
+from test.efficiency.assertions import assert_time
+
+
+@assert_time(max_time=1)
+def test_optimized_plan_runs_fewer_actions():
+    @sy.func2plan(args_shape=[(10, 10)])
+    def plan(x):
+        y = x
+        for _ in range(20):
+            a = y.matmul(x)
+            b = y.matmul(x)
+            # dead branch
+            (a - b).abs().sum()
+            y = (a + b) / 2
+        return y
+
+    x = torch.rand(10, 10) / 10
+    plan.forward = None
+    expected = plan(x)
+    n_actions = len(plan.actions)
+
+    plan.add_translation(PlanTranslatorOptimize)
+
+    assert len(plan.actions) == n_actions - 4 * 20
+    for _ in range(100):
+        assert torch.allclose(plan(x), expected)
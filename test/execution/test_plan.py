@@ -1,3 +1,4 @@
+import types
 import unittest.mock as mock
 
 import pytest
@@ -11,6 +12,7 @@ from itertools import starmap
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.plan import Plan
+from syft.execution.role import Role
 from syft.serde.msgpack import serde
 from syft.serde.serde import deserialize
 from syft.serde.serde import serialize
@@ -280,6 +282,88 @@ def test_plan_multiple_send(workers):
     assert (x_abs == th.tensor([1, 2, 3])).all()
 
 
+def test_plan_map_runs_each_input_once():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan_normalize(x):
+        return x - x.mean()
+
+    plan_normalize.forward = None
+    plan_normalize.backend = "python"
+    batch = th.rand(5, 3)
+
+    with mock.patch.object(
+        plan_normalize.role, "execute", wraps=plan_normalize.role.execute
+    ) as execute:
+        results = plan_normalize.map(batch)
+
+    assert execute.call_count == len(batch)
+    for x, result in zip(batch, results):
+        assert th.allclose(result, x - x.mean())
+
+
+def test_plan_map_with_batch_dim():
+    @sy.func2plan(args_shape=[(3,), (3,)])
+    def plan_affine(x, y):
+        return x * 2 + y, x - y
+
+    plan_affine.forward = None
+    plan_affine.backend = "python"
+    inputs = [(th.rand(3), th.rand(3)) for _ in range(10)]
+
+    for batch_dim in (0, 1):
+        with mock.patch.object(
+            plan_affine.role, "execute", wraps=plan_affine.role.execute
+        ) as execute:
+            results = plan_affine.map(inputs, batch_dim=batch_dim)
+
+        assert execute.call_count == 1
+        assert len(results) == len(inputs)
+        for (x, y), (out_1, out_2) in zip(inputs, results):
+            assert th.allclose(out_1, x * 2 + y)
+            assert th.allclose(out_2, x - y)
+
+
+def test_plan_map_with_batch_dim_on_different_shapes():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan_double(x):
+        return x * 2
+
+    plan_double.forward = None
+    inputs = [th.rand(3), th.rand(4)]
+
+    results = plan_double.map(inputs, batch_dim=0)
+
+    assert [r.shape for r in results] == [(3,), (4,)]
+
+
+def test_plan_map_with_batch_dim_missing_in_the_outputs():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan_sum(x):
+        return x.sum()
+
+    plan_sum.forward = None
+
+    with pytest.raises(ValueError):
+        plan_sum.map(th.rand(5, 3), batch_dim=0)
+
+
+def test_plan_map_remotely(workers):
+    bob = workers["bob"]
+
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_abs(data):
+        return data.abs()
+
+    plan_ptr = plan_abs.send(bob)
+    inputs = [th.tensor([-1, 7, i]).send(bob) for i in range(-3, 3)]
+
+    results = plan_ptr.map(inputs)
+
+    assert len(results) == len(inputs)
+    for i, result in zip(range(-3, 3), results):
+        assert (result.get() == th.tensor([1, 7, abs(i)])).all()
+
+
 def test_plan_built_on_class(hook):
     """
     Test class Plans and plan send / get / send
@@ -415,6 +499,131 @@ def test_fetch_plan_multiple_times(hook, is_func2plan, workers):
     assert th.all(result1 - result2 < 1e-2)
 
 
+def test_plan_content_hash_and_copy_state():
+    @sy.func2plan(args_shape=[(1,)], state=(th.tensor([3.0]),))
+    def plan_mul(data, state):
+        (factor,) = state.read()
+        return data * factor
+
+    plan_hash = plan_mul.content_hash()
+    assert plan_mul.content_hash() == plan_hash
+
+    plan_copy = plan_mul.copy(copy_state=True)
+    plan_copy.parameters()[0].add_(1)
+
+    x = th.tensor([1.0, 2.0])
+    assert (plan_mul(x) == th.tensor([3.0, 6.0])).all()
+    plan_copy.forward = None
+    assert (plan_copy(x) == th.tensor([4.0, 8.0])).all()
+
+    plan_mul.parameters()[0].add_(1)
+    assert plan_mul.content_hash() != plan_hash
+
+
+def test_send_plan_uses_plan_cache(workers):
+    me, bob = workers["me"], workers["bob"]
+
+    @sy.func2plan(args_shape=[(1,)], state=(th.tensor([3.0]),))
+    def plan_mul(data, state):
+        (factor,) = state.read()
+        return data * factor
+
+    plan_mul.send(bob)
+
+    # When the plan is sent again, only its hash is sent
+    plan_mul.pointers.clear()
+    with mock.patch.object(me, "send_msg", wraps=me.send_msg) as send_msg:
+        plan_ptr = plan_mul.send(bob)
+
+    commands = [call[0][0].command_name for call in send_msg.call_args_list]
+    assert commands == ["load_cached_plan"]
+
+    x_ptr = th.tensor([1.0, 2.0]).send(bob)
+    assert (plan_ptr(x_ptr).get() == th.tensor([3.0, 6.0])).all()
+
+
+def test_plan_cache_keeps_a_reference_to_the_plans(workers):
+    me, bob = workers["me"], workers["bob"]
+
+    @sy.func2plan(args_shape=[(1,)], state=(th.tensor([3.0]),))
+    def plan_mul(data, state):
+        (factor,) = state.read()
+        return data * factor
+
+    plan_mul.send(bob)
+    plan_bob = bob.object_store.get_obj(plan_mul.id)
+    ((plan_ref, _),) = bob._plan_cache.values()
+    assert plan_ref() is plan_bob
+
+    # The plan cached by bob is modified, so the plan is sent again
+    plan_bob.parameters()[0].add_(1)
+    plan_mul.pointers.clear()
+    with mock.patch.object(me, "send_msg", wraps=me.send_msg) as send_msg:
+        plan_ptr = plan_mul.send(bob)
+
+    commands = [call[0][0].command_name for call in send_msg.call_args_list]
+    assert commands == ["load_cached_plan", "cache_plan"]
+
+    x_ptr = th.tensor([1.0, 2.0]).send(bob)
+    assert (plan_ptr(x_ptr).get() == th.tensor([3.0, 6.0])).all()
+
+
+def test_send_and_fetch_plan_without_plan_cache(workers):
+    me, bob = workers["me"], workers["bob"]
+    # Like a worker running a previous version of syft
+    bob.supports_plan_cache = False
+
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_mul(data):
+        return data * 3
+
+    with mock.patch.object(me, "send_msg", wraps=me.send_msg) as send_msg:
+        plan_ptr = plan_mul.send(bob)
+        plan = me.fetch_plan(plan_mul.id, bob, copy=True)
+
+    commands = [
+        getattr(call[0][0], "command_name", type(call[0][0]).__name__)
+        for call in send_msg.call_args_list
+    ]
+    assert commands == ["ObjectMessage", "fetch_plan"]
+    assert not bob._plan_cache and not me._plan_cache
+
+    x = th.tensor([-1.0, 2, 3])
+    assert (plan_ptr(x.send(bob)).get() == th.tensor([-3.0, 6, 9])).all()
+    assert (plan(x) == th.tensor([-3.0, 6, 9])).all()
+
+
+def test_fetch_plan_uses_plan_cache(workers):
+    me, alice = workers["me"], workers["alice"]
+
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_mul(data):
+        return data * 3
+
+    plan_mul.send(alice)
+
+    responses = []
+    send_msg = me.send_msg
+
+    def record_response(message, location):
+        response = send_msg(message, location=location)
+        responses.append(response)
+        return response
+
+    with mock.patch.object(me, "send_msg", side_effect=record_response):
+        plan_1 = me.fetch_plan(plan_mul.id, alice, copy=True)
+        plan_2 = me.fetch_plan(plan_mul.id, alice, copy=True)
+
+    # The plan is only sent back the first time
+    assert isinstance(responses[0][1], Plan)
+    assert responses[1] == (responses[0][0], None)
+
+    x = th.tensor([-1.0, 2, 3])
+    assert plan_1 is not plan_2
+    assert (plan_1(x) == th.tensor([-3.0, 6, 9])).all()
+    assert (plan_2(x) == th.tensor([-3.0, 6, 9])).all()
+
+
 def test_fetch_plan_remote(hook, start_remote_worker):
 
     server, remote_proxy = start_remote_worker(id="test_fetch_plan_remote", hook=hook, port=8803)
@@ -424,6 +633,8 @@ def test_fetch_plan_remote(hook, start_remote_worker):
         (bias,) = state.read()
         return data * 3 + bias
 
+    # The server says it supports the plan cache when the connection is opened
+    assert remote_proxy.supports_plan_cache
     plan_mult_3.send(remote_proxy)
 
     # Fetch plan
@@ -1013,3 +1224,90 @@ def test_backward_autograd_can_be_traced(hook, workers):
     )
     assert autograd_test.code == autograd_str
     assert torch_grads.eq(plan_grads).all()
+
+
+def _count_traces():
+    """Counts the plans traced, which are not loaded from the disk cache."""
+    return mock.patch.object(Role, "reset", autospec=True, side_effect=Role.reset)
+
+
+def test_plan_disk_cache(tmpdir):
+    def plan_mul(data, state):
+        (factor,) = state.read()
+        return data * factor
+
+    Plan.set_cache_dir(str(tmpdir))
+    try:
+        with _count_traces() as traces:
+            sy.func2plan(args_shape=[(2,)], state=(th.tensor([3.0]),))(plan_mul)
+            assert traces.call_count == 1
+            assert len(tmpdir.listdir()) == 1
+
+            # The plan is loaded from the cache, bound to its own state
+            plan = sy.func2plan(args_shape=[(2,)], state=(th.tensor([5.0]),))(plan_mul)
+            assert traces.call_count == 1
+            assert plan.is_built
+            assert plan.torchscript is not None
+
+            plan.forward = None
+            plan.backend = "python"
+            assert (plan(th.tensor([1.0, 2.0])) == th.tensor([5.0, 10.0])).all()
+
+            # Other shapes are traced again
+            sy.func2plan(args_shape=[(3,)], state=(th.tensor([3.0]),))(plan_mul)
+            assert traces.call_count == 2
+            assert len(tmpdir.listdir()) == 2
+    finally:
+        Plan.set_cache_dir(None)
+
+
+_CACHED_PLAN_FACTOR = 2
+
+
+def test_plan_disk_cache_key_includes_globals_and_closures(tmpdir, monkeypatch):
+    def make_plan_mul(factor):
+        def plan_mul(data):
+            return data * factor * _CACHED_PLAN_FACTOR
+
+        return plan_mul
+
+    Plan.set_cache_dir(str(tmpdir))
+    try:
+        with _count_traces() as traces:
+            sy.func2plan(args_shape=[(2,)])(make_plan_mul(3))
+            sy.func2plan(args_shape=[(2,)])(make_plan_mul(3))
+            assert traces.call_count == 1
+
+            # Another value of a closure variable
+            sy.func2plan(args_shape=[(2,)])(make_plan_mul(5))
+            assert traces.call_count == 2
+
+            # Another value of a global
+            monkeypatch.setitem(globals(), "_CACHED_PLAN_FACTOR", 3)
+            plan = sy.func2plan(args_shape=[(2,)])(make_plan_mul(5))
+            assert traces.call_count == 3
+    finally:
+        Plan.set_cache_dir(None)
+
+    plan.forward = None
+    plan.backend = "python"
+    assert (plan(th.tensor([1.0, 2.0])) == th.tensor([15.0, 30.0])).all()
+
+
+def test_plan_disk_cache_skips_functions_reading_objects(tmpdir):
+    # Changing its attributes would change the plan
+    config = types.SimpleNamespace(factor=2)
+
+    def plan_mul(data):
+        return data * config.factor
+
+    Plan.set_cache_dir(str(tmpdir))
+    try:
+        with _count_traces() as traces:
+            sy.func2plan(args_shape=[(2,)])(plan_mul)
+            sy.func2plan(args_shape=[(2,)])(plan_mul)
+    finally:
+        Plan.set_cache_dir(None)
+
+    assert traces.call_count == 2
+    assert not tmpdir.listdir()
@@ -2,6 +2,7 @@ import pytest
 import torch as th
 
 import syft as sy
+from syft.execution.protocol import _group_independent_roles
 from syft.execution.role import Role
 
 
@@ -237,6 +238,55 @@ def test_multi_role_execution():
     assert (dict_res["alice"][0] == th.tensor([4])).all()
 
 
+def test_roles_with_communication_actions_are_not_grouped():
+    @sy.func2protocol(roles=["alice", "bob", "charlie", "dan"], args_shape={"alice": ((1,),)})
+    def protocol(alice, bob, charlie, dan):
+        alice.torch.tensor([1]).send(bob.worker)
+        tensor1 = bob.torch.tensor([1]) + 1
+        tensor2 = charlie.torch.tensor([2]) + 1
+        tensor3 = dan.torch.tensor([3]) + 1
+
+        return tensor1, tensor2, tensor3
+
+    steps = _group_independent_roles(protocol.roles)
+
+    assert [[role_ids for role_ids, _ in step] for step in steps] == [
+        [["alice"]],
+        [["bob"], ["charlie"], ["dan"]],
+    ]
+
+
+def test_roles_on_the_same_worker_are_run_in_turn(remote_virtual_worker):
+    # The delay lets the messages sent at the same time overlap
+    bob = remote_virtual_worker(id="counting_bob", delay=0.01)
+    alice = remote_virtual_worker(id="counting_alice", delay=0.01)
+    states = {
+        "role_1": (th.tensor([1]).send(bob),),
+        "role_2": (th.tensor([2]).send(bob),),
+        "role_3": (th.tensor([3]).send(alice),),
+    }
+
+    @sy.func2protocol(roles=list(states), states=states)
+    def protocol(role_1, role_2, role_3):
+        results = []
+        for role in (role_1, role_2, role_3):
+            (tensor,) = role.load_state()
+            results.append(tensor * 2 + 1)
+        return tuple(results)
+
+    steps = _group_independent_roles(protocol.roles)
+    assert [[role_ids for role_ids, _ in step] for step in steps] == [
+        [["role_1", "role_2"], ["role_3"]]
+    ]
+
+    protocol.forward = None
+    results = protocol()
+
+    assert bob.max_receiving == 1
+    for i, role_id in enumerate(states):
+        assert results[role_id][0].get() == th.tensor([2 * (i + 1) + 1])
+
+
 def test_stateful_protocol(workers):
     shapes = {"alice": ((1,),), "bob": ((1,),)}
     states = {"alice": (th.tensor([1]), th.tensor([3])), "bob": (th.tensor([5]),)}
@@ -3,10 +3,13 @@ import pytest
 import torch
 
 import syft as sy
+from syft.execution import compiled_role
 from syft.execution.role import Role
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.computation import ComputationAction
 from syft.execution.communication import CommunicationAction
+from syft.execution.state import State
+from syft.execution.translation.optimization import optimize_role
 
 
 def test_register_computation_action():
@@ -75,3 +78,166 @@ def test_reset():
     assert len(role.placeholders) == 0
     assert role.input_placeholder_ids == ()
     assert role.output_placeholder_ids == ()
+
+
+def test_compiled_role_is_reused_until_the_role_changes():
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_add(x):
+        return x + 1
+
+    role = plan_add.role
+    compiled = role.compile()
+
+    assert role.compile() is compiled
+
+    plan_add.build(torch.tensor([1.0]))
+
+    assert role.compile() is not compiled
+
+
+def test_compiled_role_is_invalidated_by_in_place_modifications():
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_ops(x):
+        y = x * 2
+        return x + 1
+
+    role = plan_ops.role
+    compiled = role.compile()
+
+    # Replacing an action keeps the number of actions
+    role.actions[-1] = role.actions[0]
+    role.modified()
+    assert role.compile() is not compiled
+
+    compiled = role.compile()
+    role.state = State()
+    assert role.compile() is not compiled
+
+
+def test_compiled_role_is_invalidated_by_the_optimization():
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_ops(x):
+        y = x * 2
+        return x + 1
+
+    role = plan_ops.role
+    compiled = role.compile()
+
+    assert optimize_role(role) == 1
+    assert role.compile() is not compiled
+    assert role.compile().execute((torch.tensor([1.0]),))[0] == torch.tensor([2.0])
+
+
+def test_execute_compiled_role():
+    @sy.func2plan(args_shape=[(2,), (2,)], state=(torch.tensor([2.0, 3.0]),))
+    def plan_ops(x, y, state):
+        (w,) = state.read()
+        a = x + y
+        b = torch.mul(a, w)
+        c, d = torch.split(b - 1, 1)
+        return c, d, a.sum()
+
+    x, y = torch.tensor([1.0, 2.0]), torch.tensor([3.0, 4.0])
+    expected = plan_ops(x, y)
+
+    plan_ops.forward = None
+    plan_ops.backend = "python"
+    result = plan_ops(x, y)
+
+    assert len(result) == 3
+    for r, e in zip(result, expected):
+        assert (r == e).all()
+
+
+def test_compiled_role_levels():
+    @sy.func2plan(args_shape=[(1,), (1,)])
+    def plan_levels(x, y):
+        a = x + y
+        b = x * y
+        x.add_(1)
+        c = a + b
+        return c
+
+    levels = plan_levels.role.compile().levels
+
+    # a and b are independent, the in-place addition is alone in its level
+    assert [len(level) for level in levels] == [2, 1, 1]
+
+
+def test_compiled_role_releases_dead_slots(monkeypatch):
+    @sy.func2plan(args_shape=[(4,)])
+    def plan_chain(x):
+        for _ in range(10):
+            x = x * 2
+        return x
+
+    compiled = plan_chain.role.compile()
+
+    live_counts = []
+    run_instruction = compiled_role._run_instruction
+
+    def count_live_slots(instruction, slots):
+        live_counts.append(sum(value is not None for value in slots))
+        return run_instruction(instruction, slots)
+
+    monkeypatch.setattr(compiled_role, "_run_instruction", count_live_slots)
+    (result,) = compiled.execute((torch.ones(4),))
+
+    assert (result == torch.ones(4) * 1024).all()
+    # Only the input of the running action is alive
+    assert live_counts == [1] * 10
+
+
+@pytest.fixture
+def remote_workers(remote_virtual_worker):
+    return {
+        name: remote_virtual_worker(id=f"remote_{name}", is_client_worker=False)
+        for name in ("bob", "alice", "james")
+    }
+
+
+def _ran_concurrently(workers) -> bool:
+    return any(thread.startswith("syft-fan-out") for worker in workers for thread in worker.threads)
+
+
+def test_compiled_role_on_shared_tensors_runs_as_the_function(remote_workers):
+    bob, alice, james = remote_workers["bob"], remote_workers["alice"], remote_workers["james"]
+
+    def ops(x, y):
+        return x * y, x * x + y, y - x
+
+    plan_ops = sy.func2plan(args_shape=[(2,), (2,)])(ops)
+    plan_ops.forward = None
+    assert [len(level) for level in plan_ops.role.compile().levels] == [3, 1]
+
+    x = torch.tensor([1, -2]).share(bob, alice, crypto_provider=james)
+    y = torch.tensor([3, 4]).share(bob, alice, crypto_provider=james)
+
+    expected = [r.get() for r in ops(x, y)]
+    result = [r.get() for r in plan_ops(x, y)]
+
+    assert _ran_concurrently((bob, alice, james))
+    for r, e in zip(result, expected):
+        assert (r == e).all()
+
+
+def test_compiled_role_on_local_and_remote_tensors_runs_as_the_function(remote_workers):
+    bob, alice = remote_workers["bob"], remote_workers["alice"]
+
+    def ops(x, y, z):
+        return x + 1, y * 2, z * 3
+
+    plan_ops = sy.func2plan(args_shape=[(2,), (2,), (2,)])(ops)
+    plan_ops.forward = None
+    assert [len(level) for level in plan_ops.role.compile().levels] == [3]
+
+    x = torch.tensor([1, 2]).send(bob)
+    y = torch.tensor([3, 4])
+    z = torch.tensor([5, 6]).send(alice)
+
+    a, b, c = plan_ops(x, y, z)
+
+    assert _ran_concurrently((bob, alice))
+    assert (a.get() == torch.tensor([2, 3])).all()
+    assert (b == torch.tensor([6, 8])).all()
+    assert (c.get() == torch.tensor([15, 18])).all()
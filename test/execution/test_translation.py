@@ -1,3 +1,5 @@
+import unittest.mock as mock
+
 import pytest
 
 import torch as th
@@ -7,8 +9,10 @@ import torch.optim as optim
 
 import syft as sy
 from itertools import starmap
+from syft.exceptions import TranslationUnavailableError
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.plan import Plan
+from syft.execution.translation.optimization import PlanTranslatorOptimize
 from syft.execution.translation.torchscript import PlanTranslatorTorchscript
 from syft.serde.serde import deserialize
 from syft.serde.serde import serialize
@@ -109,6 +113,118 @@ def test_cls_plan_can_be_translated_to_torchscript(hook, workers):
     assert (res1 == res4).all()
 
 
+def test_plan_runs_through_torchscript(hook, workers):
+    class Net(sy.Plan):
+        def __init__(self):
+            super(Net, self).__init__()
+            self.fc1 = nn.Linear(3, 4)
+            self.fc2 = nn.Linear(4, 2)
+
+        def forward(self, x):
+            x = F.relu(self.fc1(x))
+            return F.log_softmax(self.fc2(x), dim=-1)
+
+    plan = Net()
+    plan.build(th.zeros(5, 3))
+    plan.forward = None
+    assert plan.torchscript is not None
+
+    x = th.rand(5, 3)
+    plan.backend = "python"
+    expected = plan(x)
+
+    plan.backend = "auto"
+    with mock.patch.object(plan.role, "execute", wraps=plan.role.execute) as execute:
+        result = plan(x)
+
+    assert execute.call_count == 0
+    assert th.allclose(result, expected)
+
+
+def test_plan_torchscript_falls_back_to_actions(hook, workers):
+    @sy.func2plan(args_shape=[(2,)])
+    def plan_double(x):
+        return x + x
+
+    plan_double.forward = None
+    assert plan_double.torchscript is not None
+
+    with mock.patch.object(plan_double.role, "execute", wraps=plan_double.role.execute) as execute:
+        # Not the traced shape
+        assert (plan_double(th.tensor([-1.0, 2, 3])) == th.tensor([-2.0, 4, 6])).all()
+        # Not the traced type
+        assert (plan_double(th.tensor([-1, 2])) == th.tensor([-2, 4])).all()
+        # Not a local tensor
+        x = th.tensor([-1.0, 2]).fix_prec()
+        assert (plan_double(x).float_prec() == th.tensor([-2.0, 4])).all()
+
+    assert execute.call_count == 3
+
+
+def test_plan_from_traced_module(hook, workers):
+    class Net(nn.Module):
+        def __init__(self):
+            super(Net, self).__init__()
+            self.fc1 = nn.Linear(3, 4)
+            self.fc2 = nn.Linear(4, 2)
+
+        def forward(self, x):
+            x = F.relu(self.fc1(x))
+            return F.log_softmax(self.fc2(x), dim=1)
+
+    model = Net()
+    inp = th.randn(5, 3)
+    script = th.jit.trace(model, inp)
+
+    plan = Plan.from_torchscript(script)
+    plan.backend = "python"
+
+    assert plan.is_built
+    assert len(plan.actions) > 0
+    assert len(plan.state.state_placeholders) == len(list(model.parameters()))
+    assert th.allclose(plan(inp), model(inp))
+
+
+def test_plan_from_traced_function(hook, workers):
+    def foo(x, y):
+        z = x.matmul(y) * 2
+        return z.sum(dim=0, keepdim=True), th.cat([x, x], dim=1).mean()
+
+    x, y = th.randn(3, 3), th.randn(3, 2)
+    script = th.jit.trace(foo, (x, y))
+
+    plan = Plan.from_torchscript(script, args_shape=[(3, 3), (3, 2)], name="foo")
+    plan.backend = "python"
+
+    assert plan.name == "foo"
+    for result, expected in zip(plan(x, y), foo(x, y)):
+        assert th.allclose(result, expected)
+
+
+def test_plan_from_torchscript_with_dtype_arguments(hook, workers):
+    @th.jit.script
+    def cast(x):
+        return x.to(th.float64) + th.zeros(2, dtype=th.int32)
+
+    plan = Plan.from_torchscript(cast, args_shape=[(2,)])
+    plan.backend = "python"
+
+    result = plan(th.tensor([1.0, 2.0]))
+    assert result.dtype == th.float64
+    assert (result == th.tensor([1.0, 2.0], dtype=th.float64)).all()
+
+
+def test_plan_from_torchscript_with_control_flow(hook, workers):
+    @th.jit.script
+    def relu(x):
+        if bool(x.sum() > 0):
+            return x
+        return -x
+
+    with pytest.raises(TranslationUnavailableError):
+        Plan.from_torchscript(relu, args_shape=[(2,)])
+
+
 def test_plan_translation_remove(hook, workers):
     # Disable build time auto translation
     Plan._build_translators = []
@@ -181,3 +297,62 @@ def test_backward_autograd_can_be_translated(hook, workers):
 
     # Test all results are equal
     assert torch_grads.eq(ts_plan_grads).all()
+
+
+def test_plan_optimization_removes_redundant_actions(hook, workers):
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        a = x * 2
+        b = x * 2
+        unused = (a + 1).sum()
+        c = a.view_as(a) + b
+        return c.abs()
+
+    inp = th.tensor([1.0, -2.0, 3.0])
+    expected = plan(inp)
+    n_actions = len(plan.actions)
+
+    plan.add_translation(PlanTranslatorOptimize)
+    plan.forward = None
+
+    # the second x * 2, the unused sum and its addition, and the view_as
+    assert len(plan.actions) == n_actions - 4
+    assert (plan(inp) == expected).all()
+
+
+def test_plan_optimization_does_not_merge_results_modified_in_place(hook, workers):
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        a = x * 2
+        b = x * 2
+        a.add_(1)
+        return b + 0
+
+    n_actions = len(plan.actions)
+    plan.add_translation(PlanTranslatorOptimize)
+
+    assert len(plan.actions) == n_actions
+
+    plan.forward = None
+    assert (plan(th.tensor([1.0, 2.0, 3.0])) == th.tensor([2.0, 4.0, 6.0])).all()
+
+
+def test_plan_optimization_keeps_side_effects(hook, workers):
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x, torch=th):
+        a = x + 1
+        x.add_(1)
+        b = x + 1
+        noise = torch.rand([3])
+        return a, b
+
+    n_actions = len(plan.actions)
+    plan.add_translation(PlanTranslatorOptimize)
+
+    # x + 1 is computed after x was modified, and the random draw is kept
+    assert len(plan.actions) == n_actions
+
+    plan.forward = None
+    a, b = plan(th.tensor([1.0, 2.0, 3.0]))
+    assert (a == th.tensor([2.0, 3.0, 4.0])).all()
+    assert (b == th.tensor([3.0, 4.0, 5.0])).all()
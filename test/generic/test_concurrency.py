@@ -0,0 +1,148 @@
+import threading
+from unittest import mock
+
+import pytest
+import torch
+
+from syft.generic.concurrency import fan_out
+from syft.generic.concurrency import sequential
+from syft.generic.garbage_collection import RemoteGarbageCollector
+from syft.generic.id_provider import IdProvider
+
+
+def test_fan_out_keeps_the_order_of_the_items():
+    assert fan_out(lambda x: x * 2, range(10)) == [2 * x for x in range(10)]
+
+
+def test_fan_out_raises_the_exception_of_the_first_failing_item():
+    called = []
+
+    def fn(x):
+        called.append(x)
+        if x in (2, 3):
+            raise ValueError(x)
+        return x
+
+    with pytest.raises(ValueError, match="2"):
+        fan_out(fn, range(5))
+
+    # The other calls still ran
+    assert sorted(called) == list(range(5))
+
+
+def test_nested_fan_out_runs_in_the_calling_thread():
+    def inner(_):
+        return threading.get_ident()
+
+    def outer(_):
+        return threading.get_ident(), fan_out(inner, range(3))
+
+    for thread_id, inner_thread_ids in fan_out(outer, range(2)):
+        assert set(inner_thread_ids) == {thread_id}
+
+
+class _Location:
+    def __init__(self, id, is_remote):
+        self.id = id
+        self.is_remote = is_remote
+
+
+def test_fan_out_in_sequential_context_runs_in_the_calling_thread():
+    with sequential():
+        thread_ids = fan_out(lambda _: threading.get_ident(), range(3))
+
+    assert set(thread_ids) == {threading.get_ident()}
+
+
+def test_fan_out_to_local_workers_runs_in_the_calling_thread():
+    locations = [_Location(i, is_remote=False) for i in range(3)]
+
+    thread_ids = fan_out(
+        lambda _: threading.get_ident(), locations, locations=lambda location: [location]
+    )
+
+    assert set(thread_ids) == {threading.get_ident()}
+
+
+def test_fan_out_to_remote_workers_runs_concurrently():
+    locations = [_Location(i, is_remote=True) for i in range(3)]
+    # Only passed if the 3 calls wait on it at the same time
+    barrier = threading.Barrier(len(locations), timeout=5)
+
+    def wait(_):
+        barrier.wait()
+        return threading.get_ident()
+
+    thread_ids = fan_out(wait, locations, locations=lambda location: [location])
+
+    assert len(set(thread_ids)) == len(locations)
+
+
+def test_fan_out_to_local_and_remote_workers_runs_in_the_calling_thread():
+    locations = [_Location(0, is_remote=True), _Location(1, is_remote=False)]
+
+    thread_ids = fan_out(
+        lambda _: threading.get_ident(), locations, locations=lambda location: [location]
+    )
+
+    assert set(thread_ids) == {threading.get_ident()}
+
+
+def test_id_provider_gives_unique_ids_to_concurrent_threads():
+    provider = IdProvider()
+    provider.set_next_ids([1, 2, 3], check_ids=False)
+
+    def pop_ids(_):
+        return [provider.pop() for _ in range(1000)]
+
+    ids = [id for thread_ids in fan_out(pop_ids, range(4)) for id in thread_ids]
+
+    assert len(set(ids)) == len(ids)
+    # The next ids were set for the calling thread only
+    assert not {1, 2, 3} & set(ids)
+    assert [provider.pop() for _ in range(3)] == [3, 2, 1]
+
+
+def test_garbage_collector_batches_the_ids_collected_by_concurrent_threads():
+    sent = []
+    owner = mock.Mock()
+    owner.send_msg.side_effect = lambda message, location: sent.append(message.object_ids)
+    garbage_collector = RemoteGarbageCollector(owner, batch_size=10, flush_interval=60)
+    garbage_collector.configure(batching=True)
+    location = _Location("bob", is_remote=True)
+
+    def collect_ids(start):
+        for obj_id in range(start, start + 1000):
+            garbage_collector.collect(obj_id, location)
+
+    fan_out(collect_ids, range(0, 4000, 1000))
+    garbage_collector.flush()
+
+    collected = [obj_id for ids in sent for obj_id in ids]
+    assert sorted(collected) == list(range(4000))
+    assert all(len(ids) <= 10 for ids in sent)
+
+
+def test_multi_pointer_ops_on_remote_workers(remote_virtual_worker):
+    workers = [remote_virtual_worker(id=f"remote_{i}") for i in range(4)]
+    x = torch.tensor([1, 2, 3]).send(*workers)
+
+    for _ in range(10):
+        x = x + x
+
+    results = x.get()
+
+    assert len(results) == len(workers)
+    assert all((r == torch.tensor([1, 2, 3]) * 2 ** 10).all() for r in results)
+    for worker in workers:
+        assert not worker.object_store._objects
+
+
+def test_shared_ops_on_remote_workers(remote_virtual_worker):
+    bob, alice, james = [remote_virtual_worker(id=f"remote_{name}") for name in "baj"]
+    # The crypto provider shares the triples with bob and alice while it
+    # handles a message
+    x = torch.tensor([1, -2, 3]).share(bob, alice, crypto_provider=james)
+    y = torch.tensor([4, 5, -6]).share(bob, alice, crypto_provider=james)
+
+    assert (((x * y) + x).get() == torch.tensor([5, -12, -15])).all()
@@ -146,3 +146,67 @@ def test_get_recorded_ids():
     assert len(ids) == 2
     assert ids[0] == initial_given_ids[-2]
     assert ids[1] == initial_given_ids[-3]
+
+
+def test_compact_ids_are_unique_without_history():
+    provider = id_provider.IdProvider(compact=True)
+
+    ids = [provider.pop() for _ in range(1000)]
+
+    assert len(set(ids)) == len(ids)
+    assert all(0 < id < 2 ** 63 for id in ids)
+    assert ids == sorted(ids)
+    assert len(provider.generated) == 0
+
+
+def test_compact_set_next_ids_with_id_checking():
+    provider = id_provider.IdProvider(compact=True)
+    provider.set_next_ids([2], check_ids=False)
+    provider.pop()
+    generated = provider.pop()
+    provider.start_recording_ids()
+    recorded = provider.pop()
+
+    assert provider.get_recorded_ids() == [recorded]
+
+    with pytest.raises(exceptions.IdNotUniqueError, match=rf"\{{{generated}\}}"):
+        provider.set_next_ids([generated, 5], check_ids=True)
+
+    with pytest.raises(exceptions.IdNotUniqueError, match=r"\{2\}"):
+        provider.set_next_ids([2, 5], check_ids=True)
+
+    provider.set_next_ids([recorded + 1, 5], check_ids=True)
+    assert provider.pop() == 5
+
+
+def test_compact_ids_after_prefix_reset():
+    provider = id_provider.IdProvider(compact=True)
+    ids = {provider.pop() for _ in range(10)}
+
+    # Even if the same prefix is drawn again, the ids don't collide
+    provider.reset_prefix()
+    provider.prefix = next(iter(ids)) >> id_provider.COUNTER_BITS
+    assert provider.pop() not in ids
+
+
+def test_compact_ids_checked_after_prefix_reset():
+    provider = id_provider.IdProvider(compact=True)
+    old_id = provider.pop()
+
+    provider.reset_prefix()
+    new_id = provider.pop()
+
+    # The ids generated with the previous prefix are still known
+    for generated in (old_id, new_id):
+        with pytest.raises(exceptions.IdNotUniqueError):
+            provider.set_next_ids([generated], check_ids=True)
+
+
+def test_compact_prefix_does_not_depend_on_seed():
+    id_provider.IdProvider.seed(0)
+    first = id_provider.IdProvider(compact=True)
+    id_provider.IdProvider.seed(0)
+    second = id_provider.IdProvider(compact=True)
+
+    # 1 chance in 2 ** 23 to fail
+    assert first.pop() != second.pop()
@@ -1,5 +1,8 @@
+import threading
+
 import torch
 
+import syft as sy
 from syft.generic import object_storage
 
 
@@ -40,3 +43,249 @@ def test_set_obj_takes_ownership(workers):
 
     assert objs[x.id] == x
     assert objs[x.id].owner == workers["me"]
+
+
+def test_memory_limit_spills_least_recently_used(tmpdir):
+    obj_storage = object_storage.ObjectStore(memory_limit=2 * 4 * 10, spill_dir=str(tmpdir))
+
+    x = torch.arange(10, dtype=torch.int32)
+    y = torch.arange(10, 20, dtype=torch.int32)
+    z = torch.arange(20, 30, dtype=torch.int32)
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+
+    assert obj_storage.memory_usage == 80
+    assert not obj_storage.is_spilled(x.id)
+
+    # Access x so that y becomes the least recently used tensor
+    obj_storage.get_obj(x.id)
+    obj_storage.set_obj(z)
+
+    assert obj_storage.is_spilled(y.id)
+    assert not obj_storage.is_spilled(x.id)
+    assert obj_storage.memory_usage == 80
+    assert len(tmpdir.listdir()) == 1
+
+    # y is transparently loaded back and x is spilled instead
+    y_back = obj_storage.get_obj(y.id)
+    assert y_back is y
+    assert y_back.tolist() == list(range(10, 20))
+    assert obj_storage.is_spilled(x.id)
+
+    obj_storage.rm_obj(x.id)
+    assert len(tmpdir.listdir()) == 0
+    assert obj_storage.memory_usage == 80
+
+
+def test_memory_limit_pinned_objects_are_not_spilled():
+    obj_storage = object_storage.ObjectStore(memory_limit=4 * 10)
+
+    x = torch.arange(10, dtype=torch.int32)
+    y = torch.arange(10, dtype=torch.int32)
+    obj_storage.set_obj(x)
+    obj_storage.pin(x)
+    obj_storage.set_obj(y)
+
+    assert not obj_storage.is_spilled(x.id)
+    assert obj_storage.is_spilled(y.id)
+
+    obj_storage.unpin(x)
+    obj_storage.get_obj(y.id)
+
+    assert obj_storage.is_spilled(x.id)
+    assert obj_storage.get_obj(x.id).tolist() == list(range(10))
+
+    obj_storage.set_memory_limit(None)
+    assert not obj_storage.is_spilled(x.id)
+    assert not obj_storage.is_spilled(y.id)
+    assert y.tolist() == list(range(10))
+
+
+def test_memory_limit_objects_held_until_the_end_of_the_context():
+    obj_storage = object_storage.ObjectStore(memory_limit=4 * 10)
+
+    x = torch.arange(10, dtype=torch.int32)
+    y = torch.arange(10, 20, dtype=torch.int32)
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+    assert obj_storage.is_spilled(x.id)
+
+    with obj_storage.hold():
+        obj_storage.get_obj(x.id)
+        obj_storage.get_obj(y.id)
+
+        # Both operands stay in memory, above the budget
+        assert not obj_storage.is_spilled(x.id)
+        assert not obj_storage.is_spilled(y.id)
+        assert obj_storage.memory_usage == 80
+
+    assert obj_storage.is_spilled(x.id)
+    assert obj_storage.memory_usage == 40
+
+
+def test_memory_limit_objects_held_by_another_thread():
+    obj_storage = object_storage.ObjectStore(memory_limit=4 * 10)
+    x = torch.arange(10, dtype=torch.int32)
+    y = torch.arange(10, 20, dtype=torch.int32)
+    obj_storage.set_obj(x)
+    held, release = threading.Event(), threading.Event()
+
+    def hold_x():
+        with obj_storage.hold():
+            obj_storage.get_obj(x.id)
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold_x)
+    thread.start()
+    try:
+        assert held.wait(5)
+        # The end of the hold context of this thread doesn't spill the object
+        # held by the other one
+        with obj_storage.hold():
+            obj_storage.set_obj(y)
+        assert not obj_storage.is_spilled(x.id)
+        assert obj_storage.is_spilled(y.id)
+    finally:
+        release.set()
+        thread.join()
+
+    assert obj_storage.memory_usage == 40
+
+
+def test_memory_limit_smaller_than_the_operands(workers):
+    bob = workers["bob"]
+    bob.object_store.set_memory_limit(4 * 10)
+
+    try:
+        x = torch.arange(10, dtype=torch.int32).send(bob)
+        y = torch.arange(10, 20, dtype=torch.int32).send(bob)
+
+        z = x + y
+
+        assert z.get().tolist() == list(range(10, 30, 2))
+        assert bob.object_store.memory_usage <= 4 * 10
+    finally:
+        bob.object_store.set_memory_limit(None)
+
+
+def test_memory_limit_smaller_than_the_plan_state(workers):
+    bob = workers["bob"]
+    bob.object_store.set_memory_limit(4 * 10)
+
+    @sy.func2plan(args_shape=[(10,)], state=(torch.ones(10, 10), torch.arange(10.0)))
+    def plan(x, state):
+        weight, bias = state.read()
+        return weight.matmul(x) + bias
+
+    try:
+        plan_ptr = plan.send(bob)
+        state_ids = [tensor.id for tensor in plan.state.tensors()]
+
+        for i in range(3):
+            x = torch.full((10,), float(i))
+            # Fills the budget with other tensors
+            others = [torch.zeros(10).send(bob) for _ in range(3)]
+
+            result = plan_ptr(x.send(bob)).get()
+
+            assert (result == torch.full((10,), 10.0 * i) + torch.arange(10.0)).all()
+            assert not any(bob.object_store.is_spilled(obj_id) for obj_id in state_ids)
+            del others
+
+        # The state can be spilled once the plan is removed
+        bob.object_store.rm_obj(plan_ptr.id_at_location)
+        torch.zeros(10).send(bob)
+        assert all(bob.object_store.is_spilled(obj_id) for obj_id in state_ids)
+    finally:
+        bob.object_store.set_memory_limit(None)
+
+
+def test_release_session_keeps_tagged_and_pinned_objects():
+    obj_storage = object_storage.ObjectStore()
+
+    x = torch.tensor(1)
+    y = torch.tensor(2)
+    y.tags = {"#shared"}
+    z = torch.tensor(3)
+    w = torch.tensor(4)
+
+    with obj_storage.session("client"):
+        obj_storage.set_obj(x)
+        obj_storage.set_obj(y)
+        obj_storage.set_obj(z)
+    obj_storage.set_obj(w)
+    obj_storage.pin(z)
+
+    assert set(obj_storage.session_objects("client")) == {x.id, y.id, z.id}
+
+    removed = obj_storage.release_session("client")
+
+    assert removed == 1
+    assert x.id not in obj_storage._objects
+    assert {y.id, z.id, w.id} == set(obj_storage._objects)
+    assert obj_storage.session_objects("client") == []
+
+
+def test_sweep_removes_idle_session_objects():
+    obj_storage = object_storage.ObjectStore()
+
+    x = torch.tensor(1)
+    y = torch.tensor(2)
+    with obj_storage.session("client"):
+        obj_storage.set_obj(x)
+        obj_storage.set_obj(y)
+
+    assert obj_storage.sweep(ttl=60) == 0
+
+    # Accessing y refreshes it
+    obj_storage._last_access[x.id] -= 120
+    obj_storage._last_access[y.id] -= 120
+    obj_storage.get_obj(y.id)
+
+    assert obj_storage.sweep(ttl=60) == 1
+    assert x.id not in obj_storage._objects
+    assert y.id in obj_storage._objects
+
+
+def test_rm_obj_updates_tag_index():
+    obj_storage = object_storage.ObjectStore()
+
+    x = torch.tensor(1)
+    x.tags = {"#a", "#b"}
+    y = torch.tensor(2)
+    y.tags = {"#a"}
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+
+    assert obj_storage.find_ids_by_tags(["#a", "#b"]) == {x.id}
+
+    obj_storage.rm_obj(x.id)
+
+    assert "#b" not in obj_storage._tag_to_object_ids
+    assert obj_storage._tag_to_object_ids["#a"] == {y.id}
+    assert obj_storage.find_ids_by_tags(["#a", "#b"]) == set()
+    assert obj_storage.find_ids_by_tags(["#a"]) == {y.id}
+
+
+def test_tensor_statistics():
+    obj_storage = object_storage.ObjectStore()
+
+    x = torch.zeros(10, dtype=torch.float32)
+    y = torch.zeros(5, dtype=torch.int64)
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+
+    assert obj_storage.tensors_count() == 2
+    assert obj_storage.tensors_nbytes() == 10 * 4 + 5 * 8
+    assert set(obj_storage._tensors) == {x.id, y.id}
+
+    obj_storage.rm_obj(x.id)
+
+    assert obj_storage.tensors_count() == 1
+    assert obj_storage.tensors_nbytes() == 5 * 8
+
+    obj_storage.clear_objects()
+
+    assert obj_storage.tensors_count() == 0
+    assert obj_storage.tensors_nbytes() == 0
@@ -96,3 +96,34 @@ def test_send_partially_frozen():
         param.requires_grad = False
 
     model.send(worker)
+
+
+def test_native_tensors_scope(workers):
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+    x = torch.tensor([1, 2])
+
+    with syft.native_tensors():
+        assert (torch.add(x, x) == torch.tensor([2, 4])).all()
+        assert (x * 3 == torch.tensor([3, 6])).all()
+
+    # The hooking layer is back outside of the scope
+    ptr = x.send(bob)
+    assert (torch.add(ptr, ptr).get() == torch.tensor([2, 4])).all()
+
+
+def test_native_tensors_scope_with_wrappers(workers):
+    bob, alice, james = workers["bob"], workers["alice"], workers["james"]
+    x = torch.tensor([1.0, 2.0])
+
+    with syft.native_tensors():
+        # The calls on wrappers go through the hooking layer
+        ptr = x.send(bob)
+        assert ((ptr + ptr).get() == torch.tensor([2.0, 4.0])).all()
+        assert (torch.add(ptr, ptr).get() == torch.tensor([2.0, 4.0])).all()
+
+        x_fp = x.fix_prec()
+        assert ((x_fp * x_fp).float_prec() == torch.tensor([1.0, 4.0])).all()
+
+        x_sh = x.fix_prec().share(bob, alice, crypto_provider=james)
+        assert ((x_sh + x_sh).get().float_prec() == torch.tensor([2.0, 4.0])).all()
+        assert (torch.cat([x_sh, x_sh]).get().float_prec() == x.repeat(2)).all()
@@ -135,3 +135,50 @@ def test_backward_different_signature(workers):
     a.backward(b)
 
     assert a.get().grad == torch.tensor([1.0])
+
+
+def test_build_signature():
+    pointer = PointerTensor(id=1000, location="location", owner="owner", garbage_collect_data=False)
+    result = hook_args.build_signature(([torch.tensor([1, 2]), pointer], 42))
+    assert result == ((list, (torch.Tensor, PointerTensor)), int)
+
+
+def test_rules_are_cached_per_signature(workers):
+    bob = workers["bob"]
+    x = torch.tensor([1.0, 2.0]).fix_prec()
+    y = torch.tensor([2.0, 4.0]).fix_prec()
+
+    # Alternate a tensor and a scalar argument
+    for _ in range(2):
+        assert (x.mul(y).float_prec() == torch.tensor([2.0, 8.0])).all()
+        assert (x.mul(2).float_prec() == torch.tensor([2.0, 4.0])).all()
+
+    rules = hook_args.hook_method_args_functions["Tensor.mul"]
+    assert (torch.Tensor,) in rules and (int,) in rules
+
+    # Ambiguous methods are cached too
+    ptr = torch.tensor([[1, 2], [3, 4]]).send(bob)
+    assert ptr.view(4).get().tolist() == [1, 2, 3, 4]
+    assert ptr.view(2, 2).get().tolist() == [[1, 2], [3, 4]]
+    rules = hook_args.hook_method_args_functions["Tensor.view"]
+    assert (int,) in rules and (int, int) in rules
+
+
+def test_dispatch_method_matches_unwrap_and_hook_response():
+    x = torch.tensor([1.0, 2.0]).fix_prec(precision_fractional=2).child
+    y = torch.tensor([3.0, 4.0]).fix_prec(precision_fractional=2).child
+
+    def call(new_self, new_args, new_kwargs):
+        return new_self.add(*new_args, **new_kwargs)
+
+    new_self, new_args, new_kwargs = hook_args.unwrap_args_from_method("add", x, (y,), {})
+    expected = hook_args.hook_response(
+        "add", call(new_self, new_args, new_kwargs), type(x), x.get_class_attributes()
+    )
+
+    for _ in range(2):
+        result = hook_args.dispatch_method("add", x, (y,), {}, call)
+
+        assert type(result) == type(expected)
+        assert result.get_class_attributes() == expected.get_class_attributes()
+        assert (result.child == expected.child).all()
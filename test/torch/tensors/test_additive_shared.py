@@ -1,4 +1,5 @@
 import copy
+import functools
 import pytest
 
 import torch
@@ -37,6 +38,55 @@ def test_share_get(workers):
     assert (x == t).all()
 
 
+@pytest.fixture(params=[False, True], ids=["local", "remote"])
+def parties(request, hook, remote_virtual_worker):
+    if request.param:
+        new_worker = remote_virtual_worker
+    else:
+        new_worker = functools.partial(syft.VirtualWorker, hook)
+    parties = [new_worker(id=f"party_{i}", is_client_worker=False) for i in range(8)]
+    crypto_provider = new_worker(id="party_crypto_provider", is_client_worker=False)
+    yield parties, crypto_provider
+    # The remote virtual workers are removed by their fixture
+    if not request.param:
+        for worker in parties + [crypto_provider]:
+            worker.remove_worker_from_local_worker_registry()
+
+
+def test_share_get_with_many_parties(parties):
+    parties, crypto_provider = parties
+    t = torch.tensor([1, -2, 3])
+
+    x = t.share(*parties, crypto_provider=crypto_provider)
+
+    assert list(x.child.child.keys()) == [party.id for party in parties]
+    for party in parties:
+        assert len(party.object_store._objects) == 1
+    assert (x.get() == t).all()
+
+
+def test_share_ops_with_many_parties(parties):
+    parties, crypto_provider = parties
+    t = torch.tensor([1, -2, 3])
+
+    x = t.share(*parties, crypto_provider=crypto_provider)
+    y = x * x + x
+
+    assert (y.get() == t * t + t).all()
+
+
+def test_reconstruct_with_many_parties(parties):
+    parties, crypto_provider = parties
+    t = torch.tensor([1, -2, 3])
+
+    x = t.share(*parties, crypto_provider=crypto_provider)
+    reconstructed = x.child.child.reconstruct()
+
+    assert list(reconstructed.child.keys()) == [party.id for party in parties]
+    for value in reconstructed.get():
+        assert (value == t).all()
+
+
 def test___bool__(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
     x_sh = torch.tensor([[3, 4]]).share(alice, bob, crypto_provider=james)
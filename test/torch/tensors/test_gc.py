@@ -154,6 +154,99 @@ def test_inplace_method_on_pointer(workers):
     assert (tensor * 2 == tensor_back).all()
 
 
+def test_batched_garbage_collection(workers):
+    """Tests that deletions are queued and sent in one message when batching is enabled"""
+    me, bob = workers["me"], workers["bob"]
+    me.configure_gc(batching=True, batch_size=100, flush_interval=60)
+    bob.log_msgs = True
+
+    try:
+        ptrs = [torch.tensor([i]).send(bob) for i in range(10)]
+        ids = [ptr.id_at_location for ptr in ptrs]
+        n_msgs = len(bob.msg_history)
+
+        del ptrs
+
+        # Nothing was sent yet
+        assert len(bob.msg_history) == n_msgs
+        assert all(id_ in bob.object_store._objects for id_ in ids)
+        assert me.garbage_collector.pending(bob) == 10
+
+        me.flush_gc()
+
+        # A single message deleted all the objects
+        assert len(bob.msg_history) == n_msgs + 1
+        assert set(bob.msg_history[-1].object_ids) == set(ids)
+        assert all(id_ not in bob.object_store._objects for id_ in ids)
+        assert me.garbage_collector.pending() == 0
+    finally:
+        bob.log_msgs = False
+        me.configure_gc(batching=False)
+
+
+def test_batched_garbage_collection_size_threshold(workers):
+    me, bob = workers["me"], workers["bob"]
+    me.configure_gc(batching=True, batch_size=3, flush_interval=60)
+
+    try:
+        ptrs = [torch.tensor([i]).send(bob) for i in range(3)]
+        ids = [ptr.id_at_location for ptr in ptrs]
+
+        del ptrs
+
+        assert all(id_ not in bob.object_store._objects for id_ in ids)
+        assert me.garbage_collector.pending() == 0
+    finally:
+        me.configure_gc(batching=False)
+
+
+def test_batched_garbage_collection_flushed_before_next_message(workers):
+    me, alice, bob = workers["me"], workers["alice"], workers["bob"]
+    me.configure_gc(batching=True, batch_size=100, flush_interval=60)
+
+    try:
+        x = torch.tensor([1, 2])
+        x_ptr = x.send(bob)
+        y_ptr = torch.tensor([3]).send(alice)
+        del x_ptr, y_ptr
+
+        # Re-sending the same tensor must not be deleted by the pending deletion
+        x_ptr = x.send(bob)
+        assert x.id in bob.object_store._objects
+        assert me.garbage_collector.pending(bob) == 0
+        assert me.garbage_collector.pending(alice) == 1
+
+        # Disabling batching flushes everything
+        me.configure_gc(batching=False)
+        assert me.garbage_collector.pending() == 0
+        assert x_ptr.get().tolist() == [1, 2]
+    finally:
+        me.configure_gc(batching=False)
+
+
+def test_batched_garbage_collection_flushed_by_timer(workers, remote_virtual_worker):
+    me = workers["me"]
+    bob = remote_virtual_worker(id="gc_remote_bob", is_client_worker=False)
+    me.configure_gc(batching=True, batch_size=100, flush_interval=0.05)
+
+    try:
+        ptrs = [torch.tensor([i]).send(bob) for i in range(3)]
+        ids = [ptr.id_at_location for ptr in ptrs]
+        n_received = bob.n_received
+
+        del ptrs
+
+        # The deletions are sent without any other message
+        deadline = time.monotonic() + 5
+        while any(id_ in bob.object_store._objects for id_ in ids):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert bob.n_received == n_received + 1
+        assert me.garbage_collector.pending() == 0
+    finally:
+        me.configure_gc(batching=False)
+
+
 # TESTING LOGGING TENSORS
 
 
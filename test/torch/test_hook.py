@@ -1,5 +1,7 @@
 """Tests relative to verifying the hook process behaves properly."""
+from concurrent.futures import ThreadPoolExecutor
 import re
+import time
 
 import pytest
 import torch
@@ -430,3 +432,47 @@ def test_local_gradient_clipping():
     smaller_tensor_check = local_tensor.grad < tensor_comparison_grad
 
     assert 1 == smaller_tensor_check.all().item()
+
+
+def test_syft_tensor_methods_are_hooked_lazily(workers):
+    from syft.generic.frameworks.hook.hook import _lazy_hooked_methods
+
+    bob = workers["bob"]
+    x = torch.tensor([-1.0, 2.0]).send(bob)
+
+    # Special methods are hooked eagerly, the other ones on first access
+    assert "__add__" in PointerTensor.__dict__
+    assert "abs" in PointerTensor.__dict__ or "abs" in _lazy_hooked_methods[PointerTensor]
+
+    y = x.abs()
+    hooked_abs = PointerTensor.__dict__["abs"]
+
+    # The hooked method is built once
+    x.abs()
+    assert PointerTensor.__dict__["abs"] is hooked_abs
+    assert (y.get() == torch.tensor([1.0, 2.0])).all()
+
+    with pytest.raises(AttributeError):
+        x.child.not_a_tensor_method
+
+
+def test_lazy_hooked_method_first_accessed_by_several_threads():
+    from syft.generic.frameworks.hook.hook import FrameworkHook
+    from syft.generic.frameworks.hook.hook import _lazy_hooked_methods
+
+    class Lazy:
+        pass
+
+    def get_hooked_method(attr):
+        # Leaves time to the other threads to look the method up
+        time.sleep(0.01)
+        return lambda self: attr
+
+    FrameworkHook._hook_methods_lazily(Lazy, ["foo"], get_hooked_method)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: Lazy().foo(), range(8)))
+    finally:
+        del _lazy_hooked_methods[Lazy]
+
+    assert results == ["foo"] * 8
@@ -5,6 +5,7 @@ from socket import gethostname
 from OpenSSL import crypto, SSL
 import pytest
 import torch
+import websocket
 import syft as sy
 from syft.generic.frameworks.hook import hook_args
 from syft.frameworks.torch.fl import utils
@@ -337,3 +338,304 @@ def test_evaluate(hook, start_proc):  # pragma: no cover
     remote_proxy.close()
     remote_proxy.remove_worker_from_local_worker_registry()
     # process_remote_worker.terminate()
+
+
+def test_control_messages_are_served_first(hook, monkeypatch):
+    import asyncio
+    import binascii
+    import websockets
+    from syft.messaging.message import ForceObjectDeleteMessage
+    from syft.messaging.message import GetShapeMessage
+    from syft.messaging.message import ObjectMessage
+    from syft.messaging.message import WorkerCommandMessage
+
+    class Connection:
+        """Receives the messages given and records the responses sent."""
+
+        def __init__(self, messages):
+            self.pending = [str(binascii.hexlify(sy.serde.serialize(m))) for m in messages]
+            self.responses = []
+
+        async def recv(self):
+            if not self.pending:
+                raise websockets.exceptions.ConnectionClosed(1000, "")
+            return self.pending.pop(0)
+
+        async def send(self, response):
+            self.responses.append(response)
+
+    server = WebsocketServerWorker(
+        hook=hook, host="localhost", port=8799, id="priority_server", bulk_message_size=10_000
+    )
+    shaped = torch.zeros(2, 3)
+    deleted = torch.zeros(1)
+    server.object_store.set_obj(shaped)
+    server.object_store.set_obj(deleted)
+    small = torch.tensor([1])
+    large = torch.zeros(10_000)
+
+    messages = [
+        WorkerCommandMessage("tensors_count", ((), {}, None)),
+        ObjectMessage(large),
+        ObjectMessage(small),
+        GetShapeMessage(shaped.id),
+        ForceObjectDeleteMessage([deleted.id]),
+    ]
+
+    handled = []
+    handle_msg = server.handle_msg
+
+    def record_and_handle(msg):
+        handled.append(msg.object.id if isinstance(msg, ObjectMessage) else type(msg))
+        return handle_msg(msg)
+
+    monkeypatch.setattr(server, "handle_msg", record_and_handle)
+
+    async def serve(connection):
+        # All the messages are queued before the first one is processed
+        await server._consumer_handler(connection)
+        producer = asyncio.ensure_future(server._producer_handler(connection))
+        for _ in range(1000):
+            if len(connection.responses) == len(messages):
+                break
+            await asyncio.sleep(0.01)
+        producer.cancel()
+
+    try:
+        # The loop used by WebsocketServerWorker.start
+        asyncio.get_event_loop().run_until_complete(serve(Connection(messages)))
+    finally:
+        server.remove_worker_from_local_worker_registry()
+        server.loop.close()
+
+    assert handled == [
+        GetShapeMessage,
+        ForceObjectDeleteMessage,
+        small.id,
+        WorkerCommandMessage,
+        large.id,
+    ]
+    assert deleted.id not in server.object_store._objects
+
+
+def _start_peers(start_proc, hook, port):
+    """Starts two peer servers sharing a token, and returns them with their clients."""
+    alice_kwargs = {"id": "peer_alice", "host": "localhost", "port": port, "hook": hook}
+    bob_kwargs = {"id": "peer_bob", "host": "localhost", "port": port + 1, "hook": hook}
+
+    alice_server = start_proc(
+        WebsocketServerWorker,
+        peers={"peer_bob": ("localhost", port + 1)},
+        peer_tokens={"peer_bob": "secret"},
+        **alice_kwargs,
+    )
+    bob_server = start_proc(
+        WebsocketServerWorker,
+        peers={"peer_alice": ("localhost", port)},
+        peer_tokens={"peer_alice": "secret"},
+        **bob_kwargs,
+    )
+    alice = instantiate_websocket_client_worker(**alice_kwargs)
+    bob = instantiate_websocket_client_worker(**bob_kwargs)
+    return (alice_server, bob_server), (alice, bob)
+
+
+def _stop_peers(servers, clients):
+    for client in clients:
+        client.close()
+    time.sleep(0.1)
+    for client in clients:
+        client.remove_worker_from_local_worker_registry()
+    for server in servers:
+        server.terminate()
+
+
+def test_move_between_peers(hook, start_proc):
+    servers, (alice, bob) = _start_peers(start_proc, hook, 8800)
+
+    x = torch.tensor([1, 2, 3])
+    x_ptr = x.send(alice).move(bob)
+
+    assert x_ptr.location.id == "peer_bob"
+    assert bob.tensors_count_remote() == 1
+    assert (x_ptr.get() == x).all()
+
+    _stop_peers(servers, (alice, bob))
+
+
+def test_peers_moving_to_each_other(hook, start_proc):
+    from concurrent.futures import ThreadPoolExecutor
+
+    servers, (alice, bob) = _start_peers(start_proc, hook, 8803)
+
+    x_ptr = torch.tensor([1, 2]).send(alice)
+    y_ptr = torch.tensor([3, 4]).send(bob)
+
+    # Each server waits for the other one while it is asked to move a tensor to it
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        x_future = executor.submit(x_ptr.move, bob)
+        y_future = executor.submit(y_ptr.move, alice)
+        x_moved, y_moved = x_future.result(timeout=30), y_future.result(timeout=30)
+
+    assert (x_moved.get() == torch.tensor([1, 2])).all()
+    assert (y_moved.get() == torch.tensor([3, 4])).all()
+
+    _stop_peers(servers, (alice, bob))
+
+
+def test_messages_overlapping_across_a_peer_wait_keep_their_sessions(hook, monkeypatch):
+    import threading
+    from syft.messaging.message import ObjectMessage
+    from syft.serde.msgpack.serde import _deserialize_msgpack_binary
+
+    server = WebsocketServerWorker(hook=hook, host="localhost", port=8807, id="session_server")
+    x, y = torch.tensor([1]), torch.tensor([2])
+    x_waiting, y_waiting, x_done = threading.Event(), threading.Event(), threading.Event()
+
+    handle_msg = server.handle_msg
+
+    def wait_for_peer_and_handle(msg):
+        # The message storing x waits for a peer until the one storing y waits
+        # too, which then waits until the first one is processed
+        with server._waiting_for_peer():
+            if msg.object.id == x.id:
+                x_waiting.set()
+                y_waiting.wait(5)
+            else:
+                y_waiting.set()
+                x_done.wait(5)
+        return handle_msg(msg)
+
+    monkeypatch.setattr(server, "handle_msg", wait_for_peer_and_handle)
+
+    def process(session, tensor):
+        simple_message = _deserialize_msgpack_binary(
+            sy.serde.serialize(ObjectMessage(tensor)), server
+        )
+        server._process_message(session, simple_message)
+        if tensor is x:
+            x_done.set()
+
+    threads = [
+        threading.Thread(target=process, args=(1, x)),
+        threading.Thread(target=process, args=(2, y)),
+    ]
+    try:
+        threads[0].start()
+        assert x_waiting.wait(5)
+        threads[1].start()
+        for thread in threads:
+            thread.join(10)
+
+        assert server.object_store.session_objects(1) == [x.id]
+        assert server.object_store.session_objects(2) == [y.id]
+    finally:
+        server.remove_worker_from_local_worker_registry()
+        server.loop.close()
+
+
+def test_session_released_once_its_messages_are_processed(hook, monkeypatch):
+    import threading
+    from syft.messaging.message import ObjectMessage
+    from syft.serde.msgpack.serde import _deserialize_msgpack_binary
+
+    server = WebsocketServerWorker(
+        hook=hook, host="localhost", port=8808, id="release_server", free_on_disconnect=True
+    )
+    x, y = torch.tensor([1]), torch.tensor([2])
+    with server.object_store.session(1):
+        server.object_store.set_obj(x)
+    waiting, release = threading.Event(), threading.Event()
+
+    handle_msg = server.handle_msg
+
+    def wait_for_peer_and_handle(msg):
+        with server._waiting_for_peer():
+            waiting.set()
+            release.wait(5)
+        return handle_msg(msg)
+
+    monkeypatch.setattr(server, "handle_msg", wait_for_peer_and_handle)
+
+    simple_message = _deserialize_msgpack_binary(sy.serde.serialize(ObjectMessage(y)), server)
+    thread = threading.Thread(target=server._process_message, args=(1, simple_message))
+    try:
+        thread.start()
+        assert waiting.wait(5)
+
+        # The connection of the session is closed while its message waits for a peer
+        server._release_session(1)
+        assert x.id in server.object_store._objects
+
+        release.set()
+        thread.join(10)
+        assert x.id not in server.object_store._objects
+        assert y.id not in server.object_store._objects
+    finally:
+        release.set()
+        server.remove_worker_from_local_worker_registry()
+        server.loop.close()
+
+
+def test_sweeper_keeps_running_after_an_error(hook, monkeypatch):
+    import asyncio
+
+    server = WebsocketServerWorker(
+        hook=hook, host="localhost", port=8809, id="sweep_server", object_ttl=1, sweep_interval=0.01
+    )
+    calls = []
+
+    def failing_sweep(ttl):
+        calls.append(ttl)
+        if len(calls) == 1:
+            raise RuntimeError("dictionary changed size during iteration")
+        return 0
+
+    monkeypatch.setattr(server.object_store, "sweep", failing_sweep)
+
+    async def run_sweeper():
+        sweeper = asyncio.ensure_future(server._sweeper())
+        for _ in range(500):
+            if len(calls) >= 2:
+                break
+            await asyncio.sleep(0.01)
+        sweeper.cancel()
+
+    try:
+        asyncio.get_event_loop().run_until_complete(run_sweeper())
+    finally:
+        server.remove_worker_from_local_worker_registry()
+        server.loop.close()
+
+    assert len(calls) >= 2
+
+
+def test_peer_connection_without_the_token_is_refused(hook, start_proc):
+    kwargs = {"id": "peer_carol", "host": "localhost", "port": 8802, "hook": hook}
+    server = start_proc(
+        WebsocketServerWorker,
+        peers={"peer_dave": ("localhost", 8805)},
+        peer_tokens={"peer_dave": "secret"},
+        **kwargs,
+    )
+
+    with pytest.raises(websocket.WebSocketBadStatusException):
+        instantiate_websocket_client_worker(authenticate_as="mallory", **kwargs)
+
+    # The id of a peer alone is not enough
+    with pytest.raises(websocket.WebSocketBadStatusException):
+        instantiate_websocket_client_worker(authenticate_as="peer_dave", **kwargs)
+
+    with pytest.raises(websocket.WebSocketBadStatusException):
+        instantiate_websocket_client_worker(
+            authenticate_as="peer_dave", auth_token="guess", **kwargs
+        )
+
+    server.terminate()
+
+
+def test_peers_require_tokens(hook):
+    with pytest.raises(ValueError):
+        WebsocketServerWorker(
+            hook=hook, host="localhost", port=8806, id="tokenless", peers={"peer": ("h", 1)}
+        )
@@ -51,3 +51,19 @@ def test_get_unknown_worker():
     # if an instance of virtual worker is given it doesn't fail
     assert bob.get_worker(charlie).id == charlie.id
     assert charlie.id in bob._known_workers
+
+
+def test_known_workers_are_resolved_lazily(hook):
+    worker_id = sy.ID_PROVIDER.pop()
+    alice = VirtualWorker(hook, id=f"alice{worker_id}")
+    bob = VirtualWorker(hook, id=f"bob{worker_id}")
+
+    # Workers only register to the local worker when they are created
+    assert bob.id in hook.local_worker._known_workers
+    assert bob.id not in alice._known_workers
+
+    assert alice.get_worker(bob.id) is bob
+    assert bob.id in alice._known_workers
+    assert alice.id not in bob._known_workers
+
+    assert alice.serializer == sy.codes.TENSOR_SERIALIZATION.TORCH